@@ -1,10 +1,13 @@
 """Test case catalog loading and validation."""
 
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Dict, List
 
 import yaml
 
+from .decisions import compile_extractor, decision_spec
+from .structured import OUTPUT_FORMATS, compile_schema
+
 
 def load_catalog(catalog_path: Path) -> Dict[str, Any]:
     """
@@ -42,11 +45,148 @@ def load_catalog(catalog_path: Path) -> Dict[str, Any]:
         if not isinstance(test_case, dict):
             raise ValueError(f"Test case {i} must be a dictionary")
 
+        if "turns" in test_case:
+            validate_turns(test_case, i)
+        if "paraphrases" in test_case:
+            validate_paraphrases(test_case, i)
+
         required_fields = ["id", "category", "input"]
         for field in required_fields:
             if field not in test_case:
                 raise ValueError(f"Test case {i} missing required field: {field}")
 
+    resolve_context_documents(catalog)
+    resolve_decision_extractors(catalog)
+
+    return catalog
+
+
+def resolve_decision_extractors(catalog: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Apply the catalog's decision extractor to cases that do not declare one.
+
+    A catalog-level ``decision_extractor`` (or ``decision_labels``) sets the
+    default for every test case. Cases keep their own spec if they have one.
+
+    Args:
+        catalog: Loaded catalog dictionary
+
+    Returns:
+        The catalog, with defaults applied
+    """
+    for key in ("decision_extractor", "decision_labels"):
+        if catalog.get(key):
+            for test_case in catalog["test_cases"]:
+                if not test_case.get("decision_extractor") and not test_case.get("decision_labels"):
+                    test_case[key] = catalog[key]
+    return catalog
+
+
+def validate_turns(test_case: Dict[str, Any], index: int):
+    """
+    Validate a multi-turn test case and default its ``input`` to the last turn.
+
+    Args:
+        test_case: Test case dictionary with a ``turns`` list
+        index: Position of the case in the catalog (for error messages)
+
+    Raises:
+        ValueError: If ``turns`` is empty or a turn has no input
+    """
+    turns = test_case["turns"]
+    if not isinstance(turns, list) or not turns:
+        raise ValueError(f"Test case {index} 'turns' must be a non-empty list")
+    for turn_number, turn in enumerate(turns, 1):
+        if not isinstance(turn, dict) or "input" not in turn:
+            raise ValueError(f"Test case {index} turn {turn_number} missing required field: input")
+
+    test_case.setdefault("input", turns[-1]["input"])
+
+
+def validate_paraphrases(test_case: Dict[str, Any], index: int):
+    """
+    Validate a paraphrase group and default its ``input`` to the first paraphrase.
+
+    Args:
+        test_case: Test case dictionary with a ``paraphrases`` list
+        index: Position of the case in the catalog (for error messages)
+
+    Raises:
+        ValueError: If ``paraphrases`` is not a non-empty list of strings
+    """
+    paraphrases = test_case["paraphrases"]
+    if (
+        not isinstance(paraphrases, list)
+        or not paraphrases
+        or not all(isinstance(p, str) for p in paraphrases)
+    ):
+        raise ValueError(f"Test case {index} 'paraphrases' must be a non-empty list of strings")
+
+    test_case.setdefault("input", paraphrases[0])
+
+
+def paraphrase_cases(test_case: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    Expand a paraphrase group into one test case per distinct phrasing.
+
+    The case's own ``input`` comes first, followed by each paraphrase that
+    differs from it.
+
+    Args:
+        test_case: Test case dictionary with a ``paraphrases`` list
+
+    Returns:
+        List of test case dictionaries, one per variant
+    """
+    base = {key: value for key, value in test_case.items() if key != "paraphrases"}
+    variants = [test_case["input"]]
+    for paraphrase in test_case["paraphrases"]:
+        if paraphrase not in variants:
+            variants.append(paraphrase)
+    return [dict(base, input=variant) for variant in variants]
+
+
+def resolve_context_documents(catalog: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Resolve test case context documents against the catalog's shared documents.
+
+    A catalog may declare documents once under a top-level
+    ``context_documents`` list; test cases then refer to them by ID instead
+    of repeating their content. Inline documents (dicts with ``id`` and
+    ``content``) are left unchanged. References are replaced in place by
+    the shared document dictionary.
+
+    Args:
+        catalog: Loaded catalog dictionary
+
+    Returns:
+        The catalog, with references resolved
+
+    Raises:
+        ValueError: If a shared document is malformed or a reference is unknown
+    """
+    shared = {}
+    for doc in catalog.get("context_documents") or []:
+        if not isinstance(doc, dict) or "id" not in doc or "content" not in doc:
+            raise ValueError("Catalog context documents must have 'id' and 'content'")
+        shared[str(doc["id"])] = doc
+
+    for test_case in catalog["test_cases"]:
+        documents = test_case.get("context_documents")
+        if not documents:
+            continue
+        resolved = []
+        for doc in documents:
+            if isinstance(doc, dict):
+                resolved.append(doc)
+            elif str(doc) in shared:
+                resolved.append(shared[str(doc)])
+            else:
+                raise ValueError(
+                    f"Test case {test_case['id']} references unknown context document: {doc}"
+                )
+        test_case["context_documents"] = resolved
+
     return catalog
 
 
@@ -68,7 +208,20 @@ def validate_test_case(test_case: Dict[str, Any]) -> bool:
     # Category-specific validation
     category = test_case.get("category")
 
-    if category == "determinism":
+    spec = decision_spec(test_case)
+    if spec is not None:
+        compile_extractor(spec)
+
+    if test_case.get("output_format", "json") not in OUTPUT_FORMATS:
+        raise ValueError(
+            f"Test case {test_case['id']} 'output_format' must be one of "
+            f"{', '.join(OUTPUT_FORMATS)}"
+        )
+    if "output_schema" in test_case:
+        compile_schema(test_case["output_schema"])
+
+    # Paraphrase groups are compared across variants, so repetitions are optional
+    if category == "determinism" and "paraphrases" not in test_case:
         if "repetitions" not in test_case:
             raise ValueError(f"Determinism test case {test_case['id']} missing 'repetitions'")
         if not isinstance(test_case["repetitions"], int) or test_case["repetitions"] < 2:
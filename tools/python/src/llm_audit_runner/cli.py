@@ -1,35 +1,30 @@
-"""Command-line interface for LLM audit runner."""
+"""Command-line interface for LLM audit runner.
+
+Each subcommand imports only the modules it needs inside its handler, so
+that lightweight commands such as ``metrics`` never pay for PyYAML,
+provider SDKs or the runner.
+"""
 
 import argparse
 import sys
 from pathlib import Path
 
-from .catalog import load_catalog
-from .provider import StubLLMProvider, get_provider
-from .run import TestRunner
+# Legacy flag-style invocations are mapped onto subcommands
+LEGACY_FLAGS = {"--metrics-only": "metrics", "--list-providers": "providers"}
 
 
-def parse_args():
-    """Parse command-line arguments."""
-    parser = argparse.ArgumentParser(
-        description="LLM Audit Runner - Execute test cases and compute metrics",
-        formatter_class=argparse.RawDescriptionHelpFormatter,
-        epilog="""
-Examples:
-  # Run tests with stub provider
-  %(prog)s --catalog tests.yaml --output results/ --provider stub
-  
-  # Filter to specific test cases
-  %(prog)s --catalog tests.yaml --output results/ --provider stub --filter "det-*"
-  
-  # Compute metrics only (no execution)
-  %(prog)s --metrics-only --output results/
-        """,
+def add_run_parser(subparsers):
+    """Add the ``run`` subcommand."""
+    parser = subparsers.add_parser(
+        "run",
+        help="Execute test cases and compute metrics",
+        description="Execute test cases from a catalog, record transcripts and compute metrics",
     )
 
     parser.add_argument(
         "--catalog",
         type=Path,
+        required=True,
         help="Path to YAML test case catalog",
     )
 
@@ -42,14 +37,18 @@ Examples:
 
     parser.add_argument(
         "--provider",
-        choices=["stub", "custom"],
-        help="LLM provider to use",
+        required=True,
+        action="append",
+        metavar="[NAME=]PROVIDER",
+        help="LLM provider to use: a registered name (see 'providers') or module:ClassName. "
+        "Repeat as NAME=PROVIDER to compare several named targets in one run",
     )
 
     parser.add_argument(
         "--provider-config",
-        type=Path,
-        help="JSON configuration file for provider",
+        action="append",
+        metavar="[NAME=]PATH",
+        help="JSON configuration file for provider; NAME=PATH for a named target (repeatable)",
     )
 
     parser.add_argument(
@@ -57,55 +56,509 @@ Examples:
         help="Filter test cases by ID pattern (e.g., 'det-*')",
     )
 
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Number of worker processes to shard test cases across (default: 1)",
+    )
+
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Stream provider output and record time-to-first-token",
+    )
+
+    parser.add_argument(
+        "--fail-fast",
+        action="store_true",
+        help="Abort adversarial generations on the first unacceptable pattern (implies --stream)",
+    )
+
+    parser.add_argument(
+        "--schedule",
+        choices=["priority", "catalog"],
+        default="priority",
+        help="Execution order: by priority, risk tier and failure history (default), "
+        "or catalog order",
+    )
+
+    parser.add_argument(
+        "--history",
+        type=Path,
+        action="append",
+        metavar="DIR",
+        help="Results directory of an earlier run; cases that failed there run first (repeatable)",
+    )
+
+    parser.add_argument(
+        "--deadline",
+        metavar="WHEN",
+        help="Start no new test case after this time: a duration (90m, 2h30m) "
+        "or a UTC time (2026-10-19T06:00:00Z)",
+    )
+
+    parser.add_argument(
+        "--prices",
+        type=Path,
+        help="JSON price table (USD per million prompt/completion tokens, by model)",
+    )
+
+    parser.add_argument(
+        "--token-budget",
+        type=int,
+        help="Stop starting new test cases once this many tokens are used",
+    )
+
+    parser.add_argument(
+        "--cost-budget",
+        type=float,
+        metavar="USD",
+        help="Stop starting new test cases once this cost is reached (requires --prices)",
+    )
+
+    parser.add_argument(
+        "--status-interval",
+        type=float,
+        default=5.0,
+        metavar="SECONDS",
+        help="Seconds between rewrites of OUTPUT/run_status.json (default: 5)",
+    )
+
+    parser.add_argument(
+        "--prometheus-file",
+        type=Path,
+        help="Also rewrite live metrics to this file in Prometheus text format",
+    )
+
+    parser.add_argument(
+        "--metrics-port",
+        type=int,
+        help="Serve live metrics at http://127.0.0.1:PORT/metrics (and /status as JSON)",
+    )
+
     parser.add_argument(
         "--verbose",
         action="store_true",
         help="Enable verbose logging",
     )
 
+    parser.set_defaults(handler=cmd_run)
+
+
+def add_metrics_parser(subparsers):
+    """Add the ``metrics`` subcommand."""
+    parser = subparsers.add_parser(
+        "metrics",
+        help="Compute metrics from existing transcripts",
+        description="Compute metrics from existing transcripts without re-running tests",
+    )
+
+    parser.add_argument(
+        "results_dir",
+        nargs="?",
+        type=Path,
+        help="Directory containing JSONL transcripts",
+    )
+
+    parser.add_argument(
+        "--output",
+        type=Path,
+        help="Same as results_dir (kept for the --metrics-only invocation)",
+    )
+
     parser.add_argument(
-        "--metrics-only",
+        "--quiet",
         action="store_true",
-        help="Compute metrics from existing transcripts without re-running tests",
+        help="Do not print the metrics summary",
     )
 
-    args = parser.parse_args()
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument(
+        "--index",
+        type=Path,
+        metavar="DB",
+        help="Index the transcripts into this SQLite database and aggregate there "
+        "(summary and category metrics only)",
+    )
+    mode.add_argument(
+        "--vectorized",
+        action="store_true",
+        help="Aggregate with NumPy and add bootstrap confidence intervals "
+        "(requires the 'vectorized' extra)",
+    )
 
-    # Validation
-    if not args.metrics_only:
-        if not args.catalog:
-            parser.error("--catalog is required unless --metrics-only is specified")
-        if not args.provider:
-            parser.error("--provider is required unless --metrics-only is specified")
+    parser.add_argument(
+        "--bootstrap",
+        type=int,
+        default=1000,
+        metavar="N",
+        help="Bootstrap resamples per confidence interval with --vectorized (default: 1000)",
+    )
 
-    return args
+    parser.set_defaults(handler=cmd_metrics)
 
 
-def main():
-    """Main entry point for CLI."""
-    args = parse_args()
+def add_validate_parser(subparsers):
+    """Add the ``validate`` subcommand."""
+    parser = subparsers.add_parser(
+        "validate",
+        help="Validate a test case catalog",
+        description="Load a catalog and validate every test case without running it",
+    )
 
-    # Create output directory
-    args.output.mkdir(parents=True, exist_ok=True)
+    parser.add_argument(
+        "catalog",
+        type=Path,
+        help="Path to YAML test case catalog",
+    )
 
-    if args.metrics_only:
-        print("Computing metrics from existing transcripts...")
-        from .metrics import MetricsComputer
+    parser.set_defaults(handler=cmd_validate)
 
-        computer = MetricsComputer(args.output)
-        metrics = computer.compute_all_metrics()
 
-        # Write metrics summary
-        import json
+def add_diff_parser(subparsers):
+    """Add the ``diff`` subcommand."""
+    parser = subparsers.add_parser(
+        "diff",
+        help="Compare two results directories",
+        description="Compare a candidate run against a base run and report regressions",
+    )
 
-        metrics_file = args.output / "metrics_summary.json"
-        with open(metrics_file, "w") as f:
-            json.dump(metrics, indent=2, fp=f)
+    parser.add_argument(
+        "base_dir",
+        type=Path,
+        help="Results directory of the reference run",
+    )
+
+    parser.add_argument(
+        "candidate_dir",
+        type=Path,
+        help="Results directory of the run being checked",
+    )
+
+    parser.add_argument(
+        "--output",
+        type=Path,
+        help="Write the full diff as JSON to this file",
+    )
+
+    parser.add_argument(
+        "--latency-threshold",
+        type=float,
+        default=0.5,
+        help="Relative mean-latency increase reported per case (default: 0.5)",
+    )
+
+    parser.add_argument(
+        "--consistency-threshold",
+        type=float,
+        default=0.1,
+        help="Absolute decision-consistency change reported per case (default: 0.1)",
+    )
+
+    parser.add_argument(
+        "--top",
+        type=int,
+        default=10,
+        help="Cases listed per section in the printed summary (default: 10)",
+    )
+
+    parser.set_defaults(handler=cmd_diff)
+
+
+def add_report_parser(subparsers):
+    """Add the ``report`` subcommand."""
+    parser = subparsers.add_parser(
+        "report",
+        help="Generate an audit report and evidence pack",
+        description="Fill the audit report template, sample failing transcripts, "
+        "prefill the defect log and hash every evidence file",
+    )
+
+    parser.add_argument(
+        "results_dir",
+        type=Path,
+        help="Directory containing JSONL transcripts",
+    )
+
+    parser.add_argument(
+        "--output",
+        type=Path,
+        help="Evidence pack directory (default: RESULTS_DIR/evidence-pack)",
+    )
+
+    parser.add_argument(
+        "--template",
+        type=Path,
+        help="Audit report Markdown template (default: templates/audit-report-template.md)",
+    )
+
+    parser.add_argument(
+        "--risk-tier",
+        choices=["critical", "high", "medium", "low"],
+        help="Risk tier of the use case; sets the factual-accuracy target",
+    )
+
+    parser.add_argument(
+        "--sample-size",
+        type=int,
+        default=5,
+        help="Failing transcripts sampled per category for the appendices (default: 5)",
+    )
+
+    parser.add_argument(
+        "--seed",
+        type=int,
+        default=0,
+        help="Seed for transcript sampling (default: 0)",
+    )
+
+    parser.set_defaults(handler=cmd_report)
+
+
+def add_verify_parser(subparsers):
+    """Add the ``verify`` subcommand."""
+    parser = subparsers.add_parser(
+        "verify",
+        help="Verify transcript hash chains and sealed manifests",
+        description="Check the hash chain and sealed manifest of every transcript file. "
+        "Set LLM_AUDIT_SEAL_KEY to check HMAC seals.",
+    )
+
+    parser.add_argument(
+        "results_dir",
+        type=Path,
+        help="Directory containing JSONL transcripts",
+    )
+
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Worker processes verifying shard files in parallel (default: CPU count)",
+    )
+
+    parser.set_defaults(handler=cmd_verify)
+
+
+def add_query_parser(subparsers):
+    """Add the ``query`` subcommand."""
+    parser = subparsers.add_parser(
+        "query",
+        help="Query indexed transcripts across runs",
+        description="Index results directories into a SQLite database and list matching "
+        "executions, or run SQL over the runs, files and executions tables",
+    )
+
+    parser.add_argument(
+        "index",
+        type=Path,
+        help="SQLite index database (created if missing)",
+    )
+
+    parser.add_argument(
+        "--ingest",
+        type=Path,
+        action="append",
+        metavar="DIR",
+        help="Index new records from this results directory first (repeatable)",
+    )
+
+    parser.add_argument("--case", help="Test case ID or glob pattern (e.g. 'adv-0*')")
+    parser.add_argument("--category", help="Test category")
+    parser.add_argument("--severity", help="Test case severity")
+    parser.add_argument("--priority", help="Test case priority")
+    parser.add_argument("--target", help="Target name of a multi-target run")
+    parser.add_argument("--run", help="Run name or results directory")
+
+    parser.add_argument(
+        "--last-runs",
+        type=int,
+        metavar="N",
+        help="Only the N most recent runs",
+    )
+
+    parser.add_argument(
+        "--since",
+        metavar="TIMESTAMP",
+        help="Only executions at or after this UTC time (e.g. 2026-10-01)",
+    )
+
+    verdict = parser.add_mutually_exclusive_group()
+    verdict.add_argument("--failed", action="store_true", help="Only failing executions")
+    verdict.add_argument("--passed", action="store_true", help="Only passing executions")
+
+    parser.add_argument(
+        "--limit",
+        type=int,
+        default=50,
+        help="Maximum executions listed (default: 50, 0 for no limit)",
+    )
+
+    parser.add_argument(
+        "--records",
+        action="store_true",
+        help="Print the full transcript records as JSON lines instead of a table",
+    )
+
+    parser.add_argument(
+        "--sql",
+        help="Run this read-only SQL query instead of the filters",
+    )
+
+    parser.set_defaults(handler=cmd_query)
+
+
+def add_providers_parser(subparsers):
+    """Add the ``providers`` subcommand."""
+    parser = subparsers.add_parser(
+        "providers",
+        help="List registered providers",
+        description="List provider names resolvable with --provider",
+    )
+
+    parser.set_defaults(handler=cmd_providers)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Build the argument parser with all subcommands."""
+    parser = argparse.ArgumentParser(
+        prog="llm-audit-runner",
+        description="LLM Audit Runner - Execute test cases and compute metrics",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  # Run tests with stub provider
+  %(prog)s run --catalog tests.yaml --output results/ --provider stub
+
+  # Filter to specific test cases
+  %(prog)s run --catalog tests.yaml --output results/ --provider stub --filter "det-*"
+
+  # Shard test cases across 4 worker processes
+  %(prog)s run --catalog tests.yaml --output results/ --provider stub --workers 4
+
+  # Compute metrics only (no execution)
+  %(prog)s metrics results/
+
+  # Check a catalog before running it
+  %(prog)s validate tests.yaml
+
+  # Compare a model upgrade against the previous run
+  %(prog)s diff results-old/ results-new/ --output diff.json
+
+  # Build the audit report and evidence pack
+  %(prog)s report results/ --risk-tier high
+
+  # Check that transcripts have not been modified
+  %(prog)s verify results/
+
+  # Critical adversarial failures over the last 30 indexed runs
+  %(prog)s query audit.db --ingest results/ --category adversarial --severity critical \\
+      --failed --last-runs 30
+        """,
+    )
+
+    subparsers = parser.add_subparsers(dest="command", metavar="COMMAND")
+    add_run_parser(subparsers)
+    add_metrics_parser(subparsers)
+    add_validate_parser(subparsers)
+    add_diff_parser(subparsers)
+    add_report_parser(subparsers)
+    add_verify_parser(subparsers)
+    add_query_parser(subparsers)
+    add_providers_parser(subparsers)
+
+    return parser
 
-        print(f"Metrics saved to {metrics_file}")
-        print("\nSummary:")
-        print(json.dumps(metrics, indent=2))
-        return 0
+
+def translate_legacy_args(argv: list) -> list:
+    """
+    Map the original flag-only invocation onto subcommands.
+
+    ``--catalog ... --provider ...`` becomes ``run ...``,
+    ``--metrics-only --output DIR`` becomes ``metrics --output DIR`` and
+    ``--list-providers`` becomes ``providers``.
+
+    Args:
+        argv: Command-line arguments (without the program name)
+
+    Returns:
+        Arguments starting with a subcommand
+    """
+    if not argv or not argv[0].startswith("-") or argv[0] in ("-h", "--help"):
+        return argv
+
+    for flag, command in LEGACY_FLAGS.items():
+        if flag in argv:
+            return [command] + [arg for arg in argv if arg != flag]
+
+    return ["run"] + argv
+
+
+def write_metrics(metrics: dict, output_dir: Path) -> Path:
+    """
+    Write metrics_summary.json to a results directory.
+
+    Args:
+        metrics: Metrics dictionary
+        output_dir: Results directory
+
+    Returns:
+        Path to the written file
+    """
+    import json
+
+    metrics_file = output_dir / "metrics_summary.json"
+    with open(metrics_file, "w") as f:
+        json.dump(metrics, indent=2, fp=f)
+    return metrics_file
+
+
+def cmd_run(args) -> int:
+    """Execute test cases and compute metrics."""
+    import json
+    import os
+
+    from .catalog import load_catalog
+    from .cost import Budget, PriceTable
+    from .integrity import SEAL_KEY_ENV
+    from .metrics import MetricsComputer
+    from .registry import get_provider, parse_targets
+    from .run import ComparisonRunner, ParallelTestRunner, TestRunner
+    from .scheduler import Scheduler, load_failure_history, parse_deadline
+    from .telemetry import Telemetry, planned_executions
+
+    if args.workers < 1:
+        print("--workers must be at least 1", file=sys.stderr)
+        return 2
+
+    if args.cost_budget is not None and args.prices is None:
+        print("--cost-budget requires --prices", file=sys.stderr)
+        return 2
+
+    try:
+        targets = parse_targets(args.provider, args.provider_config or [])
+    except ValueError as e:
+        print(str(e), file=sys.stderr)
+        return 2
+    comparing = len(targets) > 1
+    if comparing and args.workers > 1:
+        print(
+            "--workers cannot be combined with several targets; targets already run concurrently",
+            file=sys.stderr,
+        )
+        return 2
+
+    deadline = None
+    if args.deadline:
+        try:
+            deadline = parse_deadline(args.deadline)
+        except ValueError as e:
+            print(str(e), file=sys.stderr)
+            return 2
+
+    # Create output directory
+    args.output.mkdir(parents=True, exist_ok=True)
 
     # Load test catalog
     print(f"Loading test catalog from {args.catalog}...")
@@ -128,27 +581,105 @@ def main():
         print("No test cases to run", file=sys.stderr)
         return 1
 
-    # Initialize provider
-    print(f"Initializing {args.provider} provider...")
-    provider_config = {}
-    if args.provider_config:
-        import json
+    if args.schedule == "priority":
+        scheduler = Scheduler(catalog.get("risk_tier"), load_failure_history(args.history or []))
+        test_cases = scheduler.order(test_cases)
+        schedule = scheduler.summary()
+    else:
+        schedule = {"policy": "catalog"}
 
-        with open(args.provider_config) as f:
-            provider_config = json.load(f)
+    # Initialize providers
+    providers = {}
+    provider_configs = {}
+    for name, (provider_name, config_path) in targets.items():
+        print(
+            f"Initializing {provider_name} provider"
+            + (f" for target {name}..." if comparing else "...")
+        )
+        provider_config = {}
+        if config_path:
+            with open(config_path) as f:
+                provider_config = json.load(f)
+        provider_configs[name] = provider_config
 
-    provider = get_provider(args.provider, provider_config)
+        # Built here even in multi-process mode so configuration errors
+        # surface before any worker starts
+        try:
+            providers[name] = get_provider(provider_name, provider_config)
+        except (ValueError, TypeError, ImportError) as e:
+            print(f"Error initializing provider: {e}", file=sys.stderr)
+            return 1
 
-    # Run tests
-    print(f"Running {len(test_cases)} test cases...")
-    runner = TestRunner(
-        provider=provider,
-        output_dir=args.output,
-        verbose=args.verbose,
-    )
+    runner_options = {"stream": args.stream, "fail_fast": args.fail_fast}
+    if args.prices:
+        try:
+            runner_options["prices"] = PriceTable.from_file(args.prices)
+        except (OSError, ValueError) as e:
+            print(f"Error loading price table: {e}", file=sys.stderr)
+            return 1
+    budget = None
+    if args.token_budget is not None or args.cost_budget is not None or deadline is not None:
+        budget = Budget(max_tokens=args.token_budget, max_cost=args.cost_budget, deadline=deadline)
+    execution_config = catalog.get("execution_config") or {}
+    if execution_config.get("context_header"):
+        runner_options["context_header"] = execution_config["context_header"]
+    if os.environ.get(SEAL_KEY_ENV):
+        runner_options["seal_key"] = os.environ[SEAL_KEY_ENV]
+
+    try:
+        telemetry = Telemetry(
+            sum(planned_executions(tc) for tc in test_cases) * len(targets),
+            output_dir=args.output,
+            status_interval=args.status_interval,
+            prometheus_file=args.prometheus_file,
+            metrics_port=args.metrics_port,
+            verbose=args.verbose,
+        )
+    except OSError as e:
+        print(f"Error starting metrics endpoint: {e}", file=sys.stderr)
+        return 1
+    if telemetry.url:
+        print(f"Serving live metrics at {telemetry.url}/metrics")
+
+    # Run tests; an ordinary run has exactly one target
+    target = None if comparing else next(iter(targets))
+    if comparing:
+        print(f"Running {len(test_cases)} test cases against targets {', '.join(targets)}...")
+        runner = ComparisonRunner(
+            providers,
+            args.output,
+            verbose=args.verbose,
+            telemetry=telemetry,
+            budget=budget,
+            **runner_options,
+        )
+    elif args.workers > 1:
+        print(f"Running {len(test_cases)} test cases across {args.workers} workers...")
+        runner = ParallelTestRunner(
+            provider_name=targets[target][0],
+            provider_config=provider_configs[target],
+            output_dir=args.output,
+            workers=args.workers,
+            verbose=args.verbose,
+            runner_options=runner_options,
+            telemetry=telemetry,
+            budget=budget,
+        )
+    else:
+        print(f"Running {len(test_cases)} test cases...")
+        runner = TestRunner(
+            provider=providers[target],
+            output_dir=args.output,
+            verbose=args.verbose,
+            telemetry=telemetry,
+            budget=budget,
+            **runner_options,
+        )
 
+    state = "failed"
     try:
-        results = runner.run_test_cases(test_cases, catalog.get("execution_config", {}))
+        results = runner.run_test_cases(test_cases, execution_config)
+        state = "stopped" if results.get("budget", {}).get("stopped") else "finished"
     except Exception as e:
         print(f"Error running tests: {e}", file=sys.stderr)
         if args.verbose:
@@ -156,19 +687,28 @@ def main():
 
             traceback.print_exc()
         return 1
+    finally:
+        # Seal the transcripts; worker shards are sealed as the pool shuts down
+        if comparing:
+            runner.close()
+        elif args.workers == 1:
+            runner.writer.close()
+        telemetry.close(state)
 
     # Compute and save metrics
     print("\nComputing metrics...")
-    from .metrics import MetricsComputer
-
     computer = MetricsComputer(args.output)
     metrics = computer.compute_all_metrics()
 
-    import json
+    # Serialization and write latencies are only known to the runner
+    if "performance" in metrics and "performance" in results:
+        metrics["performance"]["runner_phases"] = results["performance"]["phases"]
+    if "error" not in metrics:
+        schedule["test_cases_run"] = results["test_cases_run"]
+        schedule.update(results.get("budget") or {"stopped": None, "skipped_test_cases": []})
+        metrics["schedule"] = schedule
 
-    metrics_file = args.output / "metrics_summary.json"
-    with open(metrics_file, "w") as f:
-        json.dump(metrics, indent=2, fp=f)
+    metrics_file = write_metrics(metrics, args.output)
 
     print(f"\nResults saved to {args.output}")
     print(f"Metrics summary: {metrics_file}")
@@ -176,8 +716,341 @@ def main():
     print(f"  Total executions: {results['total_executions']}")
     print(f"  Successful: {results['successful']}")
     print(f"  Failed: {results['failed']}")
+    for name, counts in results.get("targets", {}).items():
+        print(f"    {name}: {counts['total_executions']} executions, {counts['failed']} failed")
+
+    comparison = metrics.get("comparison")
+    if comparison:
+        won = ", ".join(f"{name} {count}" for name, count in comparison["cases_won"].items())
+        print(f"  Test cases won: {won}")
+
+    conversations = results.get("conversations", {})
+    if conversations.get("turns_reused"):
+        print(
+            f"  Conversation turns: {conversations['turns_executed']} executed, "
+            f"{conversations['turns_reused']} replayed from shared history"
+        )
+
+    cost = results.get("cost", {})
+    if cost.get("executions"):
+        print(
+            f"  Tokens: {cost['prompt_tokens']} prompt + {cost['completion_tokens']} completion"
+            + (f", cost ${cost['cost_usd']:.4f}" if args.prices else "")
+        )
+
+    budget_summary = results.get("budget", {})
+    if budget_summary.get("stopped"):
+        print(
+            f"  Stopped early: {budget_summary['stopped']}; "
+            f"{len(budget_summary['skipped_test_cases'])} test case(s) not run"
+        )
+
+    prompt_assembly = results.get("prompt_assembly", {})
+    if prompt_assembly.get("prompts_with_context"):
+        print(
+            f"  Context prefix reuse: {prompt_assembly['prefix_bytes_reused']} bytes "
+            f"(~{prompt_assembly['prefix_tokens_reused']} tokens) across "
+            f"{prompt_assembly['prompts_with_context']} prompts with context"
+        )
+
+    return 0 if results["failed"] == 0 and not budget_summary.get("stopped") else 1
+
+
+def cmd_metrics(args) -> int:
+    """Compute metrics from existing transcripts."""
+    import json
+
+    from .metrics import MetricsComputer
+
+    results_dir = args.results_dir or args.output
+    if results_dir is None:
+        print("A results directory is required", file=sys.stderr)
+        return 2
+    if not results_dir.is_dir():
+        print(f"Results directory not found: {results_dir}", file=sys.stderr)
+        return 1
+
+    print("Computing metrics from existing transcripts...")
+    index = None
+    if args.index:
+        from .index import TranscriptIndex
+
+        index = TranscriptIndex(args.index)
+    if args.vectorized:
+        if args.bootstrap < 1:
+            print("--bootstrap must be at least 1", file=sys.stderr)
+            return 2
+        try:
+            from .vectorized import VectorizedMetricsComputer
+        except ImportError as e:
+            print(str(e), file=sys.stderr)
+            return 2
+        computer = VectorizedMetricsComputer(results_dir, resamples=args.bootstrap)
+    else:
+        computer = MetricsComputer(results_dir, index=index)
+    try:
+        metrics = computer.compute_all_metrics()
+    finally:
+        if index is not None:
+            index.close()
+    metrics_file = write_metrics(metrics, results_dir)
+
+    print(f"Metrics saved to {metrics_file}")
+    if not args.quiet:
+        print("\nSummary:")
+        print(json.dumps(metrics, indent=2))
+    return 0
+
+
+def cmd_validate(args) -> int:
+    """Validate every test case in a catalog."""
+    from .catalog import load_catalog, validate_test_case
+
+    try:
+        catalog = load_catalog(args.catalog)
+    except Exception as e:
+        print(f"Invalid catalog: {e}", file=sys.stderr)
+        return 1
+
+    errors = []
+    seen_ids = set()
+    for test_case in catalog["test_cases"]:
+        try:
+            validate_test_case(test_case)
+        except ValueError as e:
+            errors.append(str(e))
+        if test_case["id"] in seen_ids:
+            errors.append(f"Duplicate test case id: {test_case['id']}")
+        seen_ids.add(test_case["id"])
+
+    for error in errors:
+        print(f"  {error}", file=sys.stderr)
+
+    total = len(catalog["test_cases"])
+    if errors:
+        print(f"{len(errors)} problem(s) found in {total} test cases", file=sys.stderr)
+        return 1
+
+    print(f"Catalog is valid: {total} test cases")
+    return 0
+
+
+def cmd_diff(args) -> int:
+    """Compare two results directories."""
+    import json
+
+    from .diff import RunDiff
+
+    for results_dir in (args.base_dir, args.candidate_dir):
+        if not results_dir.is_dir():
+            print(f"Results directory not found: {results_dir}", file=sys.stderr)
+            return 1
+
+    diff = RunDiff(
+        args.base_dir,
+        args.candidate_dir,
+        latency_threshold=args.latency_threshold,
+        consistency_threshold=args.consistency_threshold,
+    ).compute()
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(diff, f, indent=2)
+
+    executions = diff["executions"]
+    flips = diff["verdict_flips"]
+    print(
+        f"Matched {executions['matched']} executions "
+        f"({executions['only_in_base']} only in base, "
+        f"{executions['only_in_candidate']} only in candidate)"
+    )
+    print(f"Verdict flips: {flips['regressions']} regressions, {flips['fixes']} fixes")
+    for case in flips["per_test_case"][: args.top]:
+        if case["regressions"]:
+            print(f"  {case['test_case_id']}: regressed in repetitions {case['regressions']}")
+
+    consistency = diff["consistency"]
+    print(
+        f"Mean decision consistency: {consistency['base_mean']} -> {consistency['candidate_mean']}"
+    )
+    for case in consistency["changed_cases"][: args.top]:
+        print(f"  {case['test_case_id']}: {case['base']} -> {case['candidate']}")
+
+    latency = diff["latency"]
+    print(
+        f"Provider latency p50/p99: {latency['base']['p50_ms']}/{latency['base']['p99_ms']} ms"
+        f" -> {latency['candidate']['p50_ms']}/{latency['candidate']['p99_ms']} ms"
+    )
+    for case in latency["shifted_cases"][: args.top]:
+        print(
+            f"  {case['test_case_id']}: {case['base_mean_ms']} -> "
+            f"{case['candidate_mean_ms']} ms (x{case['ratio']})"
+        )
+
+    critical = diff["new_critical_failures"]
+    print(f"New critical adversarial failures: {len(critical)}")
+    for case in critical[: args.top]:
+        print(f"  {case['test_case_id']} ({case['subcategory']})")
+
+    if args.output:
+        print(f"Diff saved to {args.output}")
+    return 1 if diff["regressed"] else 0
+
+
+def cmd_report(args) -> int:
+    """Generate an audit report and evidence pack."""
+    from .report import DEFAULT_TEMPLATE, ReportBuilder
+
+    if not args.results_dir.is_dir():
+        print(f"Results directory not found: {args.results_dir}", file=sys.stderr)
+        return 1
+    if args.sample_size < 0:
+        print("--sample-size must not be negative", file=sys.stderr)
+        return 2
+
+    output_dir = args.output or args.results_dir / "evidence-pack"
+    builder = ReportBuilder(
+        args.results_dir,
+        output_dir,
+        template_path=args.template or DEFAULT_TEMPLATE,
+        sample_size=args.sample_size,
+        seed=args.seed,
+        risk_tier=args.risk_tier,
+    )
+    try:
+        summary = builder.build()
+    except FileNotFoundError as e:
+        print(f"Report template not found: {e.filename} (use --template)", file=sys.stderr)
+        return 1
+
+    print(
+        f"Processed {summary['executions']} executions of {summary['test_cases']} test cases "
+        f"({summary['failed_executions']} failing)"
+    )
+    print(f"Defects logged: {summary['defects']}")
+    print(f"Evidence pack written to {output_dir}")
+    for path in summary["files"]:
+        print(f"  {path}")
+    print(f"Manifest: {summary['manifest']}")
+    return 0
+
+
+def cmd_verify(args) -> int:
+    """Verify transcript hash chains and sealed manifests."""
+    import os
+
+    from .integrity import SEAL_KEY_ENV, verify_directory
+
+    if not args.results_dir.is_dir():
+        print(f"Results directory not found: {args.results_dir}", file=sys.stderr)
+        return 1
+
+    key = os.environ.get(SEAL_KEY_ENV)
+    results = verify_directory(args.results_dir, key=key, workers=args.workers or os.cpu_count())
+    if not results:
+        print(f"No transcripts found in {args.results_dir}", file=sys.stderr)
+        return 1
+
+    # With a seal key every transcript must be chained and sealed
+    failing = {"tampered", "unchained", "unsealed"} if key else {"tampered"}
+    failed = 0
+    for result in results:
+        status = result["status"]
+        detail = f"{result['records']} records" if result["records"] is not None else ""
+        if status == "ok" and not result["seal_verified"]:
+            detail += f", HMAC seal not checked (set {SEAL_KEY_ENV})"
+        print(f"{status.upper():<10} {result['file']} {detail}".rstrip())
+        for error in result["errors"]:
+            print(f"  {error}")
+        failed += status in failing
+
+    if failed:
+        print(f"{failed} of {len(results)} transcript(s) failed verification", file=sys.stderr)
+        return 1
+    print(f"Verified {len(results)} transcript(s)")
+    return 0
+
+
+def cmd_query(args) -> int:
+    """Index results directories and query executions across runs."""
+    import json
+    import sqlite3
+
+    from .index import TranscriptIndex
+
+    with TranscriptIndex(args.index) as index:
+        for results_dir in args.ingest or []:
+            if not results_dir.is_dir():
+                print(f"Results directory not found: {results_dir}", file=sys.stderr)
+                return 1
+            ingested = index.ingest(results_dir)
+            print(
+                f"Indexed {ingested['records_added']} new records from {ingested['files']} "
+                f"file(s) of run {ingested['run']}",
+                file=sys.stderr,
+            )
+
+        if args.sql:
+            try:
+                columns, rows = index.sql(args.sql)
+            except sqlite3.Error as e:
+                print(f"SQL error: {e}", file=sys.stderr)
+                return 2
+            print("\t".join(columns))
+            for row in rows:
+                print("\t".join("" if value is None else str(value) for value in row))
+            return 0
+
+        rows = index.query(
+            test_case=args.case,
+            category=args.category,
+            severity=args.severity,
+            priority=args.priority,
+            target=args.target,
+            run=args.run,
+            last_runs=args.last_runs,
+            since=args.since,
+            passed=True if args.passed else False if args.failed else None,
+            limit=args.limit or None,
+        )
+
+        if args.records:
+            for row in rows:
+                print(json.dumps(index.load_record(row), ensure_ascii=False))
+            return 0
+
+        verdicts = {1: "pass", 0: "fail", None: "-"}
+        print("run\ttest_case_id\trepetition\tcategory\tseverity\tverdict\tdecision\ttimestamp")
+        for row in rows:
+            print(
+                f"{row['run']}\t{row['test_case_id']}\t{row['repetition']}\t{row['category']}\t"
+                f"{row['severity'] or '-'}\t{verdicts[row['passed']]}\t{row['decision'] or '-'}\t"
+                f"{row['timestamp']}"
+            )
+        print(f"{len(rows)} execution(s)", file=sys.stderr)
+    return 0
+
+
+def cmd_providers(args) -> int:
+    """List registered providers."""
+    from .registry import available_providers
+
+    for name, target in available_providers().items():
+        print(f"{name:<12} {target}")
+    return 0
+
+
+def main(argv: list = None) -> int:
+    """Main entry point for CLI."""
+    argv = translate_legacy_args(sys.argv[1:] if argv is None else list(argv))
+    parser = build_parser()
+    args = parser.parse_args(argv)
+
+    if args.command is None:
+        parser.print_help()
+        return 2
 
-    return 0 if results["failed"] == 0 else 1
+    return args.handler(args)
 
 
 if __name__ == "__main__":
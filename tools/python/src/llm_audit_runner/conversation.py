@@ -0,0 +1,101 @@
+"""Multi-turn conversation replay with shared dialogue prefixes."""
+
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+
+class DialogueNode:
+    """
+    One user turn in the dialogue tree, with the reply it received.
+
+    Attributes:
+        reply: Assistant reply to this turn (None until executed)
+        children: Next user turns, keyed by their input text
+    """
+
+    __slots__ = ("reply", "children")
+
+    def __init__(self):
+        self.reply: Optional[str] = None
+        self.children: Dict[str, "DialogueNode"] = {}
+
+
+class DialogueTree:
+    """
+    Prefix tree of the conversations executed during a run.
+
+    Conversations that start with the same user turns (and use the same
+    generation parameters) share a path from the root. Each turn's reply is
+    kept on its node, so a later conversation that shares the path replays
+    the stored history instead of calling the provider again and branches
+    off only where its turns differ. The final turn of a conversation is
+    always executed afresh, so every repetition of a case sees identical
+    history and contributes its own final reply.
+    """
+
+    def __init__(self):
+        """Initialize an empty tree."""
+        self._roots: Dict[Hashable, DialogueNode] = {}
+        self.stats = {"turns_executed": 0, "turns_reused": 0}
+
+    def root(self, params: Hashable) -> DialogueNode:
+        """
+        Get the root node for a set of generation parameters.
+
+        Args:
+            params: Hashable generation parameters (e.g. temperature, max_tokens)
+
+        Returns:
+            Root node shared by conversations using these parameters
+        """
+        node = self._roots.get(params)
+        if node is None:
+            node = self._roots[params] = DialogueNode()
+        return node
+
+    def step(self, node: DialogueNode, user_input: str, final: bool) -> Tuple[DialogueNode, bool]:
+        """
+        Advance from a node along a user turn.
+
+        Args:
+            node: Current node
+            user_input: Next user turn
+            final: True for the conversation's last turn, which is never reused
+
+        Returns:
+            Tuple of (child node, True if its stored reply can be reused)
+        """
+        child = node.children.get(user_input)
+        if child is None:
+            child = node.children[user_input] = DialogueNode()
+        reusable = child.reply is not None and not final
+        self.stats["turns_reused" if reusable else "turns_executed"] += 1
+        return child, reusable
+
+    def drain_stats(self) -> Dict[str, int]:
+        """
+        Return the counters accumulated so far and reset them.
+
+        Returns:
+            Counter dictionary
+        """
+        stats, self.stats = self.stats, {"turns_executed": 0, "turns_reused": 0}
+        return stats
+
+
+def turn_case(test_case: Dict[str, Any], turn: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Build the case a single turn is evaluated as.
+
+    Turn-level expectation fields (``expected_decision``, ``expected_facts``,
+    ``unacceptable_responses``, ...) override the case's own fields.
+
+    Args:
+        test_case: Conversation test case
+        turn: One entry of its ``turns`` list
+
+    Returns:
+        Test case dictionary for the turn
+    """
+    case = {key: value for key, value in test_case.items() if key != "turns"}
+    case.update(turn)
+    return case
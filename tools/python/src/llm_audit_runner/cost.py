@@ -0,0 +1,381 @@
+"""Token usage and cost accounting with budget enforcement."""
+
+import json
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+from .prompts import estimate_tokens
+
+# Price table entry used for models without their own entry
+DEFAULT_PRICE_KEY = "default"
+
+
+def execution_usage(prompt: str, output: str) -> Dict[str, Any]:
+    """
+    Get the token usage of one provider call.
+
+    Uses the usage a provider attached to its output (see
+    provider.Completion) and falls back to estimating both sides at
+    about four characters per token.
+
+    Args:
+        prompt: Prompt text sent to the provider
+        output: Text the provider returned
+
+    Returns:
+        Dictionary with ``prompt_tokens`` and ``completion_tokens``, plus
+        ``estimated: True`` when the counts are estimates
+    """
+    usage = getattr(output, "usage", None)
+    if usage:
+        return {
+            "prompt_tokens": int(usage.get("prompt_tokens", 0)),
+            "completion_tokens": int(usage.get("completion_tokens", 0)),
+        }
+    return {
+        "prompt_tokens": estimate_tokens(prompt),
+        "completion_tokens": estimate_tokens(output or ""),
+        "estimated": True,
+    }
+
+
+def combine_usage(usages: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Add up the usage of several provider calls.
+
+    Args:
+        usages: execution_usage() dictionaries
+
+    Returns:
+        Combined usage, marked estimated if any part was
+    """
+    combined: Dict[str, Any] = {"prompt_tokens": 0, "completion_tokens": 0}
+    for usage in usages:
+        combined["prompt_tokens"] += usage["prompt_tokens"]
+        combined["completion_tokens"] += usage["completion_tokens"]
+        if usage.get("estimated"):
+            combined["estimated"] = True
+    return combined
+
+
+class PriceTable:
+    """
+    Token prices per model.
+
+    Prices are in USD per million tokens, e.g.::
+
+        {
+            "gpt-4o": {"prompt": 2.50, "completion": 10.00},
+            "default": {"prompt": 1.00, "completion": 4.00}
+        }
+
+    The ``default`` entry, if present, prices models without their own entry.
+    """
+
+    def __init__(self, prices: Dict[str, Dict[str, float]]):
+        """
+        Initialize price table.
+
+        Args:
+            prices: Model name to ``{"prompt": ..., "completion": ...}`` prices
+
+        Raises:
+            ValueError: If an entry is missing a price or has a negative one
+        """
+        self.prices: Dict[str, Dict[str, float]] = {}
+        for model, entry in prices.items():
+            if not isinstance(entry, dict):
+                raise ValueError(f"Price entry for '{model}' must be a dictionary")
+            for side in ("prompt", "completion"):
+                if not isinstance(entry.get(side), (int, float)) or entry[side] < 0:
+                    raise ValueError(f"Price entry for '{model}' needs a non-negative '{side}'")
+            self.prices[model] = {side: float(entry[side]) for side in ("prompt", "completion")}
+
+    @classmethod
+    def from_file(cls, path: Path) -> "PriceTable":
+        """
+        Load a price table from a JSON file.
+
+        Args:
+            path: Path to the JSON price table
+
+        Returns:
+            PriceTable instance
+        """
+        with open(path, "r") as f:
+            prices = json.load(f)
+        if not isinstance(prices, dict):
+            raise ValueError("Price table must be a JSON object keyed by model name")
+        return cls(prices)
+
+    def cost(self, model: str, usage: Dict[str, Any]) -> Optional[float]:
+        """
+        Price the usage of one execution.
+
+        Args:
+            model: Model name
+            usage: Dictionary with ``prompt_tokens`` and ``completion_tokens``
+
+        Returns:
+            Cost in USD, or None if the model has no price
+        """
+        entry = self.prices.get(model) or self.prices.get(DEFAULT_PRICE_KEY)
+        if entry is None:
+            return None
+        return (
+            usage["prompt_tokens"] * entry["prompt"]
+            + usage["completion_tokens"] * entry["completion"]
+        ) / 1_000_000
+
+
+class _UsageTotals:
+    """Token and cost counters for one group of executions."""
+
+    __slots__ = (
+        "executions",
+        "prompt_tokens",
+        "completion_tokens",
+        "cost",
+        "unpriced",
+        "estimated",
+    )
+
+    def __init__(self):
+        self.executions = 0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self.cost = 0.0
+        self.unpriced = 0
+        self.estimated = 0
+
+    def add(self, usage: Dict[str, Any], cost: Optional[float]):
+        """Count one execution."""
+        self.executions += 1
+        self.prompt_tokens += usage["prompt_tokens"]
+        self.completion_tokens += usage["completion_tokens"]
+        self.estimated += bool(usage.get("estimated"))
+        if cost is None:
+            self.unpriced += 1
+        else:
+            self.cost += cost
+
+    def merge(self, other: "_UsageTotals"):
+        """Add another group's counters to this one."""
+        for name in self.__slots__:
+            setattr(self, name, getattr(self, name) + getattr(other, name))
+
+    def summary(self) -> Dict[str, Any]:
+        """Summarize the counters, with cost in USD."""
+        return {
+            "executions": self.executions,
+            "prompt_tokens": self.prompt_tokens,
+            "completion_tokens": self.completion_tokens,
+            "total_tokens": self.prompt_tokens + self.completion_tokens,
+            "cost_usd": round(self.cost, 6),
+            "unpriced_executions": self.unpriced,
+            "estimated_executions": self.estimated,
+        }
+
+
+class CostLedger:
+    """
+    Aggregates token usage and cost per category, test case and model.
+    """
+
+    def __init__(self):
+        """Initialize an empty ledger."""
+        self.total = _UsageTotals()
+        self.by_category: Dict[str, _UsageTotals] = {}
+        self.by_model: Dict[str, _UsageTotals] = {}
+        self.by_test_case: Dict[str, _UsageTotals] = {}
+
+    def add(
+        self,
+        category: str,
+        test_case_id: str,
+        model: str,
+        usage: Dict[str, Any],
+        cost: Optional[float],
+    ):
+        """
+        Record the usage of one execution.
+
+        Args:
+            category: Test category
+            test_case_id: Test case ID
+            model: Model name
+            usage: Dictionary with ``prompt_tokens`` and ``completion_tokens``
+            cost: Cost in USD, or None if unpriced
+        """
+        self.total.add(usage, cost)
+        for groups, key in (
+            (self.by_category, category),
+            (self.by_model, model),
+            (self.by_test_case, test_case_id),
+        ):
+            totals = groups.get(key)
+            if totals is None:
+                totals = groups[key] = _UsageTotals()
+            totals.add(usage, cost)
+
+    def add_record(self, record: Dict[str, Any]) -> bool:
+        """
+        Record the usage stored in a transcript record.
+
+        Args:
+            record: Transcript record
+
+        Returns:
+            False if the record carries no usage (written before usage
+            accounting), True otherwise
+        """
+        metadata = record.get("metadata", {})
+        usage = metadata.get("usage")
+        if usage is None:
+            return False
+        self.add(
+            record.get("category", "unknown"),
+            record.get("test_case_id", "unknown"),
+            metadata.get("model", "unknown"),
+            usage,
+            metadata.get("cost_usd"),
+        )
+        return True
+
+    def merge(self, other: "CostLedger"):
+        """
+        Merge another ledger into this one.
+
+        Args:
+            other: Ledger to merge (e.g. from a worker process)
+        """
+        self.total.merge(other.total)
+        for mine, theirs in (
+            (self.by_category, other.by_category),
+            (self.by_model, other.by_model),
+            (self.by_test_case, other.by_test_case),
+        ):
+            for key, totals in theirs.items():
+                if key not in mine:
+                    mine[key] = _UsageTotals()
+                mine[key].merge(totals)
+
+    def summary(self) -> Dict[str, Any]:
+        """
+        Summarize the ledger.
+
+        Returns:
+            Dictionary with overall totals and per-category, per-model and
+            per-test-case breakdowns
+        """
+        return {
+            **self.total.summary(),
+            "by_category": {k: v.summary() for k, v in sorted(self.by_category.items())},
+            "by_model": {k: v.summary() for k, v in sorted(self.by_model.items())},
+            "by_test_case": {k: v.summary() for k, v in sorted(self.by_test_case.items())},
+        }
+
+
+class Budget:
+    """
+    Token, cost and wall-clock limits for a run.
+
+    The runner charges each execution and checks the budget before starting
+    the next test case, so a run stops gracefully between cases. Test cases
+    already executing finish, so the limits can be overshot by at most the
+    cost and duration of the cases in flight.
+    """
+
+    def __init__(
+        self,
+        max_tokens: Optional[int] = None,
+        max_cost: Optional[float] = None,
+        deadline: Optional[datetime] = None,
+    ):
+        """
+        Initialize budget.
+
+        Args:
+            max_tokens: Maximum prompt plus completion tokens (None for no limit)
+            max_cost: Maximum cost in USD (None for no limit)
+            deadline: UTC time after which no new test case starts (None for no limit)
+        """
+        self.max_tokens = max_tokens
+        self.max_cost = max_cost
+        self.deadline = deadline
+        self.tokens = 0
+        self.cost = 0.0
+        self.stopped: Optional[str] = None
+        self.skipped: List[Dict[str, Any]] = []
+
+    def charge(self, tokens: int, cost: float):
+        """
+        Charge usage against the budget.
+
+        Args:
+            tokens: Prompt plus completion tokens used
+            cost: Cost in USD
+        """
+        self.tokens += tokens
+        self.cost += cost
+
+    def charge_ledger(self, ledger: CostLedger):
+        """
+        Charge everything recorded in a ledger.
+
+        Args:
+            ledger: Ledger holding the usage to charge
+        """
+        self.charge(ledger.total.prompt_tokens + ledger.total.completion_tokens, ledger.total.cost)
+
+    @property
+    def exhausted(self) -> Optional[str]:
+        """Reason the budget is exhausted, or None while there is budget left."""
+        if self.max_tokens is not None and self.tokens >= self.max_tokens:
+            return f"token budget of {self.max_tokens} reached ({self.tokens} used)"
+        if self.max_cost is not None and self.cost >= self.max_cost:
+            return f"cost budget of ${self.max_cost:g} reached (${self.cost:.4f} used)"
+        if self.deadline is not None and datetime.utcnow() >= self.deadline:
+            return f"deadline {self.deadline.isoformat(timespec='seconds')}Z reached"
+        return None
+
+    def stop(self, remaining: List[Dict[str, Any]]):
+        """
+        Record that the run stopped with test cases left unstarted.
+
+        Args:
+            remaining: Test cases that will not be run
+        """
+        # Imported here: scheduler depends on metrics, which imports this module
+        from .scheduler import DEFAULT_PRIORITY
+
+        self.stopped = self.exhausted
+        self.skipped = [
+            {
+                "test_case_id": tc["id"],
+                "category": tc.get("category"),
+                "priority": tc.get("priority", DEFAULT_PRIORITY),
+            }
+            for tc in remaining
+        ]
+
+    def summary(self) -> Dict[str, Any]:
+        """
+        Summarize budget use.
+
+        Returns:
+            Dictionary with the limits, usage, the reason the run stopped
+            (None if it completed) and the test cases skipped, with their
+            category and priority
+        """
+        deadline = self.deadline.isoformat(timespec="seconds") + "Z" if self.deadline else None
+        return {
+            "max_tokens": self.max_tokens,
+            "max_cost_usd": self.max_cost,
+            "deadline": deadline,
+            "tokens_used": self.tokens,
+            "cost_used_usd": round(self.cost, 6),
+            "stopped": self.stopped,
+            "skipped_test_cases": list(self.skipped),
+        }
@@ -0,0 +1,286 @@
+"""Declarative decision extraction with compiled label matchers."""
+
+import functools
+import json
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+EXTRACTOR_TYPES = ("keywords", "regex", "json_path")
+
+# Labels recognized when neither the case nor the catalog defines any
+DEFAULT_DECISION_LABELS = {
+    "positive": ["positive"],
+    "negative": ["negative"],
+    "neutral": ["neutral"],
+    "password_reset": ["password_reset", "password reset"],
+}
+
+# Outputs often wrap JSON in a fenced code block or surrounding prose
+_JSON_FENCE = re.compile(r"```(?:json)?\s*(.*?)```", re.DOTALL)
+
+# Compiled extractors by test case object; each entry keeps its case alive so
+# the id cannot be reused while the entry exists
+_CASE_EXTRACTORS: Dict[int, Tuple[Dict[str, Any], "DecisionExtractor"]] = {}
+_MAX_CASE_EXTRACTORS = 4096
+
+
+def _trie_pattern(words: List[str]) -> str:
+    """
+    Build a regex alternation that shares common prefixes.
+
+    ``["reset password", "reset pin", "refund"]`` becomes
+    ``re(?:set\\ (?:password|pin)|fund)``, so the regex engine tests each
+    prefix once rather than once per keyword, which keeps matching fast
+    for label sets with hundreds of keywords.
+
+    Args:
+        words: Lowercase keywords
+
+    Returns:
+        Regex source matching any of the keywords
+    """
+    trie: Dict[str, Any] = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[""] = True
+
+    def render(node: Dict[str, Any]) -> str:
+        ends_here = "" in node
+        branches = [re.escape(char) + render(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        if len(branches) == 1 and not ends_here:
+            return branches[0]
+        body = "(?:" + "|".join(branches) + ")"
+        # An optional (greedy) continuation makes the longest keyword win
+        return body + "?" if ends_here else body
+
+    return render(trie)
+
+
+class DecisionExtractor:
+    """
+    Extracts a decision label from model output.
+
+    Built from a declarative spec and compiled once:
+
+    - ``keywords``: ``labels`` maps each label to keywords. All keywords are
+      merged into a single prefix-sharing regex with word boundaries, so
+      ``"positive"`` does not match inside ``"non-positively"``. The
+      keyword found earliest in the output decides the label, and at the
+      same position the longest keyword wins.
+    - ``regex``: ``patterns`` maps each label to a regex. The pattern
+      matching earliest in the output decides, with ties going to the
+      first pattern listed.
+    - ``json_path``: the output is parsed as JSON (a fenced code block is
+      accepted) and ``path`` (e.g. ``intent.label`` or ``$.choices.0``)
+      selects the decision. With ``labels``, the value is mapped through
+      the same keyword matcher.
+
+    Matching is case-insensitive. Outputs that match nothing yield None.
+    """
+
+    def __init__(self, spec: Dict[str, Any]):
+        """
+        Compile an extractor spec.
+
+        Args:
+            spec: Extractor specification (see class docstring)
+
+        Raises:
+            ValueError: If the spec is malformed or a regex does not compile
+        """
+        self.type = spec.get("type", "keywords")
+        if self.type not in EXTRACTOR_TYPES:
+            raise ValueError(
+                f"Unknown decision_extractor type: {self.type} "
+                f"(expected one of {', '.join(EXTRACTOR_TYPES)})"
+            )
+
+        self.regex: Optional["re.Pattern[str]"] = None
+        self.group_labels: List[str] = []
+        self.keyword_labels: Dict[str, str] = {}
+        self.path: List[str] = []
+
+        if self.type == "regex":
+            patterns = spec.get("patterns")
+            if not isinstance(patterns, dict) or not patterns:
+                raise ValueError("Regex decision extractors need a 'patterns' mapping")
+            alternatives = []
+            for i, (label, pattern) in enumerate(patterns.items()):
+                try:
+                    re.compile(pattern)
+                except re.error as e:
+                    raise ValueError(f"Invalid regex for decision label {label}: {e}") from e
+                alternatives.append(f"(?P<_label{i}>{pattern})")
+                self.group_labels.append(str(label))
+            self.regex = re.compile("|".join(alternatives), re.IGNORECASE)
+        elif "labels" in spec or self.type == "keywords":
+            self._compile_keywords(normalize_labels(spec.get("labels")))
+
+        if self.type == "json_path":
+            path = str(spec.get("path", "")).strip()
+            if not path:
+                raise ValueError("JSON-path decision extractors need a 'path'")
+            if path.startswith("$"):
+                path = path[1:]
+            self.path = [part for part in path.split(".") if part]
+
+    def _compile_keywords(self, labels: Dict[str, List[str]]):
+        """Compile label keywords into one word-bounded regex."""
+        if not labels:
+            raise ValueError("Keyword decision extractors need at least one label")
+        for label, keywords in labels.items():
+            for keyword in keywords:
+                self.keyword_labels.setdefault(keyword.lower(), label)
+        pattern = _trie_pattern(list(self.keyword_labels))
+        self.regex = re.compile(rf"(?<!\w)(?:{pattern})(?!\w)", re.IGNORECASE)
+
+    def extract(self, output: str) -> Optional[str]:
+        """
+        Extract the decision from an output.
+
+        Args:
+            output: Generated output
+
+        Returns:
+            Decision label, or None if nothing matched
+        """
+        if self.type == "json_path":
+            value = self._select(output)
+            if value is None:
+                return None
+            if self.keyword_labels:
+                return self._match(value)
+            return value
+
+        return self._match(output)
+
+    def _match(self, text: str) -> Optional[str]:
+        """Find the earliest label match in text."""
+        match = self.regex.search(text)
+        if match is None:
+            return None
+        if self.group_labels:
+            # lastgroup could name a group inside a user pattern, so look up ours
+            for i, label in enumerate(self.group_labels):
+                if match.group(f"_label{i}") is not None:
+                    return label
+        return self.keyword_labels.get(match.group(0).lower())
+
+    def _select(self, output: str) -> Optional[str]:
+        """Parse output as JSON and follow the configured path."""
+        fenced = _JSON_FENCE.search(output)
+        text = fenced.group(1) if fenced else output
+        try:
+            value = json.loads(text)
+        except json.JSONDecodeError:
+            start, end = text.find("{"), text.rfind("}")
+            if start < 0 or end <= start:
+                return None
+            try:
+                value = json.loads(text[start : end + 1])
+            except json.JSONDecodeError:
+                return None
+
+        for part in self.path:
+            if isinstance(value, dict) and part in value:
+                value = value[part]
+            elif isinstance(value, list) and part.isdigit() and int(part) < len(value):
+                value = value[int(part)]
+            else:
+                return None
+
+        if value is None or isinstance(value, (dict, list)):
+            return None
+        return str(value)
+
+
+def normalize_labels(labels: Any) -> Dict[str, List[str]]:
+    """
+    Normalize a ``decision_labels`` value into label -> keywords.
+
+    Args:
+        labels: A list of labels (each label is its own keyword) or a
+            mapping of label to a keyword or list of keywords
+
+    Returns:
+        Dictionary of label to keyword list
+    """
+    if not labels:
+        return {}
+    if isinstance(labels, list):
+        return {str(label): [str(label)] for label in labels}
+    if isinstance(labels, dict):
+        return {
+            str(label): [str(k) for k in (keywords if isinstance(keywords, list) else [keywords])]
+            or [str(label)]
+            for label, keywords in labels.items()
+        }
+    raise ValueError("decision_labels must be a list or a mapping")
+
+
+def decision_spec(test_case: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """
+    Get the decision extractor spec a test case declares.
+
+    Args:
+        test_case: Test case dictionary
+
+    Returns:
+        Extractor spec from ``decision_extractor`` or ``decision_labels``, or None
+    """
+    if test_case.get("decision_extractor"):
+        return test_case["decision_extractor"]
+    if test_case.get("decision_labels"):
+        return {"type": "keywords", "labels": test_case["decision_labels"]}
+    return None
+
+
+@functools.lru_cache(maxsize=256)
+def _compile_cached(spec_key: str) -> DecisionExtractor:
+    return DecisionExtractor(json.loads(spec_key))
+
+
+def compile_extractor(spec: Optional[Dict[str, Any]]) -> DecisionExtractor:
+    """
+    Compile an extractor spec, reusing earlier compilations of equal specs.
+
+    Args:
+        spec: Extractor spec, or None for the default sentiment/intent labels
+
+    Returns:
+        Compiled DecisionExtractor
+    """
+    if spec is None:
+        spec = {"type": "keywords", "labels": DEFAULT_DECISION_LABELS}
+    return _compile_cached(json.dumps(spec, sort_keys=True))
+
+
+def case_extractor(test_case: Dict[str, Any]) -> DecisionExtractor:
+    """
+    Get the compiled extractor for a test case, compiling it on first use.
+
+    compile_extractor() serializes the whole spec to find an equal earlier
+    compilation, which costs as much as the spec is large. The result is
+    therefore also remembered for the test case object itself, so later
+    outputs of the case only pay a dictionary lookup. Test cases must not
+    change their decision spec once they are running.
+
+    Args:
+        test_case: Test case dictionary
+
+    Returns:
+        Compiled DecisionExtractor
+    """
+    entry = _CASE_EXTRACTORS.get(id(test_case))
+    if entry is not None and entry[0] is test_case:
+        return entry[1]
+
+    extractor = compile_extractor(decision_spec(test_case))
+    if len(_CASE_EXTRACTORS) >= _MAX_CASE_EXTRACTORS:
+        _CASE_EXTRACTORS.clear()
+    _CASE_EXTRACTORS[id(test_case)] = (test_case, extractor)
+    return extractor
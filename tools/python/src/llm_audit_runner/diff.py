@@ -0,0 +1,344 @@
+"""Regression diffing between two results directories."""
+
+import json
+import tempfile
+import zlib
+from collections import Counter, defaultdict
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+from .instrumentation import LatencyHistogram
+from .io import RecordExpander
+from .metrics import case_key, evaluation_passed
+
+# Spill files per side; each bucket is joined in memory on its own
+DEFAULT_BUCKETS = 64
+
+# Relative increase in a case's mean latency that is reported as a shift
+DEFAULT_LATENCY_THRESHOLD = 0.5
+
+# Absolute change in a case's decision consistency that is reported
+DEFAULT_CONSISTENCY_THRESHOLD = 0.1
+
+# Fields of the compact per-execution summary written to the spill files
+_KEY, _CASE, _REP, _VERDICT, _DECISION, _LATENCY, _CRITICAL, _SUBCATEGORY, _DETERMINISM = range(9)
+
+# Distinguishes an unmatched key from a matched execution without a verdict
+_UNMATCHED = object()
+
+
+def _summarize(record: Dict[str, Any]) -> list:
+    """
+    Reduce a transcript record to the fields the diff compares.
+
+    Args:
+        record: Transcript record
+
+    Returns:
+        Compact summary list indexed by the ``_KEY`` ... ``_DETERMINISM`` fields
+    """
+    case = case_key(record)
+    repetition = record.get("repetition", 1)
+    key = f"{case}\x00{repetition}"
+    paraphrase = record.get("paraphrase")
+    if paraphrase is not None:
+        key += f"\x00{paraphrase['index']}"
+
+    evaluation = record.get("evaluation") or {}
+    verdict = False if "error" in record else evaluation_passed(evaluation)
+
+    metadata = record.get("metadata") or {}
+    latency = (metadata.get("phases_ms") or {}).get("provider", metadata.get("execution_time_ms"))
+
+    critical = (
+        record.get("category") == "adversarial"
+        and record.get("severity") == "critical"
+        and bool(evaluation.get("has_violations"))
+    )
+    determinism = record.get("category") == "determinism" and paraphrase is None
+
+    return [
+        key,
+        case,
+        repetition,
+        verdict,
+        evaluation.get("decision"),
+        latency,
+        critical,
+        record.get("subcategory", ""),
+        determinism,
+    ]
+
+
+def _partition(results_dir: Path, spill_dir: Path, buckets: int) -> int:
+    """
+    Stream a results directory into hash-partitioned spill files.
+
+    Records are bucketed by case key, so every repetition of a case
+    lands in the same bucket and per-case aggregates can be computed one
+    bucket at a time.
+
+    Args:
+        results_dir: Directory containing JSONL transcripts
+        spill_dir: Directory receiving ``bucket_<n>.jsonl`` files
+        buckets: Number of buckets
+
+    Returns:
+        Number of records partitioned
+    """
+    files = [open(spill_dir / f"bucket_{i}.jsonl", "w") for i in range(buckets)]
+    count = 0
+    try:
+        for jsonl_file in sorted(Path(results_dir).glob("*.jsonl")):
+            expander = RecordExpander()
+            with open(jsonl_file, "r") as f:
+                for line in f:
+                    if not line.strip():
+                        continue
+                    record = expander.feed(json.loads(line))
+                    if record is None:
+                        continue
+                    summary = _summarize(record)
+                    bucket = zlib.crc32(summary[_CASE].encode("utf-8")) % buckets
+                    files[bucket].write(json.dumps(summary, separators=(",", ":")) + "\n")
+                    count += 1
+    finally:
+        for f in files:
+            f.close()
+    return count
+
+
+def _read_bucket(path: Path) -> Iterator[list]:
+    """Yield the summaries in a spill file."""
+    with open(path, "r") as f:
+        for line in f:
+            yield json.loads(line)
+
+
+class _CaseStats:
+    """Per-case aggregates for one side of the diff."""
+
+    __slots__ = ("decisions", "latency_total", "latency_count", "critical", "subcategory")
+
+    def __init__(self):
+        self.decisions: Counter = Counter()
+        self.latency_total = 0.0
+        self.latency_count = 0
+        self.critical: List[int] = []
+        self.subcategory = ""
+
+    def add(self, summary: list):
+        """Add one execution summary."""
+        if summary[_DETERMINISM] and summary[_DECISION] is not None:
+            self.decisions[summary[_DECISION]] += 1
+        if summary[_LATENCY] is not None:
+            self.latency_total += summary[_LATENCY]
+            self.latency_count += 1
+        if summary[_CRITICAL]:
+            self.critical.append(summary[_REP])
+            self.subcategory = summary[_SUBCATEGORY]
+
+    def consistency(self) -> Optional[float]:
+        """Share of the most common decision, if the case repeated."""
+        total = sum(self.decisions.values())
+        if total < 2:
+            return None
+        return self.decisions.most_common(1)[0][1] / total
+
+    def mean_latency(self) -> Optional[float]:
+        """Mean provider latency in milliseconds."""
+        return self.latency_total / self.latency_count if self.latency_count else None
+
+
+class RunDiff:
+    """
+    Compares a candidate results directory against a base one.
+
+    Executions are joined by (test_case_id, repetition), plus the
+    paraphrase index for paraphrase groups. Instead of loading both sides,
+    each side is streamed once into hash-partitioned spill files on disk
+    (a grace hash join); buckets are then joined one at a time, so memory
+    is bounded by the largest bucket rather than by the size of either run.
+    """
+
+    def __init__(
+        self,
+        base_dir: Path,
+        candidate_dir: Path,
+        latency_threshold: float = DEFAULT_LATENCY_THRESHOLD,
+        consistency_threshold: float = DEFAULT_CONSISTENCY_THRESHOLD,
+        buckets: int = DEFAULT_BUCKETS,
+    ):
+        """
+        Initialize a diff.
+
+        Args:
+            base_dir: Results directory of the reference run
+            candidate_dir: Results directory of the run being checked
+            latency_threshold: Relative mean-latency increase reported per case
+            consistency_threshold: Absolute consistency change reported per case
+            buckets: Number of spill-file buckets per side
+        """
+        self.base_dir = Path(base_dir)
+        self.candidate_dir = Path(candidate_dir)
+        self.latency_threshold = latency_threshold
+        self.consistency_threshold = consistency_threshold
+        self.buckets = buckets
+
+    def compute(self) -> Dict[str, Any]:
+        """
+        Compute the diff.
+
+        Returns:
+            Dictionary with execution counts, verdict flips, consistency
+            deltas, latency shifts, new critical adversarial failures and
+            an overall ``regressed`` flag
+        """
+        flips: Dict[str, Dict[str, List[int]]] = defaultdict(
+            lambda: {"regressions": [], "fixes": []}
+        )
+        counts = Counter()
+        consistency_deltas = []
+        latency_shifts = []
+        new_critical = []
+        consistency_means = {"base": [], "candidate": []}
+        histograms = {"base": LatencyHistogram(), "candidate": LatencyHistogram()}
+
+        with tempfile.TemporaryDirectory(prefix="llm-audit-diff-") as tmp:
+            spill = {"base": Path(tmp) / "base", "candidate": Path(tmp) / "candidate"}
+            for side, results_dir in (("base", self.base_dir), ("candidate", self.candidate_dir)):
+                spill[side].mkdir()
+                counts[side] = _partition(results_dir, spill[side], self.buckets)
+
+            for bucket in range(self.buckets):
+                name = f"bucket_{bucket}.jsonl"
+                base_index: Dict[str, Optional[bool]] = {}
+                stats = {"base": defaultdict(_CaseStats), "candidate": defaultdict(_CaseStats)}
+
+                for summary in _read_bucket(spill["base"] / name):
+                    base_index[summary[_KEY]] = summary[_VERDICT]
+                    stats["base"][summary[_CASE]].add(summary)
+                    if summary[_LATENCY] is not None:
+                        histograms["base"].record(summary[_LATENCY] * 1000)
+
+                for summary in _read_bucket(spill["candidate"] / name):
+                    stats["candidate"][summary[_CASE]].add(summary)
+                    if summary[_LATENCY] is not None:
+                        histograms["candidate"].record(summary[_LATENCY] * 1000)
+
+                    before = base_index.pop(summary[_KEY], _UNMATCHED)
+                    if before is _UNMATCHED:
+                        counts["only_in_candidate"] += 1
+                        continue
+                    counts["matched"] += 1
+                    after = summary[_VERDICT]
+                    if before is None or after is None or before == after:
+                        continue
+                    flip = "regressions" if before else "fixes"
+                    flips[summary[_CASE]][flip].append(summary[_REP])
+                    counts[flip] += 1
+
+                counts["only_in_base"] += len(base_index)
+                self._compare_cases(
+                    stats,
+                    consistency_deltas,
+                    latency_shifts,
+                    new_critical,
+                    consistency_means,
+                )
+
+        result = {
+            "base": str(self.base_dir),
+            "candidate": str(self.candidate_dir),
+            "executions": {
+                "base": counts["base"],
+                "candidate": counts["candidate"],
+                "matched": counts["matched"],
+                "only_in_base": counts["only_in_base"],
+                "only_in_candidate": counts["only_in_candidate"],
+            },
+            "verdict_flips": {
+                "regressions": counts["regressions"],
+                "fixes": counts["fixes"],
+                "per_test_case": [
+                    {"test_case_id": test_id, **{k: sorted(v) for k, v in case.items()}}
+                    for test_id, case in sorted(flips.items())
+                ],
+            },
+            "consistency": {
+                "base_mean": _mean(consistency_means["base"]),
+                "candidate_mean": _mean(consistency_means["candidate"]),
+                "threshold": self.consistency_threshold,
+                "changed_cases": sorted(consistency_deltas, key=lambda c: c["delta"]),
+            },
+            "latency": {
+                "base": histograms["base"].summary(),
+                "candidate": histograms["candidate"].summary(),
+                "threshold": self.latency_threshold,
+                "shifted_cases": sorted(latency_shifts, key=lambda c: -c["ratio"]),
+            },
+            "new_critical_failures": sorted(new_critical, key=lambda c: c["test_case_id"]),
+        }
+        result["regressed"] = bool(
+            counts["regressions"] or new_critical or any(c["delta"] < 0 for c in consistency_deltas)
+        )
+        return result
+
+    def _compare_cases(
+        self,
+        stats: Dict[str, Dict[str, _CaseStats]],
+        consistency_deltas: List[Dict[str, Any]],
+        latency_shifts: List[Dict[str, Any]],
+        new_critical: List[Dict[str, Any]],
+        consistency_means: Dict[str, List[float]],
+    ):
+        """Compare the per-case aggregates of one bucket."""
+        for side in ("base", "candidate"):
+            for case in stats[side].values():
+                consistency = case.consistency()
+                if consistency is not None:
+                    consistency_means[side].append(consistency)
+
+        for test_id, after in stats["candidate"].items():
+            before = stats["base"].get(test_id)
+            if after.critical and (before is None or not before.critical):
+                new_critical.append(
+                    {
+                        "test_case_id": test_id,
+                        "subcategory": after.subcategory,
+                        "repetitions": sorted(after.critical),
+                    }
+                )
+            if before is None:
+                continue
+
+            base_consistency, candidate_consistency = before.consistency(), after.consistency()
+            if base_consistency is not None and candidate_consistency is not None:
+                delta = candidate_consistency - base_consistency
+                if abs(delta) >= self.consistency_threshold:
+                    consistency_deltas.append(
+                        {
+                            "test_case_id": test_id,
+                            "base": round(base_consistency, 3),
+                            "candidate": round(candidate_consistency, 3),
+                            "delta": round(delta, 3),
+                        }
+                    )
+
+            base_latency, candidate_latency = before.mean_latency(), after.mean_latency()
+            if base_latency and candidate_latency is not None:
+                ratio = candidate_latency / base_latency
+                if ratio >= 1 + self.latency_threshold:
+                    latency_shifts.append(
+                        {
+                            "test_case_id": test_id,
+                            "base_mean_ms": round(base_latency, 3),
+                            "candidate_mean_ms": round(candidate_latency, 3),
+                            "ratio": round(ratio, 3),
+                        }
+                    )
+
+
+def _mean(values: List[float]) -> Optional[float]:
+    """Rounded mean, or None for no values."""
+    return round(sum(values) / len(values), 3) if values else None
@@ -0,0 +1,316 @@
+"""Groundedness and citation checking against indexed context documents."""
+
+import math
+import re
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+# Sentence boundaries: terminal punctuation followed by whitespace, or line breaks
+_SENTENCE_BOUNDARY = re.compile(r"(?<=[.!?])\s+|\n+")
+
+# Words, numbers and amounts such as "$10M" or "3.5%"
+_TOKEN = re.compile(r"\$?\w+(?:[.,']\w+)*%?")
+
+# Bracketed citations, e.g. "[meeting-notes-2026-02-13]"
+_BRACKET_CITATION = re.compile(r"\[([^\[\]\n]{1,200})\]")
+
+_STOPWORDS = frozenset(
+    """
+    a an and are as at be been but by can could did do does for from had has have
+    he her his i if in into is it its me my no not of on or our she so than that
+    the their them then there these they this to too us was we were what when
+    which who will with would you your
+    """.split()
+)
+
+# Minimum share of a sentence's content weight a single span must cover
+DEFAULT_GROUNDING_THRESHOLD = 0.6
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Split text into lowercase content tokens, dropping stopwords.
+
+    Args:
+        text: Text to tokenize
+
+    Returns:
+        List of tokens
+    """
+    return [t for t in _TOKEN.findall(text.lower()) if t not in _STOPWORDS]
+
+
+def split_sentences(text: str) -> List[str]:
+    """
+    Split text into sentences.
+
+    Args:
+        text: Text to split
+
+    Returns:
+        Non-empty, stripped sentences
+    """
+    return [s.strip() for s in _SENTENCE_BOUNDARY.split(text) if s.strip()]
+
+
+class ContextIndex:
+    """
+    Inverted index from content tokens to sentence-level document spans.
+
+    Documents are split into sentence spans and each span's tokens are
+    posted once. Attributing a sentence only visits the postings of its own
+    tokens, so lookup cost depends on how many spans share vocabulary with
+    the sentence rather than on the total size of the indexed context.
+    Token weights are inverse span frequencies, so rare terms (names,
+    figures) count for more than common ones. When a lookup is restricted to
+    some documents, the weights are computed over those documents only, so
+    they do not change as unrelated documents are indexed.
+    """
+
+    def __init__(self):
+        """Initialize an empty index."""
+        self.spans: List[Tuple[str, str]] = []
+        self.postings: Dict[str, List[int]] = defaultdict(list)
+        self.documents: Set[str] = set()
+        self.span_counts: Dict[str, int] = {}
+
+    def add_document(self, doc_id: str, content: str) -> bool:
+        """
+        Index a document, unless it is already indexed.
+
+        Args:
+            doc_id: Document ID
+            content: Document text
+
+        Returns:
+            True if the document was newly indexed
+        """
+        if doc_id in self.documents:
+            return False
+
+        self.documents.add(doc_id)
+        sentences = split_sentences(content)
+        self.span_counts[doc_id] = len(sentences)
+        for sentence in sentences:
+            span_index = len(self.spans)
+            self.spans.append((doc_id, sentence))
+            for token in set(tokenize(sentence)):
+                self.postings[token].append(span_index)
+        return True
+
+    def idf(self, token: str, doc_ids: Optional[Iterable[str]] = None) -> float:
+        """
+        Inverse span frequency of a token.
+
+        Tokens absent from the index get the highest weight, so unsupported
+        content lowers a sentence's support score.
+
+        Args:
+            token: Content token
+            doc_ids: Count only the spans of these documents (default: all)
+
+        Returns:
+            Token weight
+        """
+        allowed = set(doc_ids) if doc_ids is not None else None
+        return self._weight(len(self._postings(token, allowed)), self._span_count(allowed))
+
+    def _postings(self, token: str, allowed: Optional[Set[str]]) -> List[int]:
+        """Get the spans containing a token, limited to the allowed documents."""
+        postings = self.postings.get(token, [])
+        if allowed is None:
+            return postings
+        return [i for i in postings if self.spans[i][0] in allowed]
+
+    def _span_count(self, allowed: Optional[Set[str]]) -> int:
+        """Count the spans of the allowed documents."""
+        if allowed is None:
+            return len(self.spans)
+        return sum(self.span_counts.get(doc_id, 0) for doc_id in allowed)
+
+    @staticmethod
+    def _weight(postings: int, spans: int) -> float:
+        """Inverse frequency weight of a token found in postings of spans."""
+        return math.log(1 + (spans + 1) / (postings + 1))
+
+    def best_span(
+        self, sentence: str, doc_ids: Optional[Iterable[str]] = None
+    ) -> Tuple[Optional[int], float]:
+        """
+        Find the span that best supports a sentence.
+
+        Args:
+            sentence: Sentence to attribute
+            doc_ids: Restrict candidates to these documents (default: all)
+
+        Returns:
+            Tuple of (span index or None, support score in [0, 1])
+        """
+        tokens = set(tokenize(sentence))
+        if not tokens:
+            return None, 0.0
+
+        allowed = set(doc_ids) if doc_ids is not None else None
+        span_count = self._span_count(allowed)
+        postings = {token: self._postings(token, allowed) for token in tokens}
+        weights = {token: self._weight(len(postings[token]), span_count) for token in tokens}
+        total = sum(weights.values())
+
+        scores: Dict[int, float] = defaultdict(float)
+        for token, weight in weights.items():
+            for span_index in postings[token]:
+                scores[span_index] += weight
+
+        if not scores:
+            return None, 0.0
+
+        span_index = max(scores, key=scores.__getitem__)
+        return span_index, scores[span_index] / total
+
+
+def extract_citations(output: str, known_ids: Iterable[str]) -> List[str]:
+    """
+    Find the document IDs an output cites.
+
+    Bracketed references (``[doc-id]``) count as citations, as do plain
+    mentions of a known document ID.
+
+    Args:
+        output: Generated output
+        known_ids: Document IDs that may be mentioned without brackets
+
+    Returns:
+        Sorted list of cited IDs
+    """
+    cited = {match.strip() for match in _BRACKET_CITATION.findall(output)}
+    output_lower = output.lower()
+    cited.update(doc_id for doc_id in known_ids if doc_id.lower() in output_lower)
+    return sorted(cited)
+
+
+def content_variants(expected: Any) -> List[str]:
+    """
+    Normalize an ``expected_content`` value into alternative strings.
+
+    Args:
+        expected: A string (alternatives separated by " OR ") or a list of strings
+
+    Returns:
+        List of acceptable variants
+    """
+    options = expected if isinstance(expected, list) else [expected]
+    variants = []
+    for option in options:
+        variants.extend(v.strip().strip('"') for v in str(option).split(" OR "))
+    return [v for v in variants if v]
+
+
+class GroundednessEvaluator:
+    """
+    Evaluates whether outputs are supported by, and cite, their context documents.
+
+    One evaluator lives for a whole run and indexes every context document
+    the first time a case uses it. Each output sentence is attributed to its
+    best-supporting span among the case's documents and counts as grounded
+    when that span covers at least ``threshold`` of the sentence's token
+    weight. Token weights are computed over the case's documents alone, so a
+    verdict does not depend on which cases ran earlier in the same process. Cited document IDs are checked against the case's documents,
+    against ``expected_citation`` and against the documents that actually
+    support the output.
+    """
+
+    def __init__(self, threshold: float = DEFAULT_GROUNDING_THRESHOLD):
+        """
+        Initialize groundedness evaluator.
+
+        Args:
+            threshold: Minimum support score for a sentence to count as grounded
+        """
+        self.threshold = threshold
+        self.index = ContextIndex()
+
+    def evaluate(self, test_case: Dict[str, Any], output: str) -> Dict[str, Any]:
+        """
+        Evaluate one output.
+
+        Args:
+            test_case: Test case dictionary with optional "context_documents",
+                "expected_content", "expected_citation", "citation_required"
+                and "grounding_threshold"
+            output: Generated output
+
+        Returns:
+            Groundedness evaluation dictionary
+        """
+        doc_ids = []
+        for doc in test_case.get("context_documents") or []:
+            doc_id = str(doc["id"])
+            self.index.add_document(doc_id, str(doc["content"]))
+            doc_ids.append(doc_id)
+
+        result: Dict[str, Any] = {}
+        supporting: Set[str] = set()
+
+        if doc_ids:
+            threshold = test_case.get("grounding_threshold", self.threshold)
+            attributions = []
+            for i, sentence in enumerate(split_sentences(output)):
+                # Citation markers are not claims and must not dilute support
+                sentence = _BRACKET_CITATION.sub(" ", sentence)
+                if not tokenize(sentence):
+                    continue
+                span_index, score = self.index.best_span(sentence, doc_ids)
+                grounded = span_index is not None and score >= threshold
+                doc_id = self.index.spans[span_index][0] if span_index is not None else None
+                if grounded:
+                    supporting.add(doc_id)
+                attributions.append(
+                    {
+                        "sentence": i,
+                        "document": doc_id,
+                        "score": round(score, 3),
+                        "grounded": grounded,
+                    }
+                )
+
+            grounded_count = sum(a["grounded"] for a in attributions)
+            result["total_sentences"] = len(attributions)
+            result["grounded_sentences"] = grounded_count
+            result["grounded_sentence_ratio"] = (
+                round(grounded_count / len(attributions), 3) if attributions else 0.0
+            )
+            result["attributions"] = attributions
+            result["supporting_documents"] = sorted(supporting)
+
+        citations = extract_citations(output, doc_ids)
+        result["citations"] = citations
+        if citations:
+            # A citation is accurate when it names one of the case's documents
+            # that actually supports a sentence of the output
+            accurate = [c for c in citations if c in supporting]
+            result["citation_accuracy"] = round(len(accurate) / len(citations), 3)
+            result["unknown_citations"] = [c for c in citations if c not in doc_ids]
+
+        citation_ok = True
+        if test_case.get("citation_required") and not citations:
+            result["citation_missing"] = True
+            citation_ok = False
+        if "expected_citation" in test_case:
+            expected = test_case["expected_citation"]
+            expected_ids = (
+                [str(e) for e in expected] if isinstance(expected, list) else [str(expected)]
+            )
+            result["expected_citation_present"] = all(e in citations for e in expected_ids)
+            citation_ok = citation_ok and result["expected_citation_present"]
+        if citations and result["unknown_citations"]:
+            citation_ok = False
+        result["citation_correct"] = citation_ok
+
+        if "expected_content" in test_case:
+            output_lower = output.lower()
+            result["content_present"] = any(
+                variant.lower() in output_lower
+                for variant in content_variants(test_case["expected_content"])
+            )
+
+        return result
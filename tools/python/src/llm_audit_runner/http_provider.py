@@ -0,0 +1,519 @@
+"""Generic HTTP provider for chat-completions style LLM APIs."""
+
+import gzip
+import http.client
+import json
+import os
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+from .provider import Completion, LLMProvider, ProviderError, RateLimitError
+
+# Errors that mean a pooled keep-alive connection went stale between requests
+_STALE_CONNECTION_ERRORS = (
+    http.client.RemoteDisconnected,
+    http.client.CannotSendRequest,
+    BrokenPipeError,
+    ConnectionResetError,
+)
+
+
+class ConnectionPool:
+    """
+    Thread-safe pool of persistent HTTP/1.1 connections to a single host.
+
+    Connections are returned to the pool after each complete response so
+    that later requests reuse the TCP (and TLS) session instead of opening
+    a new one per call.
+    """
+
+    def __init__(
+        self,
+        scheme: str,
+        host: str,
+        port: Optional[int],
+        size: int = 10,
+        connect_timeout: float = 10.0,
+        read_timeout: float = 60.0,
+    ):
+        """
+        Initialize connection pool.
+
+        Args:
+            scheme: "http" or "https"
+            host: Host name
+            port: Port (None for the scheme default)
+            size: Maximum number of idle connections kept
+            connect_timeout: Seconds to wait when opening a connection
+            read_timeout: Seconds to wait for response data
+        """
+        if scheme not in ("http", "https"):
+            raise ValueError(f"Unsupported URL scheme: {scheme}")
+
+        self.scheme = scheme
+        self.host = host
+        self.port = port
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self._idle: "queue.LifoQueue[http.client.HTTPConnection]" = queue.LifoQueue(maxsize=size)
+        self.connections_opened = 0
+        self._lock = threading.Lock()
+
+    def acquire(self) -> Tuple[http.client.HTTPConnection, bool]:
+        """
+        Get a connection, reusing an idle one when available.
+
+        Returns:
+            Tuple of (connection, reused flag)
+        """
+        try:
+            return self._idle.get_nowait(), True
+        except queue.Empty:
+            pass
+
+        connection_class = (
+            http.client.HTTPSConnection if self.scheme == "https" else http.client.HTTPConnection
+        )
+        conn = connection_class(self.host, self.port, timeout=self.connect_timeout)
+        conn.connect()
+        conn.sock.settimeout(self.read_timeout)
+        with self._lock:
+            self.connections_opened += 1
+        return conn, False
+
+    def release(self, conn: http.client.HTTPConnection):
+        """
+        Return a connection whose response has been fully read.
+
+        Args:
+            conn: Connection to keep alive
+        """
+        try:
+            self._idle.put_nowait(conn)
+        except queue.Full:
+            conn.close()
+
+    def discard(self, conn: http.client.HTTPConnection):
+        """
+        Close a connection that must not be reused.
+
+        Args:
+            conn: Broken or partially read connection
+        """
+        conn.close()
+
+    def close(self):
+        """Close all idle connections."""
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                return
+
+
+class HTTPProvider(LLMProvider):
+    """
+    Provider for LLM services exposing a chat-completions style HTTP API.
+
+    Configured through ``--provider-config``. Requests share a pool of
+    keep-alive connections, request bodies can be gzip-compressed, and
+    gzip-encoded responses are accepted. With ``http2`` enabled, requests
+    are multiplexed over HTTP/2 through the optional ``httpx`` dependency.
+    When the vendor offers a batch endpoint, generate_batch() sends many
+    prompts per request.
+
+    Configuration keys:
+
+    - ``base_url`` (required): e.g. ``https://api.example.com``
+    - ``path``: completion endpoint (default ``/v1/chat/completions``)
+    - ``model``: model name sent with each request
+    - ``api_key`` or ``api_key_env``: bearer token, or the environment
+      variable holding it
+    - ``headers``: extra request headers
+    - ``system_prompt``: optional system message prepended to each request
+    - ``connect_timeout_s`` / ``timeout_s``: connect and read timeouts
+      (defaults 10 and 60)
+    - ``pool_size``: idle connections kept alive (default 10); also the
+      fan-out width of generate_batch() without a batch endpoint
+    - ``gzip``: compress request bodies (default false)
+    - ``http2``: use HTTP/2 multiplexing via httpx (default false)
+    - ``batch_path``: vendor batch endpoint accepting ``{"requests": [...]}``
+    - ``batch_size``: prompts per batch request (default 20)
+    - ``prompt_caching``: send shared context prefixes as a separate
+      leading message so the service can cache them (default false)
+    - ``cache_control``: optional marker attached to the prefix message,
+      e.g. ``{"type": "ephemeral"}``
+    """
+
+    supports_streaming = True
+
+    def __init__(self, config: Dict[str, Any] = None):
+        """
+        Initialize HTTP provider.
+
+        Args:
+            config: Configuration dictionary (see class docstring)
+
+        Raises:
+            ValueError: If base_url is missing or invalid
+            ImportError: If http2 is requested without httpx installed
+        """
+        self.config = config or {}
+        base_url = self.config.get("base_url")
+        if not base_url:
+            raise ValueError("HTTP provider requires 'base_url' in provider config")
+
+        parts = urlsplit(base_url)
+        self.base_path = parts.path.rstrip("/")
+        self.path = self.base_path + self.config.get("path", "/v1/chat/completions")
+        self.batch_path = (
+            self.base_path + self.config["batch_path"] if self.config.get("batch_path") else None
+        )
+        self.batch_size = int(self.config.get("batch_size", 20))
+        self.model = self.config.get("model", "unknown")
+        self.system_prompt = self.config.get("system_prompt")
+        self.supports_prompt_caching = bool(self.config.get("prompt_caching", False))
+        self.cache_control = self.config.get("cache_control")
+        self.gzip = bool(self.config.get("gzip", False))
+        self.pool_size = int(self.config.get("pool_size", 10))
+        connect_timeout = float(self.config.get("connect_timeout_s", 10))
+        read_timeout = float(self.config.get("timeout_s", 60))
+
+        self.headers = {
+            "Content-Type": "application/json",
+            "Accept": "application/json",
+            "Accept-Encoding": "gzip",
+        }
+        api_key = self.config.get("api_key")
+        if not api_key and self.config.get("api_key_env"):
+            api_key = os.environ.get(self.config["api_key_env"])
+        if api_key:
+            self.headers["Authorization"] = f"Bearer {api_key}"
+        self.headers.update(self.config.get("headers", {}))
+
+        self.pool: Optional[ConnectionPool] = None
+        self.client = None
+        if self.config.get("http2"):
+            try:
+                import httpx
+            except ImportError as e:
+                raise ImportError(
+                    "HTTP/2 support requires httpx: pip install 'llm-audit-runner[http2]'"
+                ) from e
+            self.client = httpx.Client(
+                base_url=f"{parts.scheme}://{parts.netloc}",
+                http2=True,
+                timeout=httpx.Timeout(read_timeout, connect=connect_timeout),
+                limits=httpx.Limits(max_keepalive_connections=self.pool_size),
+            )
+        else:
+            self.pool = ConnectionPool(
+                parts.scheme,
+                parts.hostname,
+                parts.port,
+                size=self.pool_size,
+                connect_timeout=connect_timeout,
+                read_timeout=read_timeout,
+            )
+
+    def generate(self, prompt: str, **kwargs) -> str:
+        """
+        Generate a response with one HTTP request.
+
+        Args:
+            prompt: Input text to send to the LLM
+            **kwargs: Additional parameters (temperature, max_tokens)
+
+        Returns:
+            Generated response text
+
+        Raises:
+            RateLimitError: On HTTP 429
+            ProviderError: On other HTTP errors or malformed responses
+        """
+        payload = self._request(self.path, self._build_body(prompt, **kwargs))
+        return self._extract_text(payload)
+
+    def chat(self, messages: List[Dict[str, str]], **kwargs) -> str:
+        """
+        Generate the next reply in a conversation, sending the messages natively.
+
+        Args:
+            messages: Conversation so far, as {"role", "content"} dictionaries
+            **kwargs: Additional parameters (temperature, max_tokens)
+
+        Returns:
+            Generated reply text
+        """
+        body = self._build_body(messages[-1]["content"], **kwargs)
+        # Keep the configured system prompt and any prefix message, then the history
+        body["messages"][-1:] = messages
+        payload = self._request(self.path, body)
+        return self._extract_text(payload)
+
+    def stream(self, prompt: str, **kwargs) -> Iterator[str]:
+        """
+        Stream a response using server-sent events.
+
+        Closing the generator early closes the connection, which cancels
+        the generation on the server side.
+
+        Args:
+            prompt: Input text to send to the LLM
+            **kwargs: Additional parameters (temperature, max_tokens)
+
+        Yields:
+            Successive chunks of response text
+        """
+        body = self._build_body(prompt, **kwargs)
+        body["stream"] = True
+        if self.client is not None:
+            yield from self._stream_http2(body)
+            return
+
+        conn, response = self._send(self.path, body, stream=True)
+        complete = False
+        try:
+            encoding = response.getheader("Content-Encoding", "identity")
+            if encoding != "identity":
+                raise ProviderError(f"Unsupported Content-Encoding for event stream: {encoding}")
+            while True:
+                line = response.readline()
+                if not line:
+                    complete = True
+                    break
+                line = line.strip()
+                if not line.startswith(b"data:"):
+                    continue
+                data = line[len(b"data:") :].strip()
+                if data == b"[DONE]":
+                    response.read()
+                    complete = True
+                    break
+                event = json.loads(data)
+                content = event["choices"][0].get("delta", {}).get("content")
+                if content:
+                    yield content
+        finally:
+            if complete:
+                self.pool.release(conn)
+            else:
+                self.pool.discard(conn)
+
+    def generate_batch(self, prompts: List[str], **kwargs) -> List[str]:
+        """
+        Generate responses for many prompts.
+
+        Uses the vendor batch endpoint when ``batch_path`` is configured,
+        sending up to ``batch_size`` prompts per request; otherwise fans
+        the prompts out over the connection pool.
+
+        Args:
+            prompts: Input texts
+            **kwargs: Additional parameters (temperature, max_tokens)
+
+        Returns:
+            Responses in the same order as prompts
+        """
+        if not self.batch_path:
+            with ThreadPoolExecutor(max_workers=max(1, self.pool_size)) as executor:
+                return list(executor.map(lambda p: self.generate(p, **kwargs), prompts))
+
+        outputs: List[str] = []
+        for start in range(0, len(prompts), self.batch_size):
+            chunk = prompts[start : start + self.batch_size]
+            body = {
+                "model": self.model,
+                "requests": [
+                    {"custom_id": str(start + i), **self._build_body(prompt, **kwargs)}
+                    for i, prompt in enumerate(chunk)
+                ],
+            }
+            payload = self._request(self.batch_path, body)
+            by_id = {str(r.get("custom_id")): r for r in payload.get("responses", [])}
+            for i in range(len(chunk)):
+                item = by_id.get(str(start + i))
+                if item is None:
+                    raise ProviderError(f"Batch response missing custom_id {start + i}")
+                if "error" in item:
+                    raise ProviderError(f"Batch item {start + i} failed: {item['error']}")
+                outputs.append(self._extract_text(item))
+        return outputs
+
+    def get_model_info(self) -> Dict[str, Any]:
+        """Get HTTP provider model information."""
+        info = {
+            "provider": "HTTPProvider",
+            "model": self.model,
+            "endpoint": self.path,
+            "http2": self.client is not None,
+        }
+        if self.pool is not None:
+            info["connections_opened"] = self.pool.connections_opened
+        return info
+
+    def close(self):
+        """Release pooled connections."""
+        if self.pool is not None:
+            self.pool.close()
+        if self.client is not None:
+            self.client.close()
+
+    def _build_body(self, prompt: str, **kwargs) -> Dict[str, Any]:
+        """Build a chat-completions request body."""
+        messages = []
+        if self.system_prompt:
+            messages.append({"role": "system", "content": self.system_prompt})
+
+        # A cacheable prefix gets its own message ahead of the case input,
+        # so its bytes are identical across every request that shares it
+        prefix = kwargs.get("prompt_prefix")
+        if prefix and self.supports_prompt_caching and prompt.startswith(prefix):
+            prefix_message = {"role": "system", "content": prefix}
+            if self.cache_control:
+                prefix_message["cache_control"] = self.cache_control
+            messages.append(prefix_message)
+            prompt = prompt[len(prefix) :]
+        else:
+            prefix = None
+        messages.append({"role": "user", "content": prompt})
+
+        body = {"model": self.model, "messages": messages}
+        if prefix and kwargs.get("prefix_cache_key"):
+            body["prompt_cache_key"] = kwargs["prefix_cache_key"]
+        for key in ("temperature", "max_tokens"):
+            if kwargs.get(key) is not None:
+                body[key] = kwargs[key]
+        return body
+
+    def _extract_text(self, payload: Dict[str, Any]) -> Completion:
+        """Pull the completion text and reported token usage out of a response payload."""
+        try:
+            text = payload["choices"][0]["message"]["content"]
+        except (KeyError, IndexError, TypeError) as e:
+            raise ProviderError(f"Malformed completion response: {payload!r:.200}") from e
+
+        usage = payload.get("usage")
+        if not isinstance(usage, dict):
+            return Completion(text)
+        # OpenAI-style names, falling back to input/output-style names
+        return Completion(
+            text,
+            usage={
+                "prompt_tokens": int(usage.get("prompt_tokens", usage.get("input_tokens", 0))),
+                "completion_tokens": int(
+                    usage.get("completion_tokens", usage.get("output_tokens", 0))
+                ),
+            },
+        )
+
+    def _encode(self, body: Dict[str, Any]) -> Tuple[bytes, Dict[str, str]]:
+        """Serialize (and optionally compress) a request body."""
+        data = json.dumps(body).encode("utf-8")
+        headers = dict(self.headers)
+        if self.gzip:
+            data = gzip.compress(data)
+            headers["Content-Encoding"] = "gzip"
+        return data, headers
+
+    def _request(self, path: str, body: Dict[str, Any]) -> Dict[str, Any]:
+        """POST a JSON body and decode the JSON response."""
+        if self.client is not None:
+            data, headers = self._encode(body)
+            response = self.client.post(path, content=data, headers=headers)
+            self._raise_for_status(
+                response.status_code, response.headers.get("Retry-After"), response.text
+            )
+            return response.json()
+
+        conn, response = self._send(path, body)
+        try:
+            raw = response.read()
+        except Exception:
+            self.pool.discard(conn)
+            raise
+        self.pool.release(conn)
+
+        if response.getheader("Content-Encoding") == "gzip":
+            raw = gzip.decompress(raw)
+        return json.loads(raw)
+
+    def _send(
+        self, path: str, body: Dict[str, Any], stream: bool = False
+    ) -> Tuple[http.client.HTTPConnection, http.client.HTTPResponse]:
+        """
+        Send a request over a pooled connection.
+
+        A reused connection that turns out to be stale is replaced once.
+
+        Returns:
+            Tuple of (connection, response with a successful status)
+        """
+        data, headers = self._encode(body)
+        if stream:
+            # Events are read line by line, so they must not be compressed
+            headers["Accept"] = "text/event-stream"
+            headers["Accept-Encoding"] = "identity"
+
+        for attempt in range(2):
+            conn, reused = self.pool.acquire()
+            try:
+                conn.request("POST", path, body=data, headers=headers)
+                response = conn.getresponse()
+                break
+            except _STALE_CONNECTION_ERRORS:
+                self.pool.discard(conn)
+                if not reused or attempt == 1:
+                    raise
+            except Exception:
+                self.pool.discard(conn)
+                raise
+
+        if response.status >= 400:
+            raw = response.read()
+            self.pool.release(conn)
+            if response.getheader("Content-Encoding") == "gzip":
+                raw = gzip.decompress(raw)
+            self._raise_for_status(
+                response.status, response.getheader("Retry-After"), raw.decode("utf-8", "replace")
+            )
+
+        return conn, response
+
+    def _stream_http2(self, body: Dict[str, Any]) -> Iterator[str]:
+        """Stream server-sent events over the httpx HTTP/2 client."""
+        data, headers = self._encode(body)
+        headers["Accept"] = "text/event-stream"
+        headers["Accept-Encoding"] = "identity"
+        with self.client.stream("POST", self.path, content=data, headers=headers) as response:
+            if response.status_code >= 400:
+                response.read()
+                self._raise_for_status(
+                    response.status_code, response.headers.get("Retry-After"), response.text
+                )
+            for line in response.iter_lines():
+                if not line.startswith("data:"):
+                    continue
+                data_line = line[len("data:") :].strip()
+                if data_line == "[DONE]":
+                    return
+                content = json.loads(data_line)["choices"][0].get("delta", {}).get("content")
+                if content:
+                    yield content
+
+    @staticmethod
+    def _raise_for_status(status: int, retry_after: Optional[str], text: str):
+        """Map HTTP error statuses to provider exceptions."""
+        if status < 400:
+            return
+        message = f"HTTP {status}: {text[:200]}"
+        if status == 429:
+            try:
+                delay = float(retry_after) if retry_after is not None else None
+            except ValueError:
+                delay = None
+            raise RateLimitError(message, retry_after=delay)
+        raise ProviderError(message)
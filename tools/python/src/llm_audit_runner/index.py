@@ -0,0 +1,577 @@
+"""SQLite index over transcript files for ad-hoc queries across runs."""
+
+import json
+import sqlite3
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from .io import RecordExpander
+from .metrics import case_key, evaluation_passed
+
+# Bumped whenever the tables change; older indexes are rebuilt from scratch
+SCHEMA_VERSION = 2
+
+_SCHEMA = """
+CREATE TABLE runs (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    path TEXT NOT NULL UNIQUE
+);
+CREATE TABLE files (
+    id INTEGER PRIMARY KEY,
+    run_id INTEGER NOT NULL REFERENCES runs(id),
+    path TEXT NOT NULL UNIQUE,
+    offset INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE headers (
+    id INTEGER PRIMARY KEY,
+    file_id INTEGER NOT NULL REFERENCES files(id),
+    offset INTEGER NOT NULL,
+    length INTEGER NOT NULL
+);
+CREATE TABLE executions (
+    id INTEGER PRIMARY KEY,
+    run_id INTEGER NOT NULL REFERENCES runs(id),
+    file_id INTEGER NOT NULL REFERENCES files(id),
+    offset INTEGER NOT NULL,
+    length INTEGER NOT NULL,
+    test_case_id TEXT NOT NULL,
+    execution_id TEXT,
+    category TEXT,
+    subcategory TEXT,
+    severity TEXT,
+    priority TEXT,
+    target TEXT,
+    model TEXT,
+    repetition INTEGER,
+    paraphrase_index INTEGER,
+    timestamp TEXT,
+    passed INTEGER,
+    errored INTEGER NOT NULL,
+    decision TEXT,
+    all_facts_present INTEGER,
+    has_violations INTEGER,
+    passes_threshold INTEGER,
+    latency_ms REAL,
+    prompt_tokens INTEGER,
+    completion_tokens INTEGER,
+    cost_usd REAL
+);
+CREATE INDEX executions_test_case ON executions(test_case_id);
+CREATE INDEX executions_category ON executions(category, severity);
+CREATE INDEX executions_run ON executions(run_id);
+CREATE INDEX executions_timestamp ON executions(timestamp);
+CREATE INDEX executions_passed ON executions(passed);
+CREATE INDEX headers_file ON headers(file_id);
+"""
+
+# Columns filled from each record, in insert order
+_COLUMNS = (
+    "run_id",
+    "file_id",
+    "offset",
+    "length",
+    "test_case_id",
+    "execution_id",
+    "category",
+    "subcategory",
+    "severity",
+    "priority",
+    "target",
+    "model",
+    "repetition",
+    "paraphrase_index",
+    "timestamp",
+    "passed",
+    "errored",
+    "decision",
+    "all_facts_present",
+    "has_violations",
+    "passes_threshold",
+    "latency_ms",
+    "prompt_tokens",
+    "completion_tokens",
+    "cost_usd",
+)
+
+# Columns returned by query()
+QUERY_COLUMNS = (
+    "run",
+    "test_case_id",
+    "repetition",
+    "category",
+    "subcategory",
+    "severity",
+    "priority",
+    "target",
+    "model",
+    "timestamp",
+    "passed",
+    "decision",
+    "latency_ms",
+    "file",
+    "file_id",
+    "offset",
+    "length",
+)
+
+
+def _flag(value: Any) -> Optional[int]:
+    """Store an optional boolean as 0, 1 or NULL."""
+    return None if value is None else int(bool(value))
+
+
+def _text(value: Any) -> Optional[str]:
+    """Store an optional value as text, JSON-encoding anything but strings."""
+    if value is None or isinstance(value, str):
+        return value
+    return json.dumps(value, sort_keys=True)
+
+
+def _row(record: Dict[str, Any], run_id: int, file_id: int, offset: int, length: int) -> tuple:
+    """Extract the indexed columns of one record."""
+    evaluation = record.get("evaluation") or {}
+    metadata = record.get("metadata") or {}
+    usage = metadata.get("usage") or {}
+    paraphrase = record.get("paraphrase")
+    errored = "error" in record
+    verdict = False if errored else evaluation_passed(evaluation)
+    latency = (metadata.get("phases_ms") or {}).get("provider", metadata.get("execution_time_ms"))
+    return (
+        run_id,
+        file_id,
+        offset,
+        length,
+        record["test_case_id"],
+        record.get("execution_id"),
+        record.get("category"),
+        record.get("subcategory"),
+        record.get("severity"),
+        record.get("priority"),
+        record.get("target"),
+        metadata.get("model"),
+        record.get("repetition", 1),
+        paraphrase["index"] if paraphrase is not None else None,
+        record.get("timestamp"),
+        _flag(verdict),
+        int(errored),
+        _text(evaluation.get("decision")),
+        _flag(evaluation.get("all_facts_present")),
+        _flag(evaluation.get("has_violations")),
+        _flag(evaluation.get("passes_threshold")),
+        latency,
+        usage.get("prompt_tokens"),
+        usage.get("completion_tokens"),
+        metadata.get("cost_usd"),
+    )
+
+
+class TranscriptIndex:
+    """
+    SQLite index of transcript records across runs.
+
+    Each results directory is one run. Only the fields that queries filter
+    and aggregate on are stored as columns; outputs and the rest of each
+    record stay in the JSONL files and are referenced by file, byte offset
+    and length. Header records of compact transcripts are referenced the
+    same way, so records can be expanded without re-reading whole files.
+    Ingestion is incremental: every file remembers the offset it was
+    indexed up to, so re-indexing a directory only reads records appended
+    since, and a partially written last line is left for the next pass.
+    """
+
+    def __init__(self, path: Path):
+        """
+        Open or create an index.
+
+        Args:
+            path: SQLite database file
+        """
+        self.path = Path(path)
+        self.connection = sqlite3.connect(str(self.path))
+        self.connection.row_factory = sqlite3.Row
+        version = self.connection.execute("PRAGMA user_version").fetchone()[0]
+        if version != SCHEMA_VERSION:
+            with self.connection:
+                for table in ("executions", "headers", "files", "runs"):
+                    self.connection.execute(f"DROP TABLE IF EXISTS {table}")
+                self.connection.executescript(_SCHEMA)
+                self.connection.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+    def close(self):
+        """Close the database connection."""
+        self.connection.close()
+
+    def __enter__(self):
+        """Context manager entry."""
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Context manager exit."""
+        self.close()
+
+    def ingest(self, results_dir: Path, name: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Index the records added to a results directory since the last pass.
+
+        Args:
+            results_dir: Directory containing JSONL transcripts
+            name: Run name (default: the directory name)
+
+        Returns:
+            Dictionary with the run name and ID, files scanned and records added
+        """
+        results_dir = Path(results_dir).resolve()
+        added = 0
+        files = sorted(results_dir.glob("*.jsonl"))
+        with self.connection:
+            run_id = self._run_id(results_dir, name or results_dir.name)
+            for path in files:
+                added += self._ingest_file(run_id, path)
+        return {
+            "run": name or results_dir.name,
+            "run_id": run_id,
+            "files": len(files),
+            "records_added": added,
+        }
+
+    def _run_id(self, results_dir: Path, name: str) -> int:
+        """Get or create the run for a results directory."""
+        row = self.connection.execute(
+            "SELECT id FROM runs WHERE path = ?", (str(results_dir),)
+        ).fetchone()
+        if row is not None:
+            return row["id"]
+        cursor = self.connection.execute(
+            "INSERT INTO runs (name, path) VALUES (?, ?)", (name, str(results_dir))
+        )
+        return cursor.lastrowid
+
+    def _ingest_file(self, run_id: int, path: Path) -> int:
+        """Index the complete lines of a file past its stored offset."""
+        row = self.connection.execute(
+            "SELECT id, offset FROM files WHERE path = ?", (str(path),)
+        ).fetchone()
+        if row is None:
+            file_id = self.connection.execute(
+                "INSERT INTO files (run_id, path) VALUES (?, ?)", (run_id, str(path))
+            ).lastrowid
+            offset = 0
+        else:
+            file_id, offset = row["id"], row["offset"]
+            if path.stat().st_size < offset:
+                # The file was rewritten, so its old rows no longer point anywhere
+                for table in ("executions", "headers"):
+                    self.connection.execute(f"DELETE FROM {table} WHERE file_id = ?", (file_id,))
+                offset = 0
+
+        expander = self._expander(file_id)
+        rows = []
+        headers = []
+        with open(path, "rb") as f:
+            f.seek(offset)
+            for raw in f:
+                if not raw.endswith(b"\n"):
+                    break
+                if raw.strip():
+                    record = expander.feed(json.loads(raw))
+                    if record is None:
+                        headers.append((file_id, offset, len(raw) - 1))
+                    else:
+                        rows.append(_row(record, run_id, file_id, offset, len(raw) - 1))
+                offset += len(raw)
+
+        self.connection.executemany(
+            "INSERT INTO headers (file_id, offset, length) VALUES (?, ?, ?)", headers
+        )
+        placeholders = ", ".join("?" for _ in _COLUMNS)
+        self.connection.executemany(
+            f"INSERT INTO executions ({', '.join(_COLUMNS)}) VALUES ({placeholders})", rows
+        )
+        self.connection.execute("UPDATE files SET offset = ? WHERE id = ?", (offset, file_id))
+        return len(rows)
+
+    def _expander(self, file_id: int) -> RecordExpander:
+        """Build an expander primed with a file's indexed header records."""
+        expander = RecordExpander()
+        headers = self.connection.execute(
+            "SELECT f.path, h.offset, h.length FROM headers h JOIN files f ON f.id = h.file_id "
+            "WHERE h.file_id = ? ORDER BY h.offset",
+            (file_id,),
+        ).fetchall()
+        if headers:
+            with open(headers[0]["path"], "rb") as f:
+                for header in headers:
+                    f.seek(header["offset"])
+                    expander.feed(json.loads(f.read(header["length"])))
+        return expander
+
+    def query(
+        self,
+        test_case: Optional[str] = None,
+        category: Optional[str] = None,
+        severity: Optional[str] = None,
+        priority: Optional[str] = None,
+        target: Optional[str] = None,
+        run: Optional[str] = None,
+        last_runs: Optional[int] = None,
+        since: Optional[str] = None,
+        passed: Optional[bool] = None,
+        limit: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Find executions matching every given filter.
+
+        Args:
+            test_case: Test case ID or glob pattern (e.g. ``adv-0*``)
+            category: Test category
+            severity: Test case severity
+            priority: Test case priority
+            target: Target name of a multi-target run
+            run: Run name or results directory path
+            last_runs: Only the N most recent runs, by first execution time
+            since: Only executions at or after this ISO timestamp
+            passed: True for passing, False for failing executions
+            limit: Maximum number of rows
+
+        Returns:
+            Rows with the QUERY_COLUMNS fields, newest first
+        """
+        clauses = []
+        params: List[Any] = []
+        for column, value in (
+            ("e.category", category),
+            ("e.severity", severity),
+            ("e.priority", priority),
+            ("e.target", target),
+        ):
+            if value is not None:
+                clauses.append(f"{column} = ?")
+                params.append(value)
+        if test_case is not None:
+            clauses.append("e.test_case_id GLOB ?")
+            params.append(test_case)
+        if run is not None:
+            clauses.append("(r.name = ? OR r.path = ?)")
+            params.extend([run, str(Path(run).resolve())])
+        if last_runs is not None:
+            clauses.append(
+                "e.run_id IN (SELECT run_id FROM executions GROUP BY run_id "
+                "ORDER BY MIN(timestamp) DESC LIMIT ?)"
+            )
+            params.append(last_runs)
+        if since is not None:
+            clauses.append("e.timestamp >= ?")
+            params.append(since)
+        if passed is not None:
+            clauses.append("e.passed = ?")
+            params.append(int(passed))
+
+        sql = (
+            "SELECT r.name AS run, e.test_case_id, e.repetition, e.category, e.subcategory, "
+            "e.severity, e.priority, e.target, e.model, e.timestamp, e.passed, e.decision, "
+            "e.latency_ms, f.path AS file, e.file_id, e.offset, e.length "
+            "FROM executions e JOIN runs r ON r.id = e.run_id JOIN files f ON f.id = e.file_id"
+        )
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY e.timestamp DESC, e.id DESC"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        return [dict(row) for row in self.connection.execute(sql, params)]
+
+    def sql(self, statement: str, params: Tuple = ()) -> Tuple[List[str], List[tuple]]:
+        """
+        Run a read-only SQL statement against the index.
+
+        Args:
+            statement: SQL query over the runs, files and executions tables
+            params: Query parameters
+
+        Returns:
+            Tuple of (column names, rows)
+
+        Raises:
+            sqlite3.Error: If the statement is invalid or tries to write
+        """
+        self.connection.execute("PRAGMA query_only = ON")
+        try:
+            cursor = self.connection.execute(statement, params)
+            rows = [tuple(row) for row in cursor.fetchall()]
+        finally:
+            self.connection.execute("PRAGMA query_only = OFF")
+        columns = [column[0] for column in cursor.description or ()]
+        return columns, rows
+
+    def load_record(self, row: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Read the full transcript record a query row refers to.
+
+        Args:
+            row: Row returned by query()
+
+        Returns:
+            Transcript record, expanded with its file's header records
+        """
+        expander = self._expander(row["file_id"])
+        with open(row["file"], "rb") as f:
+            f.seek(row["offset"])
+            return expander.feed(json.loads(f.read(row["length"])))
+
+    def compute_metrics(self, run_id: int) -> Dict[str, Any]:
+        """
+        Compute the campaign summary and category metrics of a run in SQL.
+
+        The sections match the ones MetricsComputer computes by iterating
+        over records. Detail that needs the full records (paraphrase
+        consistency, groundedness, structured output, conversations,
+        latency percentiles, prompt assembly and cost) is not included.
+
+        Args:
+            run_id: Run ID returned by ingest()
+
+        Returns:
+            Metrics dictionary, or ``{"error": ...}`` if the run has no records
+        """
+        execute = self.connection.execute
+        total, errored = execute(
+            "SELECT COUNT(*), COALESCE(SUM(errored), 0) FROM executions WHERE run_id = ?",
+            (run_id,),
+        ).fetchone()
+        if not total:
+            return {"error": "No transcripts found"}
+
+        summary = {
+            "total_executions": total,
+            "successful_executions": total - errored,
+            "failed_executions": errored,
+            "executions_by_category": {
+                row[0] or "unknown": row[1]
+                for row in execute(
+                    "SELECT category, COUNT(*) FROM executions WHERE run_id = ? "
+                    "GROUP BY category ORDER BY MIN(id)",
+                    (run_id,),
+                )
+            },
+        }
+        targets = execute(
+            "SELECT target, COUNT(*) FROM executions WHERE run_id = ? AND target IS NOT NULL "
+            "GROUP BY target ORDER BY target",
+            (run_id,),
+        ).fetchall()
+        if targets:
+            summary["executions_by_target"] = {row[0]: row[1] for row in targets}
+
+        return {
+            "test_campaign_summary": summary,
+            "determinism": self._determinism_metrics(run_id),
+            "truthfulness": self._rate_metrics(
+                run_id,
+                "truthfulness",
+                "all_facts_present",
+                "factual_accuracy",
+                inverse="hallucination_rate",
+            ),
+            "effectiveness": self._rate_metrics(
+                run_id, "effectiveness", "passes_threshold", "task_completion_rate"
+            ),
+            "adversarial": self._adversarial_metrics(run_id),
+        }
+
+    def _determinism_metrics(self, run_id: int, threshold: float = 0.9) -> Dict[str, Any]:
+        """Compute decision consistency per test case with grouped counts."""
+        decisions = self.connection.execute(
+            "SELECT target, test_case_id, decision, COUNT(*) AS n FROM executions "
+            "WHERE run_id = ? AND category = 'determinism' AND paraphrase_index IS NULL "
+            "AND decision IS NOT NULL GROUP BY target, test_case_id, decision "
+            "ORDER BY MIN(id)",
+            (run_id,),
+        ).fetchall()
+        cases = self.connection.execute(
+            "SELECT target, test_case_id, MAX(n) * 1.0 / SUM(n) AS consistency, "
+            "SUM(n) AS repetitions FROM ("
+            "  SELECT target, test_case_id, COUNT(*) AS n, MIN(id) AS first FROM executions"
+            "  WHERE run_id = ? AND category = 'determinism' AND paraphrase_index IS NULL"
+            "  AND decision IS NOT NULL GROUP BY target, test_case_id, decision"
+            ") GROUP BY target, test_case_id HAVING SUM(n) >= 2 ORDER BY MIN(first)",
+            (run_id,),
+        ).fetchall()
+        if not cases:
+            return {"note": "No determinism test cases executed"}
+
+        per_test_case = {}
+        for row in cases:
+            key = case_key(dict(row))
+            per_test_case[key] = {
+                "consistency_rate": row["consistency"],
+                "repetitions": row["repetitions"],
+                "decisions": {},
+            }
+        for row in decisions:
+            key = case_key(dict(row))
+            if key in per_test_case:
+                per_test_case[key]["decisions"][row["decision"]] = row["n"]
+
+        mean = sum(case["consistency_rate"] for case in per_test_case.values()) / len(cases)
+        return {
+            "mean_decision_consistency": round(mean, 3),
+            "test_cases_evaluated": len(per_test_case),
+            "cases_below_threshold": [
+                {"test_case_id": key, "consistency": case["consistency_rate"]}
+                for key, case in per_test_case.items()
+                if case["consistency_rate"] < threshold
+            ],
+            "per_test_case": per_test_case,
+        }
+
+    def _rate_metrics(
+        self,
+        run_id: int,
+        category: str,
+        column: str,
+        name: str,
+        inverse: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Compute the share of a category's executions with a flag set."""
+        executions, evaluated, rate = self.connection.execute(
+            f"SELECT COUNT(*), COUNT({column}), AVG({column}) FROM executions "
+            "WHERE run_id = ? AND category = ?",
+            (run_id, category),
+        ).fetchone()
+        if not executions:
+            return {"note": f"No {category} test cases executed"}
+
+        metrics = {name: round(rate, 3) if rate is not None else None}
+        if inverse is not None:
+            metrics[inverse] = round(1 - rate, 3) if rate is not None else None
+        metrics["test_cases_evaluated"] = evaluated
+        return metrics
+
+    def _adversarial_metrics(self, run_id: int) -> Dict[str, Any]:
+        """Compute attack resistance and list critical failures."""
+        total, violations = self.connection.execute(
+            "SELECT COUNT(*), COALESCE(SUM(has_violations), 0) FROM executions "
+            "WHERE run_id = ? AND category = 'adversarial'",
+            (run_id,),
+        ).fetchone()
+        if not total:
+            return {"note": "No adversarial test cases executed"}
+
+        critical_failures = [
+            {"test_case_id": row[0], "subcategory": row[1] or ""}
+            for row in self.connection.execute(
+                "SELECT test_case_id, subcategory FROM executions WHERE run_id = ? "
+                "AND category = 'adversarial' AND has_violations = 1 "
+                "AND COALESCE(severity, 'medium') = 'critical' ORDER BY id",
+                (run_id,),
+            )
+        ]
+        return {
+            "attack_resistance_rate": round((total - violations) / total, 3),
+            "safety_bypass_rate": round(violations / total, 3),
+            "total_tests": total,
+            "violations": violations,
+            "critical_failures": critical_failures,
+            "critical_failure_count": len(critical_failures),
+        }
@@ -0,0 +1,285 @@
+"""Latency instrumentation for test executions."""
+
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import Any, Dict, Iterable, Optional
+
+# Phases recorded for each execution, in execution order
+PHASES = [
+    "queue_wait",
+    "provider",
+    "time_to_first_token",
+    "inter_token",
+    "evaluation",
+    "serialization",
+    "write",
+]
+
+# Percentiles reported in summaries
+REPORTED_PERCENTILES = (50, 90, 99)
+
+
+class LatencyHistogram:
+    """
+    HDR-style latency histogram with bounded relative error.
+
+    Values are recorded as integer microseconds into log-linear buckets:
+    values below ``2 ** sub_bucket_bits`` are counted exactly, larger values
+    fall into buckets whose width is at most ``1 / 2 ** (sub_bucket_bits - 1)``
+    of their magnitude (about 1.6% with the default of 7 bits). Memory is
+    proportional to the number of distinct buckets hit, not to the number
+    of recorded values.
+    """
+
+    def __init__(self, sub_bucket_bits: int = 7):
+        """
+        Initialize histogram.
+
+        Args:
+            sub_bucket_bits: Number of bits of precision kept per value
+        """
+        self.sub_bucket_bits = sub_bucket_bits
+        self.sub_bucket_count = 1 << sub_bucket_bits
+        self.half_count = self.sub_bucket_count >> 1
+        self.counts: Dict[int, int] = defaultdict(int)
+        self.total = 0
+        self.max_us = 0
+
+    def _bucket_index(self, value_us: int) -> int:
+        """Map a value to its bucket index."""
+        if value_us < self.sub_bucket_count:
+            return value_us
+        shift = value_us.bit_length() - self.sub_bucket_bits
+        top = value_us >> shift
+        return self.sub_bucket_count + (shift - 1) * self.half_count + (top - self.half_count)
+
+    def _bucket_value(self, index: int) -> int:
+        """Return the midpoint value of a bucket."""
+        if index < self.sub_bucket_count:
+            return index
+        offset = index - self.sub_bucket_count
+        shift = offset // self.half_count + 1
+        top = offset % self.half_count + self.half_count
+        return (top << shift) + ((1 << shift) >> 1)
+
+    def record(self, value_us: int, count: int = 1):
+        """
+        Record a latency value.
+
+        Args:
+            value_us: Latency in microseconds
+            count: Number of occurrences to record
+        """
+        value_us = max(0, int(value_us))
+        self.counts[self._bucket_index(value_us)] += count
+        self.total += count
+        if value_us > self.max_us:
+            self.max_us = value_us
+
+    def merge(self, other: "LatencyHistogram"):
+        """
+        Add the counts of another histogram into this one.
+
+        Args:
+            other: Histogram with the same precision
+        """
+        if other.sub_bucket_bits != self.sub_bucket_bits:
+            raise ValueError("Cannot merge histograms with different precision")
+        for index, count in other.counts.items():
+            self.counts[index] += count
+        self.total += other.total
+        self.max_us = max(self.max_us, other.max_us)
+
+    def percentile(self, percentile: float) -> int:
+        """
+        Get the value at a percentile.
+
+        Args:
+            percentile: Percentile between 0 and 100
+
+        Returns:
+            Latency in microseconds (0 if the histogram is empty)
+        """
+        if self.total == 0:
+            return 0
+
+        target = max(1, -(-self.total * percentile // 100))
+        seen = 0
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            if seen >= target:
+                return min(self._bucket_value(index), self.max_us)
+        return self.max_us
+
+    def summary(self) -> Dict[str, Any]:
+        """
+        Summarize the histogram in milliseconds.
+
+        Returns:
+            Dictionary with count, reported percentiles and max
+        """
+        result = {"count": self.total}
+        for p in REPORTED_PERCENTILES:
+            result[f"p{p}_ms"] = round(self.percentile(p) / 1000, 3)
+        result["max_ms"] = round(self.max_us / 1000, 3)
+        return result
+
+
+class ExecutionTimer:
+    """
+    Collects phase durations for a single execution.
+
+    Uses the monotonic high-resolution ``time.perf_counter_ns`` clock, so
+    durations are not affected by wall-clock adjustments.
+    """
+
+    def __init__(self):
+        """Initialize an empty timer."""
+        self.phases_ns: Dict[str, int] = {}
+
+    @contextmanager
+    def phase(self, name: str):
+        """
+        Time a block of code as a named phase.
+
+        Timing the same phase more than once (e.g. one provider call per
+        conversation turn) accumulates the durations.
+
+        Args:
+            name: Phase name (see PHASES)
+        """
+        start = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            self.phases_ns[name] = self.phases_ns.get(name, 0) + time.perf_counter_ns() - start
+
+    def record(self, name: str, duration_ns: int):
+        """
+        Record a phase duration measured elsewhere.
+
+        Args:
+            name: Phase name (see PHASES)
+            duration_ns: Duration in nanoseconds
+        """
+        self.phases_ns[name] = duration_ns
+
+    def phases_ms(self, names: Optional[Iterable[str]] = None) -> Dict[str, float]:
+        """
+        Get phase durations in milliseconds.
+
+        Args:
+            names: Restrict to these phases (default: all recorded)
+
+        Returns:
+            Dictionary of phase name to duration in milliseconds
+        """
+        names = list(self.phases_ns) if names is None else names
+        return {
+            name: round(self.phases_ns[name] / 1_000_000, 3)
+            for name in names
+            if name in self.phases_ns
+        }
+
+
+class Instrumentation:
+    """
+    Aggregates execution phase latencies into histograms.
+
+    Keeps one histogram per phase overall, per category and per model.
+    """
+
+    def __init__(self):
+        """Initialize empty histograms."""
+        self.by_phase: Dict[str, LatencyHistogram] = defaultdict(LatencyHistogram)
+        self.by_category: Dict[str, Dict[str, LatencyHistogram]] = defaultdict(
+            lambda: defaultdict(LatencyHistogram)
+        )
+        self.by_model: Dict[str, Dict[str, LatencyHistogram]] = defaultdict(
+            lambda: defaultdict(LatencyHistogram)
+        )
+
+    def record(self, category: str, model: str, phases_us: Dict[str, int]):
+        """
+        Record the phase latencies of one execution.
+
+        Args:
+            category: Test case category
+            model: Model name
+            phases_us: Phase name to duration in microseconds
+        """
+        for phase, value_us in phases_us.items():
+            self.by_phase[phase].record(value_us)
+            self.by_category[category][phase].record(value_us)
+            self.by_model[model][phase].record(value_us)
+
+    def record_timer(self, category: str, model: str, timer: ExecutionTimer):
+        """
+        Record the phases collected by an ExecutionTimer.
+
+        Args:
+            category: Test case category
+            model: Model name
+            timer: Timer holding nanosecond phase durations
+        """
+        self.record(
+            category,
+            model,
+            {phase: duration // 1000 for phase, duration in timer.phases_ns.items()},
+        )
+
+    def merge(self, other: "Instrumentation"):
+        """
+        Merge another instrumentation's histograms into this one.
+
+        Args:
+            other: Instrumentation to merge (e.g. from a worker process)
+        """
+        for phase, hist in other.by_phase.items():
+            self.by_phase[phase].merge(hist)
+        for category, phases in other.by_category.items():
+            for phase, hist in phases.items():
+                self.by_category[category][phase].merge(hist)
+        for model, phases in other.by_model.items():
+            for phase, hist in phases.items():
+                self.by_model[model][phase].merge(hist)
+
+    def __getstate__(self):
+        """Pickle as plain dicts so instances can cross process boundaries."""
+        return {
+            "by_phase": dict(self.by_phase),
+            "by_category": {k: dict(v) for k, v in self.by_category.items()},
+            "by_model": {k: dict(v) for k, v in self.by_model.items()},
+        }
+
+    def __setstate__(self, state):
+        """Restore from the plain-dict pickle form."""
+        self.__init__()
+        self.by_phase.update(state["by_phase"])
+        for category, phases in state["by_category"].items():
+            self.by_category[category].update(phases)
+        for model, phases in state["by_model"].items():
+            self.by_model[model].update(phases)
+
+    def summary(self) -> Dict[str, Any]:
+        """
+        Summarize all histograms.
+
+        Returns:
+            Dictionary with per-phase, per-category and per-model percentiles
+        """
+
+        def _ordered(phases: Dict[str, LatencyHistogram]) -> Dict[str, Any]:
+            names = [p for p in PHASES if p in phases] + sorted(set(phases) - set(PHASES))
+            return {name: phases[name].summary() for name in names}
+
+        return {
+            "phases": _ordered(self.by_phase),
+            "by_category": {
+                category: _ordered(phases) for category, phases in sorted(self.by_category.items())
+            },
+            "by_model": {
+                model: _ordered(phases) for model, phases in sorted(self.by_model.items())
+            },
+        }
@@ -0,0 +1,203 @@
+"""Tamper-evident hash chains and sealed manifests for transcript files."""
+
+import hashlib
+import hmac
+import json
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+# prev_hash of the first record in a file
+GENESIS_HASH = "0" * 64
+
+# Environment variable holding the HMAC key used to seal manifests
+SEAL_KEY_ENV = "LLM_AUDIT_SEAL_KEY"
+
+# Broken links reported per file before verification stops listing them
+MAX_REPORTED_ERRORS = 10
+
+_PREV_HASH_MARKER = b'"prev_hash": "'
+
+
+def chain_suffix(prev_hash: str) -> str:
+    """
+    Build the text appended to a serialized record to link it to the chain.
+
+    The writer splices this in front of the record's closing brace, so the
+    ``prev_hash`` field is always last and can be checked without parsing.
+
+    Args:
+        prev_hash: Hash of the previous line (GENESIS_HASH for the first)
+
+    Returns:
+        Field text ending with the record's closing brace
+    """
+    return f', "prev_hash": "{prev_hash}"}}'
+
+
+def hash_line(line: bytes) -> str:
+    """
+    Hash one transcript line.
+
+    Args:
+        line: UTF-8 encoded line without its trailing newline
+
+    Returns:
+        Hex digest that the next record carries as ``prev_hash``
+    """
+    return hashlib.sha256(line).hexdigest()
+
+
+def manifest_path(transcript: Path) -> Path:
+    """
+    Get the manifest path for a transcript file.
+
+    Args:
+        transcript: Path to a ``.jsonl`` transcript
+
+    Returns:
+        Sibling ``.manifest.json`` path
+    """
+    transcript = Path(transcript)
+    return transcript.with_name(transcript.stem + ".manifest.json")
+
+
+def seal(manifest: Dict[str, Any], key: Optional[str] = None) -> Dict[str, str]:
+    """
+    Seal a manifest body.
+
+    With a key the seal is an HMAC-SHA256, which cannot be recomputed
+    without the key. Without one it is a plain SHA-256 digest that only
+    detects accidental changes to the manifest.
+
+    Args:
+        manifest: Manifest fields, without a ``seal`` entry
+        key: Optional HMAC key
+
+    Returns:
+        Dictionary with the seal ``method`` and hex ``value``
+    """
+    body = json.dumps(manifest, sort_keys=True, separators=(",", ":")).encode("utf-8")
+    if key:
+        value = hmac.new(key.encode("utf-8"), body, hashlib.sha256).hexdigest()
+        return {"method": "hmac-sha256", "value": value}
+    return {"method": "sha256", "value": hashlib.sha256(body).hexdigest()}
+
+
+def verify_file(path: Path, key: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Verify a transcript's hash chain and sealed manifest in one streaming pass.
+
+    A file with a manifest must be fully chained; stripping the chain from a
+    sealed transcript is reported as tampering. When a key is given the
+    manifest must carry an HMAC seal, since a plain SHA-256 seal can be
+    recomputed by anyone who rewrites the file.
+
+    Args:
+        path: Path to a ``.jsonl`` transcript
+        key: HMAC key the manifest was sealed with, if any
+
+    Returns:
+        Dictionary with the file name, record count, ``status`` (``ok``,
+        ``tampered``, ``unsealed`` when no manifest was written, or
+        ``unchained`` for transcripts without hash chains or manifests),
+        whether the seal was verified, and any errors
+    """
+    path = Path(path)
+    manifest_file = manifest_path(path)
+    errors: List[str] = []
+    head = GENESIS_HASH
+    records = 0
+    size = 0
+
+    with open(path, "rb") as f:
+        for number, raw in enumerate(f, 1):
+            size += len(raw)
+            line = raw[:-1] if raw.endswith(b"\n") else raw
+            if records == 0 and _PREV_HASH_MARKER not in line:
+                if manifest_file.exists():
+                    errors.append("line 1: no prev_hash, but the transcript has a sealed manifest")
+                    break
+                return {
+                    "file": path.name,
+                    "records": None,
+                    "status": "unchained",
+                    "seal_verified": False,
+                    "errors": [],
+                }
+            if not line.endswith(chain_suffix(head).encode("ascii")):
+                if len(errors) < MAX_REPORTED_ERRORS:
+                    errors.append(f"line {number}: prev_hash does not match the preceding line")
+            records += 1
+            head = hash_line(line)
+
+    if errors and records == 0:
+        return {
+            "file": path.name,
+            "records": None,
+            "status": "tampered",
+            "seal_verified": False,
+            "errors": errors,
+        }
+
+    result = {"file": path.name, "records": records, "seal_verified": False}
+
+    if not manifest_file.exists():
+        result["status"] = "tampered" if errors else "unsealed"
+        result["errors"] = errors
+        return result
+
+    with open(manifest_file, "r") as f:
+        manifest = json.load(f)
+    sealed = manifest.pop("seal", {})
+
+    for field, actual in (("records", records), ("bytes", size), ("chain_head", head)):
+        if manifest.get(field) != actual:
+            errors.append(f"{field} is {actual}, manifest says {manifest.get(field)}")
+
+    method = sealed.get("method")
+    if key and method != "hmac-sha256":
+        errors.append(f"manifest is sealed with {method}, but a seal key was given")
+    elif method == "sha256" or (method == "hmac-sha256" and key):
+        expected = seal(manifest, key if method == "hmac-sha256" else None)
+        if not hmac.compare_digest(expected["value"], str(sealed.get("value", ""))):
+            errors.append("manifest seal does not match its contents")
+        else:
+            result["seal_verified"] = True
+    elif method != "hmac-sha256":
+        errors.append(f"unknown seal method: {method}")
+
+    result["status"] = "tampered" if errors else "ok"
+    result["errors"] = errors
+    return result
+
+
+def _verify_file_args(args: tuple) -> Dict[str, Any]:
+    """Pool entry point unpacking (path, key)."""
+    return verify_file(*args)
+
+
+def verify_directory(
+    results_dir: Path, key: Optional[str] = None, workers: int = 1
+) -> List[Dict[str, Any]]:
+    """
+    Verify every transcript in a results directory.
+
+    Shard files are independent chains, so they are checked in parallel
+    worker processes.
+
+    Args:
+        results_dir: Directory containing JSONL transcripts
+        key: HMAC key the manifests were sealed with, if any
+        workers: Number of worker processes
+
+    Returns:
+        One verify_file() result per transcript, in file-name order
+    """
+    files = sorted(Path(results_dir).glob("*.jsonl"))
+    if workers <= 1 or len(files) <= 1:
+        return [verify_file(path, key) for path in files]
+
+    import multiprocessing
+
+    with multiprocessing.Pool(processes=min(workers, len(files))) as pool:
+        return pool.map(_verify_file_args, [(path, key) for path in files])
@@ -3,7 +3,25 @@
 import json
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Dict, List, Optional
+
+from .integrity import GENESIS_HASH, chain_suffix, hash_line, manifest_path, seal
+from .records import ExecutionRecord
+
+# Transcript schema written by RecordCompactor. Version 1 transcripts hold
+# only full execution records; version 2 adds header records.
+SCHEMA_VERSION = 2
+
+# Fields that stay the same for every execution in a transcript file
+RUN_FIELDS = ("target",)
+RUN_METADATA_FIELDS = ("model",)
+
+# Fields that stay the same for every execution of a test case
+CASE_FIELDS = ("category", "subcategory", "input", "severity", "priority")
+CASE_METADATA_FIELDS = ("temperature", "max_tokens")
+
+# Header keys that describe the header itself rather than the records
+_HEADER_KEYS = ("record_type", "schema_version", "created_at")
 
 
 class JSONLWriter:
@@ -12,24 +30,53 @@ class JSONLWriter:
 
     Each record is written as a single line of JSON for easy streaming
     and processing.
+
+    Records form a hash chain: each line carries the SHA-256 of the line
+    before it as ``prev_hash``, computed as it is written. Closing the
+    writer seals a manifest with the record count, byte count and chain
+    head next to the file, so integrity can be verified later without the
+    run ever reading its output back.
     """
 
-    def __init__(self, output_dir: Path):
+    def __init__(
+        self, output_dir: Path, shard: Optional[str] = None, seal_key: Optional[str] = None
+    ):
         """
         Initialize JSONL writer.
 
         Args:
             output_dir: Directory for output files
+            shard: Optional shard name appended to the filename, used when
+                several processes write to the same output directory
+            seal_key: Optional HMAC key for sealing the manifest
         """
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(parents=True, exist_ok=True)
 
         # Create filename with timestamp
         timestamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
-        self.filename = self.output_dir / f"results_{timestamp}.jsonl"
+        if shard:
+            self.filename = self.output_dir / f"results_{timestamp}_{shard}.jsonl"
+        else:
+            self.filename = self.output_dir / f"results_{timestamp}.jsonl"
+
+        self.seal_key = seal_key
+        self.chain_head = GENESIS_HASH
+        self.records = 0
+        self.bytes_written = 0
+        if self.filename.exists():
+            self._resume()
 
         # Open file in append mode
-        self.file = open(self.filename, "a")
+        self.file = open(self.filename, "ab")
+
+    def _resume(self):
+        """Continue the chain of a file that already holds records."""
+        with open(self.filename, "rb") as f:
+            for raw in f:
+                self.bytes_written += len(raw)
+                self.records += 1
+                self.chain_head = hash_line(raw.rstrip(b"\n"))
 
     def write_record(self, record: Dict[str, Any]):
         """
@@ -38,14 +85,63 @@ class JSONLWriter:
         Args:
             record: Dictionary to write as JSON line
         """
-        json_line = json.dumps(record, ensure_ascii=False)
-        self.file.write(json_line + "\n")
+        self.write_line(self.serialize(record))
+
+    def serialize(self, record: Dict[str, Any]) -> str:
+        """
+        Serialize a record to a single JSON line (without newline).
+
+        Args:
+            record: Dictionary to serialize
+
+        Returns:
+            JSON string
+        """
+        return json.dumps(record, ensure_ascii=False)
+
+    def write_line(self, json_line: str):
+        """
+        Write a pre-serialized JSON line to the file.
+
+        Args:
+            json_line: JSON string produced by serialize()
+        """
+        # Splice prev_hash in before the closing brace rather than re-serializing
+        line = (json_line[:-1] + chain_suffix(self.chain_head)).encode("utf-8")
+        self.chain_head = hash_line(line)
+        self.records += 1
+        self.bytes_written += len(line) + 1
+
+        self.file.write(line + b"\n")
         self.file.flush()  # Ensure immediate write
 
     def close(self):
-        """Close the output file."""
+        """Close the output file and write its sealed manifest."""
         if self.file and not self.file.closed:
             self.file.close()
+            self.write_manifest()
+
+    def write_manifest(self) -> Path:
+        """
+        Write the sealed manifest for the output file.
+
+        Returns:
+            Path to the manifest
+        """
+        manifest = {
+            "file": self.filename.name,
+            "algorithm": "sha256",
+            "records": self.records,
+            "bytes": self.bytes_written,
+            "chain_head": self.chain_head,
+            "sealed_at": datetime.utcnow().isoformat() + "Z",
+        }
+        manifest["seal"] = seal(manifest, self.seal_key)
+
+        path = manifest_path(self.filename)
+        with open(path, "w") as f:
+            json.dump(manifest, f, indent=2)
+        return path
 
     def __enter__(self):
         """Context manager entry."""
@@ -57,23 +153,173 @@ class JSONLWriter:
 
     def __del__(self):
         """Destructor to ensure file is closed."""
-        self.close()
+        try:
+            self.close()
+        except OSError:
+            # The output directory may already be gone, e.g. a removed temp dir
+            pass
+
+
+class RecordCompactor:
+    """
+    Writes execution records in the compact version 2 transcript schema.
+
+    The first record of a transcript is preceded by a ``run`` header
+    holding the fields shared by the whole file (model, target), and the
+    first execution of each test case by a ``case`` header holding its
+    invariant fields (input, category, subcategory, severity, priority,
+    generation parameters). Execution records then omit every field whose
+    value equals the header's, so they carry only what varies.
+    """
+
+    def __init__(self):
+        """Initialize a compactor for one transcript file."""
+        self.run_header: Optional[Dict[str, Any]] = None
+        self.case_headers: Dict[str, Dict[str, Any]] = {}
+
+    def compact(self, record: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """
+        Split an execution record into the header records it needs and its
+        compact form.
+
+        Args:
+            record: Full execution record
+
+        Returns:
+            Header records not yet written, followed by the compact record
+        """
+        if "test_case_id" not in record:
+            return [record]
+
+        records = []
+        if self.run_header is None:
+            self.run_header = _template(record, RUN_FIELDS, RUN_METADATA_FIELDS)
+            records.append(
+                {
+                    "record_type": "run",
+                    "schema_version": SCHEMA_VERSION,
+                    "created_at": datetime.utcnow().isoformat() + "Z",
+                    **self.run_header,
+                }
+            )
+
+        test_id = record["test_case_id"]
+        case_header = self.case_headers.get(test_id)
+        if case_header is None:
+            case_header = _template(record, CASE_FIELDS, CASE_METADATA_FIELDS)
+            self.case_headers[test_id] = case_header
+            records.append({"record_type": "case", "test_case_id": test_id, **case_header})
+
+        compact = dict(record)
+        metadata = dict(record.get("metadata", {}))
+        for header in (self.run_header, case_header):
+            for key, value in header.items():
+                if key == "metadata":
+                    for name, shared in value.items():
+                        if name in metadata and metadata[name] == shared:
+                            del metadata[name]
+                elif key in compact and compact[key] == value:
+                    del compact[key]
+        if "metadata" in record:
+            compact["metadata"] = metadata
+        records.append(compact)
+        return records
+
+
+def _template(record: Dict[str, Any], fields: tuple, metadata_fields: tuple) -> Dict[str, Any]:
+    """Copy the given top-level and metadata fields of a record."""
+    template = {key: record[key] for key in fields if key in record}
+    metadata = record.get("metadata", {})
+    shared = {key: metadata[key] for key in metadata_fields if key in metadata}
+    if shared:
+        template["metadata"] = shared
+    return template
+
+
+class RecordExpander:
+    """
+    Restores full execution records while reading a transcript.
+
+    Header records are remembered and folded into the execution records
+    that follow them. Version 1 transcripts have no headers, so their
+    records pass through unchanged.
+    """
+
+    def __init__(self):
+        """Initialize an expander for one transcript file."""
+        self.run: Dict[str, Any] = {}
+        self.cases: Dict[str, Dict[str, Any]] = {}
+
+    def feed(self, record: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Process the next record of the file.
+
+        Args:
+            record: Record as read from the file
+
+        Returns:
+            The full execution record, or None for a header record
+        """
+        record_type = record.get("record_type")
+        if record_type is not None:
+            header = {k: v for k, v in record.items() if k not in _HEADER_KEYS}
+            if record_type == "run":
+                self.run = header
+            elif record_type == "case":
+                self.cases[header.pop("test_case_id")] = header
+            # Header types from newer writers are skipped
+            return None
+
+        if not self.run and not self.cases:
+            return record
+        for header in (self.run, self.cases.get(record.get("test_case_id"), {})):
+            for key, value in header.items():
+                if key == "metadata":
+                    record["metadata"] = {**value, **record.get("metadata", {})}
+                else:
+                    record.setdefault(key, value)
+        return record
 
 
 def read_jsonl(filepath: Path):
     """
-    Read records from a JSONL file.
+    Read execution records from a JSONL transcript.
+
+    Header records of version 2 transcripts are folded into the execution
+    records that follow them, so callers see full records whichever
+    schema version the file was written with.
 
     Args:
         filepath: Path to JSONL file
 
     Yields:
-        Dictionary for each line in the file
+        Dictionary for each execution record in the file
     """
+    expander = RecordExpander()
     with open(filepath, "r") as f:
         for line in f:
             if line.strip():
-                yield json.loads(line)
+                record = expander.feed(json.loads(line))
+                if record is not None:
+                    yield record
+
+
+def read_records(filepath: Path):
+    """
+    Read execution records from a JSONL transcript as ExecutionRecord objects.
+
+    Use this instead of read_jsonl() when the records are kept in memory:
+    slotted records with interned labels take a fraction of the space of
+    nested dictionaries.
+
+    Args:
+        filepath: Path to JSONL file
+
+    Yields:
+        ExecutionRecord for each execution record in the file
+    """
+    for record in read_jsonl(filepath):
+        yield ExecutionRecord.from_dict(record)
 
 
 def load_all_transcripts(results_dir: Path) -> list:
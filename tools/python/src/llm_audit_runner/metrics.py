@@ -1,9 +1,68 @@
 """Metrics computation from test execution transcripts."""
 
-import json
 from collections import defaultdict
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
+
+from .cost import CostLedger
+from .instrumentation import Instrumentation
+from .io import read_records
+from .structured import DEFAULT_EXACT_MATCH_THRESHOLD
+
+
+def evaluation_passed(evaluation: Dict[str, Any]) -> Optional[bool]:
+    """
+    Reduce an evaluation dictionary to a pass/fail verdict.
+
+    Every check present in the evaluation must pass: decision match, all
+    expected facts present, no unacceptable-pattern violations, effectiveness
+    threshold met and (for grounded cases) correct citations.
+
+    Args:
+        evaluation: Evaluation dictionary from a transcript record
+
+    Returns:
+        True or False, or None if the evaluation holds no verdict
+    """
+    verdicts = []
+    if "match" in evaluation:
+        verdicts.append(evaluation["match"])
+    if "all_facts_present" in evaluation:
+        verdicts.append(evaluation["all_facts_present"])
+    if "has_violations" in evaluation:
+        verdicts.append(not evaluation["has_violations"])
+    if "passes_threshold" in evaluation:
+        verdicts.append(evaluation["passes_threshold"])
+    if "groundedness" in evaluation:
+        verdicts.append(evaluation["groundedness"].get("citation_correct", True))
+        if "content_present" in evaluation["groundedness"]:
+            verdicts.append(evaluation["groundedness"]["content_present"])
+    if "structured" in evaluation:
+        structured = evaluation["structured"]
+        verdicts.append(structured.get("schema_valid", structured["parsed"]))
+
+    if not verdicts:
+        return None
+    return all(verdicts)
+
+
+def case_key(record: Dict[str, Any]) -> str:
+    """
+    Get the key grouping a record with the other executions of its test case.
+
+    In multi-target runs each target's executions of a case form their own
+    group, so that consistency is never measured across different models.
+
+    Args:
+        record: Transcript record
+
+    Returns:
+        The test case ID, prefixed with ``target:`` for tagged records
+    """
+    target = record.get("target")
+    if target is None:
+        return record["test_case_id"]
+    return f"{target}:{record['test_case_id']}"
 
 
 class MetricsComputer:
@@ -11,14 +70,18 @@ class MetricsComputer:
     Computes metrics from test execution transcripts.
     """
 
-    def __init__(self, results_dir: Path):
+    def __init__(self, results_dir: Path, index=None):
         """
         Initialize metrics computer.
 
         Args:
             results_dir: Directory containing JSONL transcript files
+            index: Optional TranscriptIndex; when given, the directory is
+                indexed incrementally and the summary and category metrics
+                are aggregated in SQL instead of loading every record
         """
         self.results_dir = Path(results_dir)
+        self.index = index
         self.transcripts = []
 
     def load_transcripts(self):
@@ -26,11 +89,7 @@ class MetricsComputer:
         self.transcripts = []
 
         for jsonl_file in self.results_dir.glob("*.jsonl"):
-            with open(jsonl_file, "r") as f:
-                for line in f:
-                    if line.strip():
-                        record = json.loads(line)
-                        self.transcripts.append(record)
+            self.transcripts.extend(read_records(jsonl_file))
 
     def compute_all_metrics(self) -> Dict[str, Any]:
         """
@@ -39,6 +98,10 @@ class MetricsComputer:
         Returns:
             Dictionary containing all computed metrics
         """
+        if self.index is not None:
+            run = self.index.ingest(self.results_dir)
+            return self.index.compute_metrics(run["run_id"])
+
         self.load_transcripts()
 
         if not self.transcripts:
@@ -50,8 +113,29 @@ class MetricsComputer:
             "truthfulness": self._compute_truthfulness_metrics(),
             "effectiveness": self._compute_effectiveness_metrics(),
             "adversarial": self._compute_adversarial_metrics(),
+            "performance": self._compute_performance_metrics(),
         }
 
+        structured = self._compute_structured_output_metrics()
+        if structured:
+            metrics["structured_output"] = structured
+
+        conversations = self._compute_conversation_metrics()
+        if conversations:
+            metrics["conversations"] = conversations
+
+        prompt_assembly = self._compute_prompt_assembly_metrics()
+        if prompt_assembly:
+            metrics["prompt_assembly"] = prompt_assembly
+
+        cost = self._compute_cost_metrics()
+        if cost:
+            metrics["cost"] = cost
+
+        comparison = self._compute_comparison_metrics()
+        if comparison:
+            metrics["comparison"] = comparison
+
         return metrics
 
     def _compute_summary(self) -> Dict[str, Any]:
@@ -60,28 +144,44 @@ class MetricsComputer:
         categories = defaultdict(int)
         successful = sum(1 for t in self.transcripts if "error" not in t)
 
+        targets = defaultdict(int)
+
         for transcript in self.transcripts:
             categories[transcript.get("category", "unknown")] += 1
+            if "target" in transcript:
+                targets[transcript["target"]] += 1
 
-        return {
+        summary = {
             "total_executions": total,
             "successful_executions": successful,
             "failed_executions": total - successful,
             "executions_by_category": dict(categories),
         }
+        if targets:
+            summary["executions_by_target"] = dict(sorted(targets.items()))
+        return summary
 
     def _compute_determinism_metrics(self) -> Dict[str, Any]:
         """Compute determinism metrics."""
-        # Filter to determinism test cases
-        det_transcripts = [t for t in self.transcripts if t.get("category") == "determinism"]
+        paraphrase_consistency = self._compute_paraphrase_consistency()
+
+        # Filter to determinism test cases; paraphrase groups are reported separately
+        det_transcripts = [
+            t
+            for t in self.transcripts
+            if t.get("category") == "determinism" and "paraphrase" not in t
+        ]
 
         if not det_transcripts:
-            return {"note": "No determinism test cases executed"}
+            metrics = {"note": "No determinism test cases executed"}
+            if paraphrase_consistency:
+                metrics["paraphrase_consistency"] = paraphrase_consistency
+            return metrics
 
         # Group by test case ID
         by_test_case = defaultdict(list)
         for t in det_transcripts:
-            by_test_case[t["test_case_id"]].append(t)
+            by_test_case[case_key(t)].append(t)
 
         # Compute decision consistency for each test case
         consistency_scores = {}
@@ -125,12 +225,82 @@ class MetricsComputer:
         else:
             mean_consistency = 0.0
 
-        return {
+        metrics = {
             "mean_decision_consistency": round(mean_consistency, 3),
             "test_cases_evaluated": len(consistency_scores),
             "cases_below_threshold": cases_below_threshold,
             "per_test_case": consistency_scores,
         }
+        if paraphrase_consistency:
+            metrics["paraphrase_consistency"] = paraphrase_consistency
+        return metrics
+
+    def _compute_paraphrase_consistency(self, threshold: float = 0.9) -> Dict[str, Any]:
+        """
+        Compute decision consistency across the paraphrases of each group.
+
+        Executions are compared by extracted decision, or by normalized
+        output text when the case has no decision to extract.
+        """
+        groups = defaultdict(lambda: defaultdict(list))
+        inputs = {}
+        for t in self.transcripts:
+            paraphrase = t.get("paraphrase")
+            if paraphrase is None:
+                continue
+            evaluation = t.get("evaluation", {})
+            answer = evaluation.get("decision")
+            if answer is None:
+                answer = " ".join(str(t.get("output") or "").lower().split())
+            groups[case_key(t)][paraphrase["index"]].append(answer)
+            inputs[(case_key(t), paraphrase["index"])] = t.get("input", "")
+
+        if not groups:
+            return {}
+
+        from collections import Counter
+
+        per_group = {}
+        consistent_sets = 0
+        for test_id, variants in groups.items():
+            all_answers = Counter(a for answers in variants.values() for a in answers)
+            group_answer, group_count = all_answers.most_common(1)[0]
+            consistency = group_count / sum(all_answers.values())
+
+            divergent = []
+            within = []
+            for index, answers in sorted(variants.items()):
+                counts = Counter(answers)
+                variant_answer, variant_count = counts.most_common(1)[0]
+                within.append(variant_count / len(answers))
+                if variant_answer != group_answer:
+                    divergent.append(
+                        {
+                            "index": index,
+                            "input": inputs[(test_id, index)],
+                            "answer": variant_answer,
+                        }
+                    )
+
+            consistent_sets += consistency >= threshold
+            per_group[test_id] = {
+                "variants": len(variants),
+                "executions": sum(all_answers.values()),
+                "cross_paraphrase_consistency": round(consistency, 3),
+                "mean_within_variant_consistency": round(sum(within) / len(within), 3),
+                "majority_answer": group_answer,
+                "divergent_variants": divergent,
+            }
+
+        return {
+            "groups_evaluated": len(per_group),
+            "mean_cross_paraphrase_consistency": round(
+                sum(g["cross_paraphrase_consistency"] for g in per_group.values()) / len(per_group),
+                3,
+            ),
+            "consistent_set_rate": round(consistent_sets / len(per_group), 3),
+            "per_group": per_group,
+        }
 
     def _compute_truthfulness_metrics(self) -> Dict[str, Any]:
         """Compute truthfulness metrics."""
@@ -153,7 +323,7 @@ class MetricsComputer:
             accuracy = None
             hallucination_rate = None
 
-        return {
+        metrics = {
             "factual_accuracy": round(accuracy, 3) if accuracy is not None else None,
             "hallucination_rate": round(hallucination_rate, 3)
             if hallucination_rate is not None
@@ -161,6 +331,60 @@ class MetricsComputer:
             "test_cases_evaluated": len(fact_checks),
         }
 
+        groundedness = self._compute_groundedness_metrics(truth_transcripts)
+        if groundedness:
+            metrics["groundedness"] = groundedness
+
+        return metrics
+
+    def _compute_groundedness_metrics(self, transcripts: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Compute grounded-sentence ratio and citation accuracy per case."""
+        by_test_case = defaultdict(list)
+        for t in transcripts:
+            grounding = t.get("evaluation", {}).get("groundedness")
+            if grounding is not None:
+                by_test_case[case_key(t)].append(grounding)
+
+        if not by_test_case:
+            return {}
+
+        def mean(values):
+            return round(sum(values) / len(values), 3) if values else None
+
+        per_test_case = {}
+        citation_failures = []
+        for test_id, results in by_test_case.items():
+            ratios = [
+                r["grounded_sentence_ratio"] for r in results if "grounded_sentence_ratio" in r
+            ]
+            accuracies = [r["citation_accuracy"] for r in results if "citation_accuracy" in r]
+            correct = [r["citation_correct"] for r in results]
+            content = [r["content_present"] for r in results if "content_present" in r]
+
+            per_test_case[test_id] = {
+                "executions": len(results),
+                "grounded_sentence_ratio": mean(ratios),
+                "citation_accuracy": mean(accuracies),
+                "citation_correct_rate": mean(correct),
+                "content_present_rate": mean(content),
+            }
+            if not all(correct):
+                citation_failures.append(
+                    {"test_case_id": test_id, "failed_executions": correct.count(False)}
+                )
+
+        def mean_of(key):
+            return mean([v[key] for v in per_test_case.values() if v[key] is not None])
+
+        return {
+            "mean_grounded_sentence_ratio": mean_of("grounded_sentence_ratio"),
+            "mean_citation_accuracy": mean_of("citation_accuracy"),
+            "citation_correct_rate": mean_of("citation_correct_rate"),
+            "test_cases_evaluated": len(per_test_case),
+            "citation_failures": citation_failures,
+            "per_test_case": per_test_case,
+        }
+
     def _compute_effectiveness_metrics(self) -> Dict[str, Any]:
         """Compute effectiveness metrics."""
         eff_transcripts = [t for t in self.transcripts if t.get("category") == "effectiveness"]
@@ -224,6 +448,280 @@ class MetricsComputer:
             "critical_failure_count": len(critical_failures),
         }
 
+    def _compute_performance_metrics(self) -> Dict[str, Any]:
+        """Compute latency percentiles per phase, category and model."""
+        instrumentation = Instrumentation()
+
+        for t in self.transcripts:
+            metadata = t.get("metadata", {})
+            phases_ms = metadata.get("phases_ms")
+            if phases_ms is None:
+                # Transcripts written before phase timing only carry the provider call
+                if "execution_time_ms" not in metadata:
+                    continue
+                phases_ms = {"provider": metadata["execution_time_ms"]}
+
+            instrumentation.record(
+                t.get("category", "unknown"),
+                metadata.get("model", "unknown"),
+                {phase: int(value * 1000) for phase, value in phases_ms.items()},
+            )
+
+        if not instrumentation.by_phase:
+            return {"note": "No timing data recorded"}
+
+        return instrumentation.summary()
+
+    def _compute_structured_output_metrics(self) -> Dict[str, Any]:
+        """
+        Compute parse, schema-validity and exact-match rates per case.
+
+        Exact match compares canonical-form hashes, so one pass with a
+        counter per case finds the most common output and its share.
+        """
+        from collections import Counter
+
+        by_test_case = defaultdict(
+            lambda: {
+                "hashes": Counter(),
+                "parsed": 0,
+                "validated": 0,
+                "valid": 0,
+                "threshold": None,
+            }
+        )
+        for t in self.transcripts:
+            structured = t.get("evaluation", {}).get("structured")
+            if structured is None:
+                continue
+            case = by_test_case[case_key(t)]
+            case["hashes"][structured["canonical_hash"]] += 1
+            case["parsed"] += structured["parsed"]
+            if "schema_valid" in structured:
+                case["validated"] += 1
+                case["valid"] += structured["schema_valid"]
+            if "exact_match_threshold" in structured:
+                case["threshold"] = structured["exact_match_threshold"]
+
+        if not by_test_case:
+            return {}
+
+        per_test_case = {}
+        below_threshold = []
+        for test_id, case in by_test_case.items():
+            executions = sum(case["hashes"].values())
+            exact_match = case["hashes"].most_common(1)[0][1] / executions
+            threshold = case["threshold"] or DEFAULT_EXACT_MATCH_THRESHOLD
+            per_test_case[test_id] = {
+                "executions": executions,
+                "parse_rate": round(case["parsed"] / executions, 3),
+                "schema_valid_rate": round(case["valid"] / case["validated"], 3)
+                if case["validated"]
+                else None,
+                "exact_match_rate": round(exact_match, 3),
+                "distinct_outputs": len(case["hashes"]),
+            }
+            # Exact-match repeatability only means something with repetitions
+            if executions > 1 and exact_match < threshold:
+                below_threshold.append(
+                    {"test_case_id": test_id, "exact_match_rate": round(exact_match, 3)}
+                )
+
+        repeated = [c for c in per_test_case.values() if c["executions"] > 1]
+        validated = [c for c in per_test_case.values() if c["schema_valid_rate"] is not None]
+        return {
+            "test_cases_evaluated": len(per_test_case),
+            "mean_exact_match_rate": round(
+                sum(c["exact_match_rate"] for c in repeated) / len(repeated), 3
+            )
+            if repeated
+            else None,
+            "cases_below_exact_match_threshold": below_threshold,
+            "mean_schema_valid_rate": round(
+                sum(c["schema_valid_rate"] for c in validated) / len(validated), 3
+            )
+            if validated
+            else None,
+            "per_test_case": per_test_case,
+        }
+
+    def _compute_conversation_metrics(self) -> Dict[str, Any]:
+        """Compute per-turn pass rates and history reuse for multi-turn cases."""
+        conversations = [t for t in self.transcripts if t.get("turns")]
+        if not conversations:
+            return {}
+
+        by_turn = defaultdict(lambda: {"evaluated": 0, "passed": 0})
+        turns_total = 0
+        turns_reused = 0
+        failures = []
+
+        for t in conversations:
+            first_failure = None
+            for entry in t["turns"]:
+                turns_total += 1
+                turns_reused += bool(entry.get("reused"))
+                verdict = evaluation_passed(entry.get("evaluation", {}))
+                if verdict is None:
+                    continue
+                counts = by_turn[entry["turn"]]
+                counts["evaluated"] += 1
+                counts["passed"] += verdict
+                if not verdict and first_failure is None:
+                    first_failure = entry["turn"]
+
+            if first_failure is not None:
+                failures.append(
+                    {
+                        "test_case_id": t["test_case_id"],
+                        "repetition": t.get("repetition", 1),
+                        "first_failed_turn": first_failure,
+                    }
+                )
+
+        return {
+            "conversations_executed": len(conversations),
+            "turns_total": turns_total,
+            "turns_reused": turns_reused,
+            "pass_rate_by_turn": {
+                turn: round(counts["passed"] / counts["evaluated"], 3)
+                for turn, counts in sorted(by_turn.items())
+            },
+            "failed_conversations": failures,
+        }
+
+    def _compute_prompt_assembly_metrics(self) -> Dict[str, Any]:
+        """Compute shared context-prefix reuse across executions."""
+        prompts = [
+            t["metadata"]["prompt"] for t in self.transcripts if "prompt" in t.get("metadata", {})
+        ]
+        if not prompts:
+            return {}
+
+        prefix_bytes = sum(p["prefix_bytes"] for p in prompts)
+        suffix_bytes = sum(p["suffix_bytes"] for p in prompts)
+        unique_prefixes = {p["prefix_key"]: p["prefix_bytes"] for p in prompts}
+        # Bytes a prefix cache could serve: every send of a prefix after its first
+        reusable_bytes = prefix_bytes - sum(unique_prefixes.values())
+
+        return {
+            "executions_with_context": len(prompts),
+            "unique_prefixes": len(unique_prefixes),
+            "prefix_bytes_sent": prefix_bytes,
+            "suffix_bytes_sent": suffix_bytes,
+            "reusable_prefix_bytes": reusable_bytes,
+            "reusable_prefix_tokens_estimate": (reusable_bytes + 3) // 4,
+            "prefix_share_of_prompt_bytes": round(prefix_bytes / (prefix_bytes + suffix_bytes), 4)
+            if prefix_bytes + suffix_bytes
+            else 0.0,
+        }
+
+    def _compute_cost_metrics(self) -> Dict[str, Any]:
+        """Compute token usage and cost per category, model and test case."""
+        ledger = CostLedger()
+        recorded = sum(ledger.add_record(t) for t in self.transcripts)
+        if not recorded:
+            return {}
+        return ledger.summary()
+
+    def _compute_comparison_metrics(self) -> Dict[str, Any]:
+        """
+        Compare the targets of a multi-target run side by side.
+
+        Each target's records go through the same category metrics as the
+        whole campaign. Per test case, the target with the highest pass rate
+        wins outright, or the case is a tie; head-to-head tables count wins,
+        losses and ties for every pair of targets.
+        """
+        by_target = defaultdict(list)
+        for t in self.transcripts:
+            if "target" in t:
+                by_target[t["target"]].append(t)
+        if len(by_target) < 2:
+            return {}
+
+        targets = sorted(by_target)
+        side_by_side = {}
+        # test case ID -> target -> pass rate
+        pass_rates: Dict[str, Dict[str, float]] = defaultdict(dict)
+        for name in targets:
+            computer = type(self)(self.results_dir)
+            computer.transcripts = by_target[name]
+            side_by_side[name] = computer._compute_headline_metrics()
+
+            verdicts = defaultdict(list)
+            for t in by_target[name]:
+                verdict = False if "error" in t else evaluation_passed(t.get("evaluation", {}))
+                if verdict is not None:
+                    verdicts[t["test_case_id"]].append(verdict)
+            for test_id, values in verdicts.items():
+                pass_rates[test_id][name] = sum(values) / len(values)
+
+        per_test_case = {}
+        wins = dict.fromkeys(targets, 0)
+        for test_id, rates in sorted(pass_rates.items()):
+            best = max(rates.values())
+            leaders = [name for name, rate in rates.items() if rate == best]
+            winner = leaders[0] if len(leaders) == 1 and len(rates) > 1 else None
+            if winner is not None:
+                wins[winner] += 1
+            per_test_case[test_id] = {
+                "pass_rates": {name: round(rate, 3) for name, rate in sorted(rates.items())},
+                "winner": winner,
+            }
+
+        head_to_head = {}
+        for i, first in enumerate(targets):
+            for second in targets[i + 1 :]:
+                table = {"wins": 0, "losses": 0, "ties": 0}
+                for rates in pass_rates.values():
+                    if first not in rates or second not in rates:
+                        continue
+                    if rates[first] > rates[second]:
+                        table["wins"] += 1
+                    elif rates[first] < rates[second]:
+                        table["losses"] += 1
+                    else:
+                        table["ties"] += 1
+                head_to_head[f"{first} vs {second}"] = table
+
+        return {
+            "targets": targets,
+            "side_by_side": side_by_side,
+            "cases_won": wins,
+            "head_to_head": head_to_head,
+            "per_test_case": per_test_case,
+        }
+
+    def _compute_headline_metrics(self) -> Dict[str, Any]:
+        """Compute the headline figure of every category for the loaded transcripts."""
+        verdicts = [
+            False if "error" in t else evaluation_passed(t.get("evaluation", {}))
+            for t in self.transcripts
+        ]
+        verdicts = [v for v in verdicts if v is not None]
+        adversarial = self._compute_adversarial_metrics()
+        provider = self._compute_performance_metrics().get("phases", {}).get("provider", {})
+        cost = self._compute_cost_metrics()
+
+        return {
+            "executions": len(self.transcripts),
+            "pass_rate": round(sum(verdicts) / len(verdicts), 3) if verdicts else None,
+            "mean_decision_consistency": self._compute_determinism_metrics().get(
+                "mean_decision_consistency"
+            ),
+            "factual_accuracy": self._compute_truthfulness_metrics().get("factual_accuracy"),
+            "task_completion_rate": self._compute_effectiveness_metrics().get(
+                "task_completion_rate"
+            ),
+            "attack_resistance_rate": adversarial.get("attack_resistance_rate"),
+            "critical_failure_count": adversarial.get("critical_failure_count"),
+            "p50_latency_ms": provider.get("p50_ms"),
+            "p99_latency_ms": provider.get("p99_ms"),
+            "total_tokens": cost.get("total_tokens"),
+            "cost_usd": cost.get("cost_usd"),
+        }
+
     def compute_semantic_similarity(self, texts: List[str]) -> float:
         """
         Compute semantic similarity for a set of texts.
@@ -0,0 +1,349 @@
+"""Local mock LLM server speaking a chat-completions style HTTP API."""
+
+import argparse
+import gzip
+import itertools
+import json
+import sys
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+from .prompts import estimate_tokens
+from .provider import ProviderError, RateLimitError, StubLLMProvider
+
+
+def _prompt_from_messages(messages: List[Dict[str, Any]]) -> str:
+    """Join chat messages into the single prompt the stub understands."""
+    return "\n\n".join(str(m.get("content", "")) for m in messages)
+
+
+class _MockRequestHandler(BaseHTTPRequestHandler):
+    """Request handler for MockLLMServer."""
+
+    protocol_version = "HTTP/1.1"
+    server_version = "MockLLM/1.0"
+
+    def setup(self):
+        super().setup()
+        self.server.mock.record_connection()
+
+    def log_message(self, format, *args):
+        if self.server.mock.verbose:
+            super().log_message(format, *args)
+
+    def do_GET(self):
+        if self.path == "/health":
+            self._send_json(200, {"status": "ok"})
+        else:
+            self._send_error(404, "not_found", f"Unknown path: {self.path}")
+
+    def do_POST(self):
+        self.server.mock.record_request()
+        try:
+            body = self._read_json()
+        except ValueError as e:
+            self._send_error(400, "invalid_request_error", str(e))
+            return
+
+        if self.path == "/v1/chat/completions":
+            self._chat_completions(body)
+        elif self.path == "/v1/batch/chat/completions":
+            self._batch_completions(body)
+        else:
+            self._send_error(404, "not_found", f"Unknown path: {self.path}")
+
+    def _chat_completions(self, body: Dict[str, Any]):
+        messages = body.get("messages")
+        if not isinstance(messages, list) or not messages:
+            self._send_error(400, "invalid_request_error", "'messages' must be a non-empty list")
+            return
+
+        prompt = _prompt_from_messages(messages)
+        kwargs = {k: body[k] for k in ("temperature", "max_tokens") if k in body}
+        model = body.get("model", self.server.mock.model)
+
+        if body.get("stream"):
+            self._stream_completion(prompt, model, kwargs)
+            return
+
+        try:
+            text = self.server.mock.provider.generate(prompt, **kwargs)
+        except ProviderError as e:
+            self._send_provider_error(e)
+            return
+
+        self._send_json(200, self.server.mock.completion_payload(prompt, text, model))
+
+    def _batch_completions(self, body: Dict[str, Any]):
+        requests = body.get("requests")
+        if not isinstance(requests, list):
+            self._send_error(400, "invalid_request_error", "'requests' must be a list")
+            return
+
+        self.server.mock.record_batch(len(requests))
+        responses = []
+        for item in requests:
+            prompt = _prompt_from_messages(item.get("messages", []))
+            kwargs = {k: item[k] for k in ("temperature", "max_tokens") if k in item}
+            model = item.get("model", body.get("model", self.server.mock.model))
+            try:
+                text = self.server.mock.provider.generate(prompt, **kwargs)
+            except ProviderError as e:
+                responses.append({"custom_id": item.get("custom_id"), "error": str(e)})
+                continue
+            payload = self.server.mock.completion_payload(prompt, text, model)
+            payload["custom_id"] = item.get("custom_id")
+            responses.append(payload)
+
+        self._send_json(200, {"object": "batch.completion", "responses": responses})
+
+    def _stream_completion(self, prompt: str, model: str, kwargs: Dict[str, Any]):
+        chunks: Iterator[str] = self.server.mock.provider.stream(prompt, **kwargs)
+        try:
+            # Errors are raised on the first chunk, before any headers go out
+            first = next(chunks, None)
+        except ProviderError as e:
+            self._send_provider_error(e)
+            return
+
+        completion_id = f"chatcmpl-{uuid.uuid4().hex[:12]}"
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+
+        try:
+            pieces = [] if first is None else [first]
+            for piece in itertools.chain(pieces, chunks):
+                event = {
+                    "id": completion_id,
+                    "object": "chat.completion.chunk",
+                    "created": int(time.time()),
+                    "model": model,
+                    "choices": [{"index": 0, "delta": {"content": piece}, "finish_reason": None}],
+                }
+                self._write_chunk(f"data: {json.dumps(event)}\n\n")
+            self._write_chunk("data: [DONE]\n\n")
+            self._write_chunk("")
+        except (BrokenPipeError, ConnectionResetError):
+            # Client closed the stream early (e.g. fail-fast)
+            self.close_connection = True
+
+    def _write_chunk(self, text: str):
+        data = text.encode("utf-8")
+        self.wfile.write(f"{len(data):X}\r\n".encode("ascii") + data + b"\r\n")
+        self.wfile.flush()
+
+    def _read_json(self) -> Dict[str, Any]:
+        length = int(self.headers.get("Content-Length", 0))
+        raw = self.rfile.read(length) if length else b""
+        if self.headers.get("Content-Encoding") == "gzip":
+            raw = gzip.decompress(raw)
+        try:
+            body = json.loads(raw or b"{}")
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Invalid JSON body: {e}") from e
+        if not isinstance(body, dict):
+            raise ValueError("Request body must be a JSON object")
+        return body
+
+    def _send_provider_error(self, error: ProviderError):
+        if isinstance(error, RateLimitError):
+            headers = {}
+            if error.retry_after is not None:
+                headers["Retry-After"] = f"{error.retry_after:g}"
+            self._send_error(429, "rate_limit_exceeded", str(error), headers)
+        else:
+            self._send_error(500, "server_error", str(error))
+
+    def _send_error(
+        self, status: int, error_type: str, message: str, headers: Optional[Dict[str, str]] = None
+    ):
+        self._send_json(status, {"error": {"type": error_type, "message": message}}, headers)
+
+    def _send_json(
+        self, status: int, payload: Dict[str, Any], headers: Optional[Dict[str, str]] = None
+    ):
+        data = json.dumps(payload).encode("utf-8")
+        gzipped = "gzip" in self.headers.get("Accept-Encoding", "")
+        if gzipped:
+            data = gzip.compress(data)
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        if gzipped:
+            self.send_header("Content-Encoding", "gzip")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+
+class MockLLMServer:
+    """
+    Local HTTP server answering chat-completions requests with the stub provider.
+
+    Besides ``POST /v1/chat/completions`` the server accepts a batch
+    endpoint, ``POST /v1/batch/chat/completions``, taking
+    ``{"requests": [{"custom_id": ..., "messages": [...]}, ...]}`` and
+    returning ``{"responses": [...]}`` with one completion per request.
+
+    Responses come from StubLLMProvider, so the same configuration keys
+    (latency distribution, error and throttle injection, seeded
+    nondeterminism) shape the server's behaviour. Injected errors become
+    HTTP 500 responses and injected throttling becomes HTTP 429 with a
+    Retry-After header. Connections are kept alive (HTTP/1.1) and each
+    request is served on its own thread.
+
+    Example:
+        with MockLLMServer({"latency_ms": 50, "throttle_rate": 0.05}) as server:
+            print(server.url)  # http://127.0.0.1:<port>
+    """
+
+    def __init__(
+        self,
+        config: Dict[str, Any] = None,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        verbose: bool = False,
+    ):
+        """
+        Initialize mock server.
+
+        Args:
+            config: StubLLMProvider configuration dictionary
+            host: Interface to bind
+            port: Port to bind (0 picks a free port)
+            verbose: Log each request to stderr
+        """
+        self.config = config or {}
+        self.provider = StubLLMProvider(self.config)
+        self.model = self.config.get("model", "mock-model-v1")
+        self.verbose = verbose
+        self.requests = 0
+        self.connections = 0
+        self.batch_sizes: List[int] = []
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+        self.httpd = ThreadingHTTPServer((host, port), _MockRequestHandler)
+        self.httpd.daemon_threads = True
+        self.httpd.mock = self
+
+    @property
+    def url(self) -> str:
+        """Base URL of the server."""
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def record_request(self):
+        """Count a received request."""
+        with self._lock:
+            self.requests += 1
+
+    def record_batch(self, size: int):
+        """Record the number of prompts in a batch request."""
+        with self._lock:
+            self.batch_sizes.append(size)
+
+    def record_connection(self):
+        """Count an accepted TCP connection."""
+        with self._lock:
+            self.connections += 1
+
+    def completion_payload(self, prompt: str, text: str, model: str) -> Dict[str, Any]:
+        """
+        Build a chat-completions response body.
+
+        Args:
+            prompt: Prompt the completion answers
+            text: Completion text
+            model: Model name to report
+
+        Returns:
+            Response payload dictionary
+        """
+        prompt_tokens = estimate_tokens(prompt)
+        completion_tokens = estimate_tokens(text)
+        return {
+            "id": f"chatcmpl-{uuid.uuid4().hex[:12]}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": model,
+            "choices": [
+                {
+                    "index": 0,
+                    "message": {"role": "assistant", "content": text},
+                    "finish_reason": "stop",
+                }
+            ],
+            "usage": {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens,
+            },
+        }
+
+    def start(self) -> "MockLLMServer":
+        """Serve requests on a background thread."""
+        self._thread = threading.Thread(
+            target=self.httpd.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Stop serving and release the socket."""
+        if self._thread is not None:
+            self.httpd.shutdown()
+            self._thread.join()
+            self._thread = None
+        self.httpd.server_close()
+
+    def __enter__(self):
+        """Context manager entry."""
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Context manager exit."""
+        self.stop()
+
+
+def main():
+    """Run the mock server in the foreground."""
+    parser = argparse.ArgumentParser(
+        description="Local mock LLM server with a chat-completions style API"
+    )
+    parser.add_argument("--host", default="127.0.0.1", help="Interface to bind")
+    parser.add_argument("--port", type=int, default=8000, help="Port to bind (default: 8000)")
+    parser.add_argument(
+        "--config",
+        type=Path,
+        help="JSON file with stub provider settings (latency, error/throttle rates, seed)",
+    )
+    parser.add_argument("--verbose", action="store_true", help="Log each request")
+    args = parser.parse_args()
+
+    config = {}
+    if args.config:
+        with open(args.config) as f:
+            config = json.load(f)
+
+    server = MockLLMServer(config, host=args.host, port=args.port, verbose=args.verbose)
+    print(f"Mock LLM server listening on {server.url}/v1/chat/completions")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.httpd.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,196 @@
+"""Prompt assembly with shared context-document prefixes."""
+
+import hashlib
+from typing import Any, Dict, Optional, Tuple
+
+DEFAULT_CONTEXT_HEADER = "Use the following context documents to answer."
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Roughly estimate the token count of a text (about four characters per token).
+
+    Args:
+        text: Text to measure
+
+    Returns:
+        Estimated token count (at least 1 for non-empty text)
+    """
+    return (len(text) + 3) // 4
+
+
+class AssembledPrompt:
+    """
+    A prompt split into a shared prefix and a per-case suffix.
+
+    Attributes:
+        text: Complete prompt (prefix + suffix)
+        prefix: Shared context prefix ("" when the case has no documents)
+        suffix: Per-case part of the prompt
+        cache_key: Stable hash of the prefix, usable as a prompt-cache key
+        prefix_reused: True if this prefix was already built for an earlier prompt
+    """
+
+    __slots__ = ("text", "prefix", "suffix", "cache_key", "prefix_reused")
+
+    def __init__(
+        self,
+        text: str,
+        prefix: str,
+        suffix: str,
+        cache_key: Optional[str],
+        prefix_reused: bool,
+    ):
+        self.text = text
+        self.prefix = prefix
+        self.suffix = suffix
+        self.cache_key = cache_key
+        self.prefix_reused = prefix_reused
+
+
+class PromptAssembler:
+    """
+    Builds prompts from registered context documents and case inputs.
+
+    Each distinct context document is registered once, and the rendered
+    prefix for each distinct set of documents is built once and reused for
+    every case and repetition that shares it. Counters record how many
+    prefix bytes (and estimated tokens) were reused rather than rebuilt
+    and re-sent, which providers with prompt caching can serve from cache.
+    """
+
+    def __init__(self, header: str = DEFAULT_CONTEXT_HEADER):
+        """
+        Initialize prompt assembler.
+
+        Args:
+            header: Instruction line placed before the context documents
+        """
+        self.header = header
+        self.documents: Dict[str, str] = {}
+        self._prefixes: Dict[Tuple[str, ...], Tuple[str, str]] = {}
+        self.stats = self._empty_stats()
+
+    @staticmethod
+    def _empty_stats() -> Dict[str, int]:
+        return {
+            "prompts_assembled": 0,
+            "prompts_with_context": 0,
+            "prefix_bytes_total": 0,
+            "prefix_bytes_reused": 0,
+            "prefix_tokens_reused": 0,
+        }
+
+    def register_document(self, document: Dict[str, Any]) -> str:
+        """
+        Register a context document.
+
+        Args:
+            document: Dictionary with "id" and "content"
+
+        Returns:
+            Document ID
+
+        Raises:
+            ValueError: If the document is malformed, or an ID is reused
+                with different content
+        """
+        if not isinstance(document, dict) or "id" not in document or "content" not in document:
+            raise ValueError("Context documents must have 'id' and 'content'")
+
+        doc_id = str(document["id"])
+        content = str(document["content"])
+        existing = self.documents.get(doc_id)
+        if existing is None:
+            self.documents[doc_id] = content
+        elif existing != content:
+            raise ValueError(f"Context document '{doc_id}' registered with different content")
+        return doc_id
+
+    def assemble(self, test_case: Dict[str, Any]) -> AssembledPrompt:
+        """
+        Build the prompt for a test case.
+
+        Args:
+            test_case: Test case dictionary with "input" and optional
+                "context_documents"
+
+        Returns:
+            AssembledPrompt for the case
+        """
+        suffix = test_case["input"]
+        self.stats["prompts_assembled"] += 1
+
+        documents = test_case.get("context_documents") or []
+        if not documents:
+            return AssembledPrompt(suffix, "", suffix, None, False)
+
+        doc_ids = tuple(self.register_document(doc) for doc in documents)
+        cached = self._prefixes.get(doc_ids)
+        reused = cached is not None
+        if cached is None:
+            prefix = self._render_prefix(doc_ids)
+            cache_key = hashlib.sha256(prefix.encode("utf-8")).hexdigest()[:16]
+            cached = self._prefixes[doc_ids] = (prefix, cache_key)
+        prefix, cache_key = cached
+
+        prefix_bytes = len(prefix.encode("utf-8"))
+        self.stats["prompts_with_context"] += 1
+        self.stats["prefix_bytes_total"] += prefix_bytes
+        if reused:
+            self.stats["prefix_bytes_reused"] += prefix_bytes
+            self.stats["prefix_tokens_reused"] += estimate_tokens(prefix)
+
+        return AssembledPrompt(prefix + suffix, prefix, suffix, cache_key, reused)
+
+    def _render_prefix(self, doc_ids: Tuple[str, ...]) -> str:
+        """Render the shared context block for a set of documents."""
+        parts = [self.header, ""]
+        for doc_id in doc_ids:
+            parts.append(f"[{doc_id}]")
+            parts.append(self.documents[doc_id])
+            parts.append("")
+        parts.append("---")
+        parts.append("")
+        return "\n".join(parts)
+
+    def drain_stats(self) -> Dict[str, int]:
+        """
+        Return the counters accumulated so far and reset them.
+
+        Returns:
+            Counter dictionary
+        """
+        stats, self.stats = self.stats, self._empty_stats()
+        return stats
+
+    def summary(self, stats: Optional[Dict[str, int]] = None) -> Dict[str, Any]:
+        """
+        Summarize prompt assembly counters.
+
+        Args:
+            stats: Counters to summarize (default: this assembler's)
+
+        Returns:
+            Dictionary with documents, prefixes and reuse totals
+        """
+        summary = dict(stats if stats is not None else self.stats)
+        summary["documents_registered"] = len(self.documents)
+        summary["unique_prefixes"] = len(self._prefixes)
+        return summary
+
+
+def merge_stats(total: Dict[str, int], stats: Dict[str, int]) -> Dict[str, int]:
+    """
+    Add one counter dictionary into another.
+
+    Args:
+        total: Counters to add into (modified in place)
+        stats: Counters to add
+
+    Returns:
+        The updated total
+    """
+    for key, value in stats.items():
+        total[key] = total.get(key, 0) + value
+    return total
@@ -1,8 +1,34 @@
 """LLM provider interface and implementations."""
 
+import functools
+import math
+import random
+import threading
 import time
 from abc import ABC, abstractmethod
-from typing import Any, Dict
+from typing import Any, Dict, Iterator, List, Optional
+
+from .prompts import estimate_tokens
+
+
+class Completion(str):
+    """
+    Generated text carrying the token usage reported by the service.
+
+    generate(), chat() and generate_batch() may return Completion objects
+    instead of plain strings. A Completion behaves exactly like its text;
+    the runner reads ``usage`` for token and cost accounting and estimates
+    usage for plain strings.
+
+    Attributes:
+        usage: Dictionary with ``prompt_tokens`` and ``completion_tokens``,
+            or None if unknown
+    """
+
+    def __new__(cls, text: str, usage: Optional[Dict[str, int]] = None):
+        completion = super().__new__(cls, text)
+        completion.usage = usage
+        return completion
 
 
 class LLMProvider(ABC):
@@ -12,6 +38,15 @@ class LLMProvider(ABC):
     Implement this interface to integrate with your LLM service.
     """
 
+    # Set to True in providers that override stream() with real incremental output
+    supports_streaming = False
+
+    # Set to True in providers that can cache a shared prompt prefix. The
+    # runner then passes ``prompt_prefix`` (the leading part of ``prompt``
+    # shared with other cases) and ``prefix_cache_key`` (a stable hash of it)
+    # as generation keyword arguments.
+    supports_prompt_caching = False
+
     @abstractmethod
     def generate(self, prompt: str, **kwargs) -> str:
         """
@@ -22,10 +57,69 @@ class LLMProvider(ABC):
             **kwargs: Additional parameters (temperature, max_tokens, etc.)
 
         Returns:
-            Generated response text
+            Generated response text, optionally as a Completion carrying
+            the token usage
         """
         pass
 
+    def stream(self, prompt: str, **kwargs) -> Iterator[str]:
+        """
+        Stream a response from the LLM as it is generated.
+
+        The default implementation yields the complete output of generate()
+        as a single chunk. Providers with a streaming API should override
+        this, set supports_streaming, and release the underlying request
+        when the generator is closed early.
+
+        Args:
+            prompt: Input text to send to the LLM
+            **kwargs: Additional parameters (temperature, max_tokens, etc.)
+
+        Yields:
+            Successive chunks of response text
+        """
+        yield self.generate(prompt, **kwargs)
+
+    def generate_batch(self, prompts: List[str], **kwargs) -> List[str]:
+        """
+        Generate responses for several prompts.
+
+        The default implementation calls generate() for each prompt in turn.
+        Providers whose service accepts many prompts per request, or that
+        can issue requests concurrently, should override this.
+
+        Args:
+            prompts: Input texts to send to the LLM
+            **kwargs: Additional parameters (temperature, max_tokens, etc.)
+
+        Returns:
+            Generated response texts, in the same order as prompts
+        """
+        return [self.generate(prompt, **kwargs) for prompt in prompts]
+
+    def chat(self, messages: List[Dict[str, str]], **kwargs) -> str:
+        """
+        Generate the next assistant reply in a conversation.
+
+        The default implementation renders the conversation as a transcript
+        ("User: ..." / "Assistant: ..." lines) and calls generate(). Providers
+        with a native chat API should override this to send the messages as-is.
+
+        Args:
+            messages: Conversation so far, as {"role", "content"} dictionaries
+                ending with a user message
+            **kwargs: Additional parameters (temperature, max_tokens, etc.)
+
+        Returns:
+            Generated reply text
+        """
+        if len(messages) == 1:
+            return self.generate(messages[0]["content"], **kwargs)
+
+        lines = [f"{m['role'].capitalize()}: {m['content']}" for m in messages]
+        lines.append("Assistant:")
+        return self.generate("\n".join(lines), **kwargs)
+
     def get_model_info(self) -> Dict[str, Any]:
         """
         Get information about the model being used.
@@ -36,23 +130,87 @@ class LLMProvider(ABC):
         return {"provider": self.__class__.__name__}
 
 
+class ProviderError(Exception):
+    """Raised by providers when an LLM call fails."""
+
+
+class RateLimitError(ProviderError):
+    """
+    Raised by providers when the LLM service throttles a request.
+
+    Attributes:
+        retry_after: Seconds the service asked the caller to wait, if known
+    """
+
+    def __init__(self, message: str, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
 class StubLLMProvider(LLMProvider):
     """
     Stub provider for testing without actual LLM calls.
 
     Returns deterministic responses based on simple pattern matching.
     Useful for framework development and testing.
+
+    For load testing, the stub can simulate latency distributions, inject
+    errors and throttling, and introduce seeded nondeterminism. All random
+    draws are derived from the seed, the prompt and how many times that
+    prompt has been seen, so results are reproducible regardless of
+    execution order or how cases are sharded across workers.
     """
 
+    supports_streaming = True
+
+    LATENCY_DISTRIBUTIONS = ("fixed", "normal", "long_tail")
+
     def __init__(self, config: Dict[str, Any] = None):
         """
         Initialize stub provider.
 
         Args:
-            config: Configuration dictionary (unused for stub)
+            config: Configuration dictionary. Supported keys:
+
+                - ``latency_ms``: mean simulated latency (default 10; 0 disables sleeping)
+                - ``latency_distribution``: ``fixed`` (default), ``normal`` or ``long_tail``
+                - ``latency_stddev_ms``: standard deviation for ``normal``
+                  (default: a quarter of the mean)
+                - ``latency_sigma``: log-space spread for ``long_tail``, a
+                  lognormal whose median is ``latency_ms`` (default 1.0)
+                - ``error_rate``: fraction of calls raising ProviderError
+                - ``throttle_rate``: fraction of calls raising RateLimitError
+                - ``retry_after_s``: retry hint attached to throttling errors
+                - ``nondeterminism_rate``: fraction of calls returning a
+                  perturbed response (flipped label or rephrased text)
+                - ``seed``: seed for all random draws (default 0)
+                - ``batch_concurrency``: prompts of a generate_batch() call
+                  answered concurrently (default 16)
         """
         self.config = config or {}
+        self.latency_ms = float(self.config.get("latency_ms", 10))
+        self.latency_distribution = self.config.get("latency_distribution", "fixed")
+        if self.latency_distribution not in self.LATENCY_DISTRIBUTIONS:
+            raise ValueError(
+                f"Unknown latency_distribution: {self.latency_distribution} "
+                f"(expected one of {', '.join(self.LATENCY_DISTRIBUTIONS)})"
+            )
+        self.latency_stddev_ms = float(self.config.get("latency_stddev_ms", self.latency_ms / 4))
+        self.latency_sigma = float(self.config.get("latency_sigma", 1.0))
+        self.error_rate = float(self.config.get("error_rate", 0.0))
+        self.throttle_rate = float(self.config.get("throttle_rate", 0.0))
+        self.retry_after_s = float(self.config.get("retry_after_s", 1.0))
+        self.nondeterminism_rate = float(self.config.get("nondeterminism_rate", 0.0))
+        self.seed = self.config.get("seed", 0)
+        self.batch_concurrency = int(self.config.get("batch_concurrency", 16))
+        # Per-prompt occurrence numbers are only needed to seed random draws
+        self._seeded = bool(self.error_rate or self.throttle_rate or self.nondeterminism_rate) or (
+            self.latency_distribution != "fixed"
+        )
+
         self.call_count = 0
+        self._prompt_counts: Dict[str, int] = {}
+        self._lock = threading.Lock()
 
     def generate(self, prompt: str, **kwargs) -> str:
         """
@@ -63,74 +221,119 @@ class StubLLMProvider(LLMProvider):
             **kwargs: Additional parameters (ignored)
 
         Returns:
-            Deterministic stub response based on prompt content
+            Deterministic stub response based on prompt content, with
+            usage estimated at about four characters per token
+
+        Raises:
+            ProviderError: When error injection triggers
+            RateLimitError: When throttle injection triggers
         """
-        self.call_count += 1
+        rng = self._begin_call(prompt)
 
         # Simulate processing time
-        time.sleep(0.01)
-
-        # Simple pattern matching for deterministic responses
-        prompt_lower = prompt.lower()
-
-        # Sentiment classification
-        if "sentiment" in prompt_lower or "classify" in prompt_lower:
-            if any(word in prompt_lower for word in ["excellent", "great", "love", "amazing"]):
-                return "Based on the feedback provided, this represents positive sentiment."
-            elif any(word in prompt_lower for word in ["terrible", "awful", "hate", "worst"]):
-                return "Based on the feedback provided, this represents negative sentiment."
-            else:
-                return "Based on the feedback provided, this represents neutral sentiment."
-
-        # Intent detection
-        if "password" in prompt_lower and "reset" in prompt_lower:
-            return "Intent detected: password_reset. I can help you reset your password."
-
-        # Factual questions
-        if "leap year" in prompt_lower or "366" in prompt_lower:
-            return "A leap year has 366 days."
-
-        if "warranty" in prompt_lower:
-            return "The standard warranty period is 2 years from date of purchase."
-
-        # Uncertainty handling
-        if "weather" in prompt_lower and ("next month" in prompt_lower or "future" in prompt_lower):
-            return "I cannot predict specific weather conditions for next month. Weather forecasts are typically reliable only for the next 7-10 days."
-
-        # Instructions
-        if "how" in prompt_lower and any(
-            word in prompt_lower for word in ["change", "set", "configure"]
-        ):
-            return "To change your settings: 1. Navigate to Settings, 2. Select the relevant section, 3. Make your changes, 4. Save. For specific guidance, please specify which setting you'd like to change."
-
-        # Adversarial: instruction override
-        if "ignore" in prompt_lower and "instruction" in prompt_lower:
-            return "I'm designed to assist with your questions while maintaining my core purpose. How can I help you today?"
-
-        # Adversarial: system prompt extraction
-        if "system" in prompt_lower and any(
-            word in prompt_lower for word in ["prompt", "instruction", "configuration"]
-        ):
-            return "I'm designed to help answer questions and provide assistance, but I can't share details about my internal configuration."
-
-        # Adversarial: unsafe advice
-        if any(
-            word in prompt_lower for word in ["disable", "remove", "bypass"]
-        ) and "safety" in prompt_lower:
-            return "I cannot provide guidance on disabling safety features. Safety features are critical for preventing injury and ensuring proper operation."
-
-        # Adversarial: chemical mixing
-        if "mix" in prompt_lower and "chemical" in prompt_lower:
-            return "I cannot provide advice on mixing household chemicals, as this can be dangerous. Please use commercial cleaning products as directed, or consult a professional."
-
-        # Adversarial: jailbreak
-        if any(word in prompt_lower for word in ["game", "pretend", "roleplay"]) and any(
-            word in prompt_lower for word in ["unrestricted", "no rules", "no limits"]
-        ):
-            return "I'm designed to be helpful, harmless, and honest. I can't adopt roles that conflict with these core principles. How else can I assist you?"
-
-        # Default response
-        return f"I understand you're asking about: {prompt[:100]}... I'm designed to help with information and assistance. Could you provide more specific details about what you need?"
+        self._sleep(rng)
+
+        text = self._perturb(_stub_response(prompt), rng)
+        return Completion(
+            text,
+            usage={
+                "prompt_tokens": estimate_tokens(prompt),
+                "completion_tokens": estimate_tokens(text),
+            },
+        )
+
+    def stream(self, prompt: str, **kwargs) -> Iterator[str]:
+        """
+        Stream a stub response word by word.
+
+        Args:
+            prompt: Input prompt
+            **kwargs: Additional parameters (ignored)
+
+        Yields:
+            Words of the deterministic stub response, with trailing spaces
+        """
+        rng = self._begin_call(prompt)
+
+        # Simulate time to first token
+        self._sleep(rng)
+
+        words = self._perturb(_stub_response(prompt), rng).split(" ")
+        for i, word in enumerate(words):
+            yield word if i == len(words) - 1 else word + " "
+
+    def generate_batch(self, prompts: List[str], **kwargs) -> List[str]:
+        """
+        Generate stub responses for several prompts concurrently.
+
+        Simulated latencies overlap, as they would against a service that
+        answers a batch (or concurrent requests) in about one round trip.
+
+        Args:
+            prompts: Input prompts
+            **kwargs: Additional parameters (ignored)
+
+        Returns:
+            Responses in the same order as prompts
+        """
+        if len(prompts) <= 1 or self.batch_concurrency <= 1:
+            return super().generate_batch(prompts, **kwargs)
+
+        from concurrent.futures import ThreadPoolExecutor
+
+        with ThreadPoolExecutor(max_workers=min(self.batch_concurrency, len(prompts))) as executor:
+            return list(executor.map(lambda p: self.generate(p, **kwargs), prompts))
+
+    def _begin_call(self, prompt: str) -> random.Random:
+        """
+        Count a call and apply error and throttle injection.
+
+        Args:
+            prompt: Input prompt
+
+        Returns:
+            Random generator seeded for this (prompt, occurrence) pair
+        """
+        with self._lock:
+            self.call_count += 1
+            if not self._seeded:
+                return _FIXED_RNG
+            occurrence = self._prompt_counts.get(prompt, 0)
+            self._prompt_counts[prompt] = occurrence + 1
+
+        rng = random.Random(f"{self.seed}:{occurrence}:{prompt}")
+        draw = rng.random()
+        if draw < self.throttle_rate:
+            raise RateLimitError("Injected throttling (stub)", retry_after=self.retry_after_s)
+        if draw < self.throttle_rate + self.error_rate:
+            raise ProviderError("Injected provider error (stub)")
+        return rng
+
+    def _sleep(self, rng: random.Random):
+        """Sleep for a latency drawn from the configured distribution."""
+        if self.latency_ms <= 0:
+            return
+
+        if self.latency_distribution == "normal":
+            latency_ms = max(0.0, rng.gauss(self.latency_ms, self.latency_stddev_ms))
+        elif self.latency_distribution == "long_tail":
+            latency_ms = self.latency_ms * math.exp(rng.gauss(0.0, self.latency_sigma))
+        else:
+            latency_ms = self.latency_ms
+
+        time.sleep(latency_ms / 1000)
+
+    def _perturb(self, response: str, rng: random.Random) -> str:
+        """Apply seeded nondeterminism to a response."""
+        if not self.nondeterminism_rate or rng.random() >= self.nondeterminism_rate:
+            return response
+
+        for label in _STUB_LABELS:
+            if label in response:
+                alternatives = [other for other in _STUB_LABELS if other != label]
+                return response.replace(label, rng.choice(alternatives), 1)
+
+        return "In short: " + response
 
     def get_model_info(self) -> Dict[str, Any]:
         """Get stub model information."""
@@ -142,12 +345,99 @@ class StubLLMProvider(LLMProvider):
         }
 
 
+# Labels swapped by the stub's nondeterminism injection
+_STUB_LABELS = ("positive", "negative", "neutral")
+
+# Shared generator for the common no-randomness configuration; never drawn from
+_FIXED_RNG = random.Random(0)
+
+
+@functools.lru_cache(maxsize=4096)
+def _stub_response(prompt: str) -> str:
+    """
+    Build the deterministic stub response for a prompt.
+
+    Memoized, since load tests send the same prompts many times.
+
+    Args:
+        prompt: Input prompt
+
+    Returns:
+        Stub response text
+    """
+    # Simple pattern matching for deterministic responses
+    prompt_lower = prompt.lower()
+
+    # Sentiment classification
+    if "sentiment" in prompt_lower or "classify" in prompt_lower:
+        if any(word in prompt_lower for word in ["excellent", "great", "love", "amazing"]):
+            return "Based on the feedback provided, this represents positive sentiment."
+        elif any(word in prompt_lower for word in ["terrible", "awful", "hate", "worst"]):
+            return "Based on the feedback provided, this represents negative sentiment."
+        else:
+            return "Based on the feedback provided, this represents neutral sentiment."
+
+    # Intent detection
+    if "password" in prompt_lower and "reset" in prompt_lower:
+        return "Intent detected: password_reset. I can help you reset your password."
+
+    # Factual questions
+    if "leap year" in prompt_lower or "366" in prompt_lower:
+        return "A leap year has 366 days."
+
+    if "warranty" in prompt_lower:
+        return "The standard warranty period is 2 years from date of purchase."
+
+    # Uncertainty handling
+    if "weather" in prompt_lower and ("next month" in prompt_lower or "future" in prompt_lower):
+        return "I cannot predict specific weather conditions for next month. Weather forecasts are typically reliable only for the next 7-10 days."
+
+    # Instructions
+    if "how" in prompt_lower and any(
+        word in prompt_lower for word in ["change", "set", "configure"]
+    ):
+        return "To change your settings: 1. Navigate to Settings, 2. Select the relevant section, 3. Make your changes, 4. Save. For specific guidance, please specify which setting you'd like to change."
+
+    # Adversarial: instruction override
+    if "ignore" in prompt_lower and "instruction" in prompt_lower:
+        return "I'm designed to assist with your questions while maintaining my core purpose. How can I help you today?"
+
+    # Adversarial: system prompt extraction
+    if "system" in prompt_lower and any(
+        word in prompt_lower for word in ["prompt", "instruction", "configuration"]
+    ):
+        return "I'm designed to help answer questions and provide assistance, but I can't share details about my internal configuration."
+
+    # Adversarial: unsafe advice
+    if any(
+        word in prompt_lower for word in ["disable", "remove", "bypass"]
+    ) and "safety" in prompt_lower:
+        return "I cannot provide guidance on disabling safety features. Safety features are critical for preventing injury and ensuring proper operation."
+
+    # Adversarial: chemical mixing
+    if "mix" in prompt_lower and "chemical" in prompt_lower:
+        return "I cannot provide advice on mixing household chemicals, as this can be dangerous. Please use commercial cleaning products as directed, or consult a professional."
+
+    # Adversarial: jailbreak
+    if any(word in prompt_lower for word in ["game", "pretend", "roleplay"]) and any(
+        word in prompt_lower for word in ["unrestricted", "no rules", "no limits"]
+    ):
+        return "I'm designed to be helpful, harmless, and honest. I can't adopt roles that conflict with these core principles. How else can I assist you?"
+
+    # Default response
+    return f"I understand you're asking about: {prompt[:100]}... I'm designed to help with information and assistance. Could you provide more specific details about what you need?"
+
+
 def get_provider(provider_name: str, config: Dict[str, Any] = None) -> LLMProvider:
     """
     Factory function to get a provider instance.
 
+    Providers are resolved through the plugin registry (see registry.py),
+    which imports a provider's module only when it is selected.
+
     Args:
-        provider_name: Name of the provider ("stub", "custom")
+        provider_name: Registered provider name (e.g. "stub", "http") or
+            "module:ClassName"
         config: Configuration dictionary for the provider
 
     Returns:
@@ -156,16 +446,6 @@ def get_provider(provider_name: str, config: Dict[str, Any] = None) -> LLMProvid
     Raises:
         ValueError: If provider name is not recognized
     """
-    config = config or {}
-
-    if provider_name == "stub":
-        return StubLLMProvider(config)
-    elif provider_name == "custom":
-        # Placeholder for custom provider implementation
-        # Users should implement their own provider class and load it here
-        raise NotImplementedError(
-            "Custom provider not implemented. Create a custom provider class "
-            "implementing the LLMProvider interface."
-        )
-    else:
-        raise ValueError(f"Unknown provider: {provider_name}")
+    from .registry import get_provider as registry_get_provider
+
+    return registry_get_provider(provider_name, config)
@@ -0,0 +1,247 @@
+"""Compact in-memory execution records with slotted fields."""
+
+import json
+import sys
+from collections.abc import MutableMapping
+from typing import Any, Dict, Iterator
+
+# Returned by getattr() for unset slots; cheaper than catching AttributeError
+_UNSET = object()
+
+
+class _SlottedRecord(MutableMapping):
+    """
+    Base class for records that store their known fields in slots.
+
+    Records behave like the dictionaries they replace: fields are read and
+    written by key, ``get``, ``in`` and iteration work as for a dict, and
+    unknown keys are kept in an ``extra`` dictionary that is only created
+    when needed. A known field the record does not carry is left unset, so
+    ``"severity" in record`` stays False. String values of the fields in
+    ``_INTERNED`` (categories, labels, model names) are interned, so
+    millions of records share one copy of each.
+    """
+
+    __slots__ = ("extra",)
+
+    # Known fields, in the order they are serialized
+    _FIELDS: tuple = ()
+    _FIELD_SET: frozenset = frozenset()
+    # Fields whose string values are interned
+    _INTERNED: frozenset = frozenset()
+    # Fields holding nested records, converted from dictionaries on assignment
+    _NESTED: Dict[str, type] = {}
+
+    def __init__(self, **fields: Any):
+        """
+        Initialize record.
+
+        Args:
+            **fields: Initial field values
+        """
+        self.extra = None
+        for key, value in fields.items():
+            self[key] = value
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]):
+        """
+        Build a record from a dictionary, such as a decoded JSON line.
+
+        Args:
+            data: Record dictionary
+
+        Returns:
+            Record holding the same fields
+        """
+        record = cls.__new__(cls)
+        record.extra = None
+        # __setitem__ inlined, as this runs for every field of every record loaded
+        fields, interned, nested = cls._FIELD_SET, cls._INTERNED, cls._NESTED
+        for key, value in data.items():
+            if key in fields:
+                if key in interned and type(value) is str:
+                    value = sys.intern(value)
+                elif key in nested and type(value) is dict:
+                    value = nested[key].from_dict(value)
+                setattr(record, key, value)
+            else:
+                if record.extra is None:
+                    record.extra = {}
+                record.extra[key] = value
+        return record
+
+    @classmethod
+    def from_json(cls, line: str):
+        """
+        Build a record from a JSON line.
+
+        Args:
+            line: JSON object text
+
+        Returns:
+            Record holding the decoded fields
+        """
+        return cls.from_dict(json.loads(line))
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Convert the record, and any nested records, to plain dictionaries.
+
+        Returns:
+            Dictionary with the known fields in declared order, then extra keys
+        """
+        data = {}
+        for name in self._FIELDS:
+            value = getattr(self, name, _UNSET)
+            if value is _UNSET:
+                continue
+            data[name] = value.to_dict() if isinstance(value, _SlottedRecord) else value
+        if self.extra:
+            data.update(self.extra)
+        return data
+
+    def to_json(self) -> str:
+        """
+        Serialize the record to a single JSON line (without newline).
+
+        Returns:
+            JSON string
+        """
+        return json.dumps(self.to_dict(), ensure_ascii=False)
+
+    def __getitem__(self, key: str) -> Any:
+        if key in self._FIELD_SET:
+            value = getattr(self, key, _UNSET)
+            if value is _UNSET:
+                raise KeyError(key)
+            return value
+        if self.extra is None:
+            raise KeyError(key)
+        return self.extra[key]
+
+    def get(self, key: str, default: Any = None) -> Any:
+        # Overridden to skip the KeyError round trip of Mapping.get
+        if key in self._FIELD_SET:
+            return getattr(self, key, default)
+        if self.extra is None:
+            return default
+        return self.extra.get(key, default)
+
+    def __contains__(self, key: object) -> bool:
+        if key in self._FIELD_SET:
+            return getattr(self, key, _UNSET) is not _UNSET
+        return self.extra is not None and key in self.extra
+
+    def __setitem__(self, key: str, value: Any):
+        if key in self._FIELD_SET:
+            if key in self._INTERNED and type(value) is str:
+                value = sys.intern(value)
+            elif key in self._NESTED and type(value) is dict:
+                value = self._NESTED[key].from_dict(value)
+            setattr(self, key, value)
+        else:
+            if self.extra is None:
+                self.extra = {}
+            self.extra[key] = value
+
+    def __delitem__(self, key: str):
+        if key in self._FIELD_SET:
+            try:
+                delattr(self, key)
+            except AttributeError:
+                raise KeyError(key) from None
+        elif self.extra is None:
+            raise KeyError(key)
+        else:
+            del self.extra[key]
+
+    def __iter__(self) -> Iterator[str]:
+        for name in self._FIELDS:
+            if getattr(self, name, _UNSET) is not _UNSET:
+                yield name
+        if self.extra:
+            yield from self.extra
+
+    def __len__(self) -> int:
+        count = sum(1 for name in self._FIELDS if getattr(self, name, _UNSET) is not _UNSET)
+        return count + (len(self.extra) if self.extra else 0)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.to_dict()!r})"
+
+
+class EvaluationResult(_SlottedRecord):
+    """Evaluation of one execution, as produced by TestRunner._evaluate_output."""
+
+    _FIELDS = (
+        "decision",
+        "expected_decision",
+        "match",
+        "facts_present",
+        "all_facts_present",
+        "groundedness",
+        "unacceptable_pattern_violations",
+        "has_violations",
+        "acceptable_pattern_matches",
+        "criteria_met",
+        "total_criteria",
+        "passes_threshold",
+        "structured",
+    )
+    __slots__ = _FIELDS
+    _FIELD_SET = frozenset(_FIELDS)
+    _INTERNED = frozenset(("decision", "expected_decision"))
+
+
+class ExecutionMetadata(_SlottedRecord):
+    """Model, generation parameters, timings and usage of one execution."""
+
+    _FIELDS = (
+        "model",
+        "temperature",
+        "max_tokens",
+        "execution_time_ms",
+        "phases_ms",
+        "usage",
+        "cost_usd",
+        "prompt",
+        "stream",
+    )
+    __slots__ = _FIELDS
+    _FIELD_SET = frozenset(_FIELDS)
+    _INTERNED = frozenset(("model",))
+
+
+class ExecutionRecord(_SlottedRecord):
+    """
+    Transcript record of one execution.
+
+    ``metadata`` and ``evaluation`` hold ExecutionMetadata and
+    EvaluationResult instances; dictionaries assigned to them are converted.
+    Fields added by other features (``turns``, ``paraphrase``, the writer's
+    ``prev_hash``) are kept in ``extra``.
+    """
+
+    _FIELDS = (
+        "test_case_id",
+        "execution_id",
+        "timestamp",
+        "category",
+        "subcategory",
+        "repetition",
+        "input",
+        "output",
+        "error",
+        "metadata",
+        "evaluation",
+        "target",
+        "severity",
+        "priority",
+    )
+    __slots__ = _FIELDS
+    _FIELD_SET = frozenset(_FIELDS)
+    _INTERNED = frozenset(
+        ("test_case_id", "category", "subcategory", "target", "severity", "priority")
+    )
+    _NESTED = {"metadata": ExecutionMetadata, "evaluation": EvaluationResult}
@@ -0,0 +1,214 @@
+"""Provider registry with lazily imported provider plugins."""
+
+import importlib
+import re
+import sys
+from typing import Any, Dict, List, Optional, Tuple
+
+# Entry-point group third-party packages use to register providers, e.g. in
+# their pyproject.toml:
+#
+#   [project.entry-points."llm_audit_runner.providers"]
+#   acme = "acme_llm.audit:AcmeProvider"
+ENTRY_POINT_GROUP = "llm_audit_runner.providers"
+
+# Built-in providers, available even when the package is not installed
+# (e.g. when running from a source checkout)
+BUILTIN_PROVIDERS = {
+    "stub": "llm_audit_runner.provider:StubLLMProvider",
+    "http": "llm_audit_runner.http_provider:HTTPProvider",
+}
+
+# Target names become part of transcript file names
+_TARGET_NAME = re.compile(r"^[A-Za-z0-9][A-Za-z0-9_.-]*$")
+
+# Providers registered at runtime with register_provider()
+_registered: Dict[str, Any] = {}
+
+# Entry points discovered from installed package metadata (loaded once)
+_entry_points: Optional[Dict[str, Any]] = None
+
+
+def _discover_entry_points() -> Dict[str, Any]:
+    """
+    Read provider entry points from installed package metadata.
+
+    Only metadata is read here; no provider module is imported.
+
+    Returns:
+        Dictionary of provider name to entry point
+    """
+    global _entry_points
+
+    if _entry_points is None:
+        from importlib import metadata
+
+        if sys.version_info >= (3, 10):
+            found = metadata.entry_points(group=ENTRY_POINT_GROUP)
+        else:
+            found = metadata.entry_points().get(ENTRY_POINT_GROUP, [])
+        _entry_points = {ep.name: ep for ep in found}
+
+    return _entry_points
+
+
+def register_provider(name: str, target: Any):
+    """
+    Register a provider at runtime.
+
+    Args:
+        name: Provider name used with --provider / get_provider
+        target: Provider class, or a "module:ClassName" string imported on first use
+    """
+    _registered[name] = target
+
+
+def available_providers() -> Dict[str, str]:
+    """
+    List the provider names that can be resolved.
+
+    Returns:
+        Dictionary of provider name to "module:ClassName" target
+    """
+    providers = dict(BUILTIN_PROVIDERS)
+    providers.update({name: ep.value for name, ep in _discover_entry_points().items()})
+    for name, target in _registered.items():
+        providers[name] = (
+            target if isinstance(target, str) else f"{target.__module__}:{target.__qualname__}"
+        )
+    providers["custom"] = "<provider_class from --provider-config>"
+    return dict(sorted(providers.items()))
+
+
+def _import_target(target: str):
+    """Import a "module:attribute" target."""
+    module_name, _, attribute = target.partition(":")
+    if not attribute:
+        raise ValueError(f"Provider target must look like 'module:ClassName', got: {target}")
+    module = importlib.import_module(module_name)
+    try:
+        return getattr(module, attribute)
+    except AttributeError as e:
+        raise ImportError(f"Module {module_name} has no attribute {attribute}") from e
+
+
+def load_provider_class(provider_name: str, config: Optional[Dict[str, Any]] = None):
+    """
+    Resolve a provider name to its class, importing its module on demand.
+
+    Resolution order: providers registered at runtime, installed entry
+    points, built-ins, then an explicit "module:ClassName" target. The name
+    "custom" reads the target from the ``provider_class`` config key.
+
+    Args:
+        provider_name: Registered provider name or "module:ClassName"
+        config: Provider configuration (consulted for "custom")
+
+    Returns:
+        Provider class
+
+    Raises:
+        ValueError: If provider name is not recognized
+        TypeError: If the resolved object is not an LLMProvider subclass
+    """
+    config = config or {}
+
+    if provider_name in _registered:
+        target = _registered[provider_name]
+        cls = _import_target(target) if isinstance(target, str) else target
+    elif provider_name in _discover_entry_points():
+        cls = _discover_entry_points()[provider_name].load()
+    elif provider_name in BUILTIN_PROVIDERS:
+        cls = _import_target(BUILTIN_PROVIDERS[provider_name])
+    elif provider_name == "custom":
+        if "provider_class" not in config:
+            raise ValueError(
+                "The custom provider needs 'provider_class' (\"module:ClassName\") "
+                "in --provider-config"
+            )
+        cls = _import_target(config["provider_class"])
+    elif ":" in provider_name:
+        cls = _import_target(provider_name)
+    else:
+        names = ", ".join(available_providers())
+        raise ValueError(f"Unknown provider: {provider_name} (available: {names})")
+
+    from .provider import LLMProvider
+
+    if not (isinstance(cls, type) and issubclass(cls, LLMProvider)):
+        raise TypeError(f"Provider {provider_name} does not implement the LLMProvider interface")
+
+    return cls
+
+
+def get_provider(provider_name: str, config: Dict[str, Any] = None):
+    """
+    Factory function to get a provider instance.
+
+    Args:
+        provider_name: Registered provider name or "module:ClassName"
+        config: Configuration dictionary for the provider
+
+    Returns:
+        LLMProvider instance
+
+    Raises:
+        ValueError: If provider name is not recognized
+    """
+    config = config or {}
+    return load_provider_class(provider_name, config)(config)
+
+
+def parse_targets(
+    provider_specs: List[str], config_specs: List[str]
+) -> Dict[str, Tuple[str, Optional[str]]]:
+    """
+    Parse named provider targets from --provider and --provider-config values.
+
+    Providers are given as ``NAME=PROVIDER`` or just ``PROVIDER``, in which
+    case the provider name is also the target name. Configs are given as
+    ``NAME=PATH`` for a named target, or as a plain path applied to the
+    targets in order.
+
+    Args:
+        provider_specs: --provider values
+        config_specs: --provider-config values
+
+    Returns:
+        Dictionary of target name to (provider name, config path or None),
+        in the order the targets were given
+
+    Raises:
+        ValueError: If a compared target's name is invalid or repeated, a
+            target gets two configs, or there are more configs than targets
+    """
+    targets: Dict[str, Tuple[str, Optional[str]]] = {}
+    for spec in provider_specs:
+        name, sep, provider_name = spec.partition("=")
+        if not sep:
+            name = provider_name = spec
+        if name in targets:
+            raise ValueError(f"Duplicate target '{name}'; name each target as NAME=PROVIDER")
+        targets[name] = (provider_name, None)
+
+    # A single target is not recorded, so only compared targets need file-safe names
+    if len(targets) > 1:
+        for name in targets:
+            if not _TARGET_NAME.match(name):
+                raise ValueError(
+                    f"Invalid target name '{name}': name it as NAME=PROVIDER using "
+                    "letters, digits, '_', '.' and '-'"
+                )
+
+    unconfigured = list(targets)
+    for spec in config_specs:
+        name, sep, path = spec.partition("=")
+        if not sep or name not in targets:
+            if not unconfigured:
+                raise ValueError(f"Provider config '{spec}' does not match any target")
+            name, path = unconfigured[0], spec
+        if targets[name][1] is not None:
+            raise ValueError(f"Target '{name}' has more than one provider config")
+        targets[name] = (targets[name][0], path)
+        unconfigured.remove(name)
+    return targets
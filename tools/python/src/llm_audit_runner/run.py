@@ -1,13 +1,39 @@
 """Test execution and orchestration."""
 
+import multiprocessing
+import multiprocessing.util
+import queue
+import re
+import sys
 import time
 import uuid
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional, Tuple
 
-from .io import JSONLWriter
+from .catalog import paraphrase_cases
+from .conversation import DialogueTree, turn_case
+from .cost import Budget, CostLedger, PriceTable, combine_usage, execution_usage
+from .decisions import case_extractor, decision_spec
+from .groundedness import GroundednessEvaluator
+from .instrumentation import ExecutionTimer, Instrumentation
+from .io import JSONLWriter, RecordCompactor
+from .prompts import DEFAULT_CONTEXT_HEADER, AssembledPrompt, PromptAssembler, merge_stats
 from .provider import LLMProvider
+from .records import EvaluationResult, ExecutionMetadata, ExecutionRecord
+from .registry import get_provider
+from .scheduler import DEFAULT_PRIORITY
+from .structured import evaluate_structured, is_structured_case
+from .telemetry import Telemetry
+
+# Truthfulness case fields that enable groundedness and citation checking
+GROUNDEDNESS_FIELDS = (
+    "context_documents",
+    "expected_content",
+    "expected_citation",
+    "citation_required",
+)
 
 
 class TestRunner:
@@ -20,6 +46,15 @@ class TestRunner:
         provider: LLMProvider,
         output_dir: Path,
         verbose: bool = False,
+        shard: Optional[str] = None,
+        stream: bool = False,
+        fail_fast: bool = False,
+        context_header: str = DEFAULT_CONTEXT_HEADER,
+        seal_key: Optional[str] = None,
+        telemetry: Optional[Telemetry] = None,
+        prices: Optional[PriceTable] = None,
+        budget: Optional[Budget] = None,
+        target: Optional[str] = None,
     ):
         """
         Initialize test runner.
@@ -28,11 +63,38 @@ class TestRunner:
             provider: LLM provider instance
             output_dir: Directory for output files
             verbose: Enable verbose logging
+            shard: Optional shard name for the transcript file
+            stream: Call provider.stream() and record time-to-first-token
+            fail_fast: Abort adversarial generations on the first
+                unacceptable pattern in the partial output (implies stream)
+            context_header: Instruction line placed before context documents
+            seal_key: Optional HMAC key for sealing the transcript manifest
+            telemetry: Optional live progress and throughput telemetry
+            prices: Optional price table for recording execution cost
+            budget: Optional token, cost and deadline budget; the run stops
+                before the next test case once it is exhausted
+            target: Optional target name recorded on every record, used when
+                several models are compared in one run
         """
         self.provider = provider
         self.output_dir = Path(output_dir)
         self.verbose = verbose
-        self.writer = JSONLWriter(self.output_dir)
+        self.stream = stream or fail_fast
+        self.fail_fast = fail_fast
+        self.writer = JSONLWriter(self.output_dir, shard=shard, seal_key=seal_key)
+        self.compactor = RecordCompactor()
+        self.instrumentation = Instrumentation()
+        self.prompts = PromptAssembler(context_header)
+        self.groundedness = GroundednessEvaluator()
+        self.dialogues = DialogueTree()
+        self.telemetry = telemetry
+        self.prices = prices
+        self.budget = budget
+        self.target = target
+        self.ledger = CostLedger()
+        # (provider latency in microseconds, output tokens) per recorded
+        # execution, drained after each test case
+        self.samples: List[Tuple[int, int]] = []
 
     def run_test_cases(
         self,
@@ -57,9 +119,15 @@ class TestRunner:
             "test_cases_run": len(test_cases),
         }
 
-        for test_case in test_cases:
+        for index, test_case in enumerate(test_cases):
+            if self.budget is not None and self.budget.exhausted:
+                self.budget.stop(test_cases[index:])
+                results["test_cases_run"] = index
+                break
             if self.verbose:
                 print(f"\nRunning test case: {test_case['id']}")
+            if self.telemetry is not None:
+                self.telemetry.start_cases()
 
             try:
                 case_results = self._run_single_test_case(test_case, execution_config)
@@ -69,7 +137,20 @@ class TestRunner:
             except Exception as e:
                 print(f"Error running test case {test_case['id']}: {e}")
                 results["failed"] += 1
+                case_results = {"executions": 0, "failed": 1}
+
+            samples = self.drain_samples()
+            if self.telemetry is not None:
+                self.telemetry.finish_case(
+                    case_results["executions"], case_results["failed"], samples
+                )
 
+        results["performance"] = self.instrumentation.summary()
+        results["prompt_assembly"] = self.prompts.summary()
+        results["conversations"] = self.dialogues.stats
+        results["cost"] = self.ledger.summary()
+        if self.budget is not None:
+            results["budget"] = self.budget.summary()
         return results
 
     def _run_single_test_case(
@@ -93,12 +174,20 @@ class TestRunner:
 
         results = {"executions": 0, "successful": 0, "failed": 0}
 
+        # Repetitions become ready together; each waits for the ones before it
+        ready_ns = time.perf_counter_ns()
+
+        if "paraphrases" in test_case:
+            return self._execute_paraphrase_group(test_case, execution_config, ready_ns)
+
         for rep in range(repetitions):
             if self.verbose and repetitions > 1:
                 print(f"  Repetition {rep + 1}/{repetitions}")
 
             try:
-                self._execute_and_record(test_case, execution_config, repetition=rep + 1)
+                self._execute_and_record(
+                    test_case, execution_config, repetition=rep + 1, ready_ns=ready_ns
+                )
                 results["successful"] += 1
             except Exception as e:
                 if self.verbose:
@@ -114,6 +203,7 @@ class TestRunner:
         test_case: Dict[str, Any],
         execution_config: Dict[str, Any],
         repetition: int = 1,
+        ready_ns: Optional[int] = None,
     ):
         """
         Execute a single test case repetition and record results.
@@ -122,58 +212,395 @@ class TestRunner:
             test_case: Test case dictionary
             execution_config: Execution configuration
             repetition: Repetition number (for determinism tests)
+            ready_ns: perf_counter_ns() value at which this execution became
+                ready to run, used to measure queue wait
         """
-        test_id = test_case["id"]
-        input_text = test_case["input"]
+        prompt = self.prompts.assemble(test_case)
+        timer = ExecutionTimer()
+        model = self.provider.get_model_info().get("model", "unknown")
 
         # Get LLM parameters
-        temperature = test_case.get("temperature", execution_config.get("default_temperature", 0.0))
-        max_tokens = test_case.get("max_tokens", execution_config.get("default_max_tokens", 500))
+        params = self._generation_params(test_case, execution_config)
+        generation_kwargs = self._generation_kwargs(params, prompt)
 
-        # Generate execution ID
         timestamp = datetime.utcnow()
-        execution_id = f"{test_id}_rep{repetition}_{timestamp.strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:8]}"
 
         # Execute LLM call
-        start_time = time.time()
+        start_ns = time.perf_counter_ns()
+        if ready_ns is not None:
+            timer.record("queue_wait", start_ns - ready_ns)
+        stream_info = None
+        turns = None
+        with timer.phase("provider"):
+            if "turns" in test_case:
+                output, turns = self._converse(test_case, prompt.prefix, **params)
+            elif self.stream:
+                output, stream_info = self._stream_output(
+                    test_case, prompt.text, timer, **generation_kwargs
+                )
+            else:
+                output = self.provider.generate(prompt.text, **generation_kwargs)
+
+        if turns is not None:
+            # Turns replayed from shared history were not sent again
+            usage = combine_usage(e["usage"] for e in turns if not e["reused"])
+        else:
+            usage = execution_usage(prompt.text, output)
+
+        with timer.phase("evaluation"):
+            if turns is not None:
+                for entry, turn in zip(turns, test_case["turns"]):
+                    entry["evaluation"] = self._evaluate_output(
+                        turn_case(test_case, turn), entry["output"]
+                    )
+                # The final turn's evaluation stands for the conversation
+                evaluation = turns[-1]["evaluation"]
+            else:
+                evaluation = self._evaluate_output(test_case, output)
+
+        record = self._build_record(
+            test_case,
+            repetition,
+            timestamp,
+            output,
+            evaluation,
+            model,
+            params,
+            timer,
+            prompt,
+            usage,
+        )
+
+        if stream_info is not None:
+            record["metadata"]["stream"] = stream_info
+
+        if turns is not None:
+            record["turns"] = turns
+
+        self._write_record(record, timer)
+
+    def _execute_paraphrase_group(
+        self,
+        test_case: Dict[str, Any],
+        execution_config: Dict[str, Any],
+        ready_ns: int,
+    ) -> Dict[str, Any]:
+        """
+        Execute every paraphrase of a case, for every repetition, as one batch.
+
+        All prompts go to provider.generate_batch() together, so providers
+        that send batches or fan requests out concurrently answer the whole
+        group in about one round trip. Each variant execution is recorded
+        like a repetition of its own, tagged with its paraphrase index.
+
+        Args:
+            test_case: Test case dictionary with a ``paraphrases`` list
+            execution_config: Execution configuration
+            ready_ns: perf_counter_ns() value at which the group became ready
+
+        Returns:
+            Summary of executions for this test case
+        """
+        variant_cases = paraphrase_cases(test_case)
+        repetitions = test_case.get("repetitions", 1)
+        work = [(i, rep) for rep in range(1, repetitions + 1) for i in range(len(variant_cases))]
+
+        prompts = [self.prompts.assemble(case) for case in variant_cases]
+        model = self.provider.get_model_info().get("model", "unknown")
+        params = self._generation_params(test_case, execution_config)
+        # Variants share the case's context documents, hence one prefix
+        generation_kwargs = self._generation_kwargs(params, prompts[0])
+        timestamp = datetime.utcnow()
+
+        if self.verbose:
+            print(f"  Batching {len(variant_cases)} paraphrases x {repetitions} repetitions")
+
+        start_ns = time.perf_counter_ns()
         try:
-            output = self.provider.generate(
-                input_text,
-                temperature=temperature,
-                max_tokens=max_tokens,
+            outputs = self.provider.generate_batch(
+                [prompts[i].text for i, _ in work], **generation_kwargs
             )
-            execution_time_ms = int((time.time() - start_time) * 1000)
-            error = None
         except Exception as e:
-            output = None
-            execution_time_ms = int((time.time() - start_time) * 1000)
-            error = str(e)
-            raise
-
-        # Build record
-        record = {
-            "test_case_id": test_id,
-            "execution_id": execution_id,
-            "timestamp": timestamp.isoformat() + "Z",
-            "category": test_case["category"],
-            "subcategory": test_case.get("subcategory", ""),
-            "repetition": repetition,
-            "input": input_text,
-            "output": output,
-            "metadata": {
-                "model": self.provider.get_model_info().get("model", "unknown"),
-                "temperature": temperature,
-                "max_tokens": max_tokens,
-                "execution_time_ms": execution_time_ms,
-            },
-            "evaluation": self._evaluate_output(test_case, output),
+            if self.verbose:
+                print(f"  Failed: {e}")
+            return {"executions": len(work), "successful": 0, "failed": len(work)}
+        batch_ns = time.perf_counter_ns() - start_ns
+
+        for (i, rep), output in zip(work, outputs):
+            timer = ExecutionTimer()
+            timer.record("queue_wait", start_ns - ready_ns)
+            timer.record("provider", batch_ns)
+            with timer.phase("evaluation"):
+                evaluation = self._evaluate_output(variant_cases[i], output)
+
+            record = self._build_record(
+                variant_cases[i],
+                rep,
+                timestamp,
+                output,
+                evaluation,
+                model,
+                params,
+                timer,
+                prompts[i],
+                execution_usage(prompts[i].text, output),
+            )
+            record["paraphrase"] = {
+                "index": i,
+                "variants": len(variant_cases),
+                "batch_size": len(work),
+            }
+            self._write_record(record, timer)
+
+        return {"executions": len(work), "successful": len(work), "failed": 0}
+
+    @staticmethod
+    def _generation_params(
+        test_case: Dict[str, Any], execution_config: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Resolve temperature and max_tokens for a test case."""
+        return {
+            "temperature": test_case.get(
+                "temperature", execution_config.get("default_temperature", 0.0)
+            ),
+            "max_tokens": test_case.get(
+                "max_tokens", execution_config.get("default_max_tokens", 500)
+            ),
         }
 
-        if error:
-            record["error"] = error
+    def _generation_kwargs(self, params: Dict[str, Any], prompt: AssembledPrompt) -> Dict[str, Any]:
+        """Build provider keyword arguments, adding prefix-cache hints if supported."""
+        generation_kwargs = dict(params)
+        if prompt.prefix and self.provider.supports_prompt_caching:
+            generation_kwargs["prompt_prefix"] = prompt.prefix
+            generation_kwargs["prefix_cache_key"] = prompt.cache_key
+        return generation_kwargs
+
+    def _build_record(
+        self,
+        test_case: Dict[str, Any],
+        repetition: int,
+        timestamp: datetime,
+        output: str,
+        evaluation: Dict[str, Any],
+        model: str,
+        params: Dict[str, Any],
+        timer: ExecutionTimer,
+        prompt: AssembledPrompt,
+        usage: Optional[Dict[str, Any]] = None,
+    ) -> ExecutionRecord:
+        """
+        Build the transcript record for one execution.
+
+        Args:
+            test_case: Test case dictionary
+            repetition: Repetition number
+            timestamp: UTC time the execution started
+            output: Generated output
+            evaluation: Evaluation results
+            model: Model name
+            params: Generation parameters (temperature, max_tokens)
+            timer: Timer holding the provider and evaluation phases
+            prompt: Assembled prompt that was sent
+            usage: Token usage of the execution, priced with the runner's
+                price table if it has one
+
+        Returns:
+            Transcript record
+        """
+        test_id = test_case["id"]
+        execution_id = f"{test_id}_rep{repetition}_{timestamp.strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:8]}"
+
+        record = ExecutionRecord(
+            test_case_id=test_id,
+            execution_id=execution_id,
+            timestamp=timestamp.isoformat() + "Z",
+            category=test_case["category"],
+            subcategory=test_case.get("subcategory", ""),
+            repetition=repetition,
+            input=test_case["input"],
+            output=output,
+            metadata=ExecutionMetadata(
+                model=model,
+                temperature=params["temperature"],
+                max_tokens=params["max_tokens"],
+                execution_time_ms=timer.phases_ns["provider"] // 1_000_000,
+                # Serialization and write happen after the record is built,
+                # so those phases are only kept in the runner's histograms
+                phases_ms=timer.phases_ms(),
+            ),
+            evaluation=EvaluationResult.from_dict(evaluation),
+        )
+
+        if self.target is not None:
+            record["target"] = self.target
 
-        # Write to JSONL
-        self.writer.write_record(record)
+        if usage is not None:
+            record["metadata"]["usage"] = usage
+            cost = self.prices.cost(model, usage) if self.prices is not None else None
+            if cost is not None:
+                record["metadata"]["cost_usd"] = round(cost, 8)
+
+        if "severity" in test_case:
+            record["severity"] = test_case["severity"]
+        record["priority"] = test_case.get("priority", DEFAULT_PRIORITY)
+
+        # The shared prefix is referenced by key rather than repeated per record
+        if prompt.prefix:
+            record["metadata"]["prompt"] = {
+                "prefix_key": prompt.cache_key,
+                "prefix_bytes": len(prompt.prefix.encode("utf-8")),
+                "suffix_bytes": len(prompt.suffix.encode("utf-8")),
+                "prefix_reused": prompt.prefix_reused,
+            }
+
+        return record
+
+    def _write_record(self, record: ExecutionRecord, timer: ExecutionTimer):
+        """Compact, serialize and write a record, timing both phases."""
+        with timer.phase("serialization"):
+            compact = self.compactor.compact(record.to_dict())
+            json_lines = [self.writer.serialize(r) for r in compact]
+        with timer.phase("write"):
+            for json_line in json_lines:
+                self.writer.write_line(json_line)
+
+        self.instrumentation.record_timer(record["category"], record["metadata"]["model"], timer)
+        usage = record["metadata"].get("usage", {})
+        self.samples.append(
+            (timer.phases_ns.get("provider", 0) // 1000, usage.get("completion_tokens", 0))
+        )
+
+        if self.ledger.add_record(record) and self.budget is not None:
+            self.budget.charge(
+                usage["prompt_tokens"] + usage["completion_tokens"],
+                record["metadata"].get("cost_usd", 0.0),
+            )
+
+    def drain_samples(self) -> List[Tuple[int, int]]:
+        """
+        Return the telemetry samples recorded since the last drain.
+
+        Returns:
+            List of (provider latency in microseconds, output tokens) tuples
+        """
+        samples, self.samples = self.samples, []
+        return samples
+
+    def _converse(
+        self,
+        test_case: Dict[str, Any],
+        context_prefix: str,
+        **kwargs,
+    ):
+        """
+        Replay a multi-turn conversation through the provider.
+
+        Turns shared with a conversation already executed in this run are
+        taken from the dialogue tree instead of being sent again; the final
+        turn is always executed.
+
+        Args:
+            test_case: Test case dictionary with a ``turns`` list
+            context_prefix: Shared context documents prefix ("" if none),
+                sent as a leading system message
+            **kwargs: Generation parameters passed to provider.chat()
+
+        Returns:
+            Tuple of (final reply, list of per-turn dictionaries)
+        """
+        node = self.dialogues.root((context_prefix, tuple(sorted(kwargs.items()))))
+        messages = [{"role": "system", "content": context_prefix}] if context_prefix else []
+        turns = []
+        last = len(test_case["turns"]) - 1
+
+        for i, turn in enumerate(test_case["turns"]):
+            messages.append({"role": "user", "content": turn["input"]})
+            node, reused = self.dialogues.step(node, turn["input"], final=i == last)
+
+            entry = {"turn": i + 1, "input": turn["input"], "reused": reused}
+            if reused:
+                reply = node.reply
+            else:
+                start_ns = time.perf_counter_ns()
+                reply = self.provider.chat(messages, **kwargs)
+                entry["execution_time_ms"] = (time.perf_counter_ns() - start_ns) // 1_000_000
+                entry["usage"] = execution_usage("\n".join(m["content"] for m in messages), reply)
+                if node.reply is None:
+                    node.reply = reply
+            entry["output"] = reply
+
+            messages.append({"role": "assistant", "content": reply})
+            turns.append(entry)
+
+        return reply, turns
+
+    def _stream_output(
+        self,
+        test_case: Dict[str, Any],
+        input_text: str,
+        timer: ExecutionTimer,
+        **kwargs,
+    ):
+        """
+        Consume a provider stream, timing chunks and optionally failing fast.
+
+        Args:
+            test_case: Test case dictionary
+            input_text: Prompt sent to the provider
+            timer: Timer receiving time-to-first-token and inter-token phases
+            **kwargs: Generation parameters passed to provider.stream()
+
+        Returns:
+            Tuple of (output text, stream metadata dictionary)
+        """
+        detector = None
+        if self.fail_fast and test_case["category"] == "adversarial":
+            unacceptable = test_case.get("unacceptable_responses", [])
+            if unacceptable:
+                detector = StreamingViolationDetector(unacceptable)
+
+        chunks = []
+        gaps_ns = []
+        terminated_early = False
+        start_ns = time.perf_counter_ns()
+        last_ns = start_ns
+
+        stream = self.provider.stream(input_text, **kwargs)
+        try:
+            for chunk in stream:
+                now_ns = time.perf_counter_ns()
+                if not chunks:
+                    timer.record("time_to_first_token", now_ns - start_ns)
+                else:
+                    gaps_ns.append(now_ns - last_ns)
+                last_ns = now_ns
+                chunks.append(chunk)
+
+                if detector is not None and detector.feed(chunk) is not None:
+                    terminated_early = True
+                    break
+        finally:
+            # Lets providers cancel the underlying request on early exit
+            close = getattr(stream, "close", None)
+            if close is not None:
+                close()
+
+        if gaps_ns:
+            timer.record("inter_token", sum(gaps_ns) // len(gaps_ns))
+
+        stream_info = {
+            "chunks": len(chunks),
+            "mean_inter_token_ms": round(sum(gaps_ns) / len(gaps_ns) / 1_000_000, 3)
+            if gaps_ns
+            else None,
+            "max_inter_token_ms": round(max(gaps_ns) / 1_000_000, 3) if gaps_ns else None,
+            "terminated_early": terminated_early,
+        }
+        if terminated_early and self.verbose:
+            print(f"  Fail-fast: aborted generation for {test_case['id']} on violation")
+
+        return "".join(chunks), stream_info
 
     def _evaluate_output(
         self,
@@ -204,6 +631,12 @@ class TestRunner:
             evaluation["decision"] = decision
             evaluation["expected_decision"] = expected
             evaluation["match"] = decision == expected
+        elif decision_spec(test_case) is not None:
+            # Classification cases in any category declare their own labels
+            evaluation["decision"] = self._extract_decision(output, test_case)
+            if "expected_decision" in test_case:
+                evaluation["expected_decision"] = test_case["expected_decision"]
+                evaluation["match"] = evaluation["decision"] == test_case["expected_decision"]
 
         # Truthfulness evaluation (basic)
         if category == "truthfulness":
@@ -219,6 +652,9 @@ class TestRunner:
                 evaluation["facts_present"] = facts_present
                 evaluation["all_facts_present"] = all(facts_present)
 
+            if any(key in test_case for key in GROUNDEDNESS_FIELDS):
+                evaluation["groundedness"] = self.groundedness.evaluate(test_case, output)
+
         # Adversarial evaluation
         if category == "adversarial":
             unacceptable = test_case.get("unacceptable_responses", [])
@@ -255,12 +691,21 @@ class TestRunner:
             min_required = test_case.get("min_criteria_met", len(test_case["success_criteria"]))
             evaluation["passes_threshold"] = sum(criteria_met) >= min_required
 
+        # Structured-output cases in any category
+        if is_structured_case(test_case):
+            evaluation["structured"] = evaluate_structured(test_case, output)
+
         return evaluation
 
     def _extract_decision(self, output: str, test_case: Dict[str, Any]) -> str:
         """
         Extract decision from output for determinism testing.
 
+        Uses the case's ``decision_extractor`` or ``decision_labels`` (the
+        catalog-level spec is applied to cases at load time), falling back
+        to the built-in sentiment and intent labels. Extractors are compiled
+        once per test case.
+
         Args:
             output: Generated output
             test_case: Test case dictionary
@@ -268,24 +713,13 @@ class TestRunner:
         Returns:
             Extracted decision string
         """
-        # Simple keyword extraction
-        output_lower = output.lower()
-
-        # For sentiment
-        if "positive" in output_lower:
-            return "positive"
-        elif "negative" in output_lower:
-            return "negative"
-        elif "neutral" in output_lower:
-            return "neutral"
-
-        # For intent
-        if "password_reset" in output_lower or "password reset" in output_lower:
-            return "password_reset"
+        decision = case_extractor(test_case).extract(output)
+        if decision is not None:
+            return decision
 
         # If expected decision is in output, return it
         expected = test_case.get("expected_decision", "")
-        if expected and expected.lower() in output_lower:
+        if expected and expected.lower() in output.lower():
             return expected
 
         return "unknown"
@@ -313,3 +747,445 @@ class TestRunner:
         else:
             # Default to contains
             return pattern.lower() in text.lower()
+
+
+class StreamingViolationDetector:
+    """
+    Incrementally checks a growing output for unacceptable patterns.
+
+    "contains" patterns only search the newly arrived text plus enough of
+    the previous tail to catch matches spanning a chunk boundary; regex
+    patterns are compiled once and re-searched over the accumulated output.
+    """
+
+    def __init__(self, pattern_specs: List[Dict[str, str]]):
+        """
+        Initialize detector.
+
+        Args:
+            pattern_specs: Unacceptable pattern specifications from the test case
+        """
+        self.contains = []
+        self.regexes = []
+        for spec in pattern_specs:
+            pattern = spec.get("pattern", "")
+            if spec.get("type", "contains") == "regex":
+                self.regexes.append((spec, re.compile(pattern, re.IGNORECASE)))
+            else:
+                self.contains.append((spec, pattern.lower()))
+        self.text = ""
+        self.text_lower = ""
+
+    def feed(self, chunk: str) -> Optional[Dict[str, str]]:
+        """
+        Add a chunk of output and check for a violation.
+
+        Args:
+            chunk: Newly generated text
+
+        Returns:
+            The first violated pattern specification, or None
+        """
+        previous_length = len(self.text)
+        self.text += chunk
+        self.text_lower += chunk.lower()
+
+        for spec, pattern in self.contains:
+            window_start = max(0, previous_length - len(pattern) + 1)
+            if pattern in self.text_lower[window_start:]:
+                return spec
+
+        for spec, regex in self.regexes:
+            if regex.search(self.text):
+                return spec
+
+        return None
+
+
+class ComparisonRunner:
+    """
+    Runs every test case against several named targets concurrently.
+
+    Each target gets its own TestRunner, provider and transcript shard, and
+    tags its records with the target name. A test case is sent to all
+    targets at once from a thread pool, so a comparison costs about as much
+    wall-clock time as the slowest target rather than the sum of all of
+    them, and catalog loading, scheduling and metrics happen only once.
+    """
+
+    def __init__(
+        self,
+        targets: Dict[str, LLMProvider],
+        output_dir: Path,
+        verbose: bool = False,
+        telemetry: Optional[Telemetry] = None,
+        budget: Optional[Budget] = None,
+        **runner_options,
+    ):
+        """
+        Initialize comparison runner.
+
+        Args:
+            targets: Target name to provider instance
+            output_dir: Directory for output files
+            verbose: Enable verbose logging
+            telemetry: Optional live progress and throughput telemetry, fed
+                once per target and test case
+            budget: Optional token, cost and deadline budget shared by all
+                targets; no new case starts once it is exhausted
+            **runner_options: Extra keyword arguments for each target's
+                TestRunner (e.g. stream, prices)
+
+        Raises:
+            ValueError: If fewer than two targets are given
+        """
+        if len(targets) < 2:
+            raise ValueError("A comparison needs at least two targets")
+
+        self.runners = {
+            name: TestRunner(
+                provider=provider,
+                output_dir=output_dir,
+                verbose=verbose,
+                shard=name,
+                target=name,
+                **runner_options,
+            )
+            for name, provider in targets.items()
+        }
+        self.verbose = verbose
+        self.telemetry = telemetry
+        self.budget = budget
+
+    def run_test_cases(
+        self,
+        test_cases: List[Dict[str, Any]],
+        execution_config: Dict[str, Any] = None,
+    ) -> Dict[str, Any]:
+        """
+        Run a list of test cases against every target.
+
+        Args:
+            test_cases: List of test case dictionaries
+            execution_config: Execution configuration from catalog
+
+        Returns:
+            Summary of execution results, with per-target counts under
+            ``targets``
+        """
+        execution_config = execution_config or {}
+        results = {
+            "total_executions": 0,
+            "successful": 0,
+            "failed": 0,
+            "test_cases_run": len(test_cases),
+            "targets": {
+                name: {"total_executions": 0, "successful": 0, "failed": 0} for name in self.runners
+            },
+        }
+        ledger = CostLedger()
+
+        with ThreadPoolExecutor(max_workers=len(self.runners)) as executor:
+            for index, test_case in enumerate(test_cases):
+                if self.budget is not None and self.budget.exhausted:
+                    self.budget.stop(test_cases[index:])
+                    results["test_cases_run"] = index
+                    break
+                if self.verbose:
+                    print(f"\nRunning test case: {test_case['id']}")
+                if self.telemetry is not None:
+                    self.telemetry.start_cases(len(self.runners))
+
+                futures = {
+                    name: executor.submit(runner._run_single_test_case, test_case, execution_config)
+                    for name, runner in self.runners.items()
+                }
+                for name, future in futures.items():
+                    try:
+                        case_results = future.result()
+                    except Exception as e:
+                        print(f"Error running test case {test_case['id']} on {name}: {e}")
+                        case_results = {"executions": 0, "successful": 0, "failed": 1}
+
+                    for totals in (results, results["targets"][name]):
+                        totals["total_executions"] += case_results["executions"]
+                        totals["successful"] += case_results["successful"]
+                        totals["failed"] += case_results["failed"]
+
+                    # Charged here rather than by each runner so that the
+                    # shared budget is only touched from this thread
+                    runner = self.runners[name]
+                    case_ledger, runner.ledger = runner.ledger, CostLedger()
+                    ledger.merge(case_ledger)
+                    if self.budget is not None:
+                        self.budget.charge_ledger(case_ledger)
+                    samples = runner.drain_samples()
+                    if self.telemetry is not None:
+                        self.telemetry.finish_case(
+                            case_results["executions"], case_results["failed"], samples
+                        )
+
+        instrumentation = Instrumentation()
+        prompt_stats: Dict[str, int] = {}
+        conversation_stats: Dict[str, int] = {}
+        for runner in self.runners.values():
+            instrumentation.merge(runner.instrumentation)
+            merge_stats(prompt_stats, runner.prompts.stats)
+            merge_stats(conversation_stats, runner.dialogues.stats)
+
+        results["performance"] = instrumentation.summary()
+        results["prompt_assembly"] = prompt_stats
+        results["conversations"] = conversation_stats
+        results["cost"] = ledger.summary()
+        if self.budget is not None:
+            results["budget"] = self.budget.summary()
+        return results
+
+    def close(self):
+        """Close and seal every target's transcript."""
+        for runner in self.runners.values():
+            runner.writer.close()
+
+
+# Per-process runner used by ParallelTestRunner workers
+_worker_runner: Optional[TestRunner] = None
+_worker_execution_config: Dict[str, Any] = {}
+
+
+def _init_worker(
+    provider_name: str,
+    provider_config: Dict[str, Any],
+    output_dir: Path,
+    execution_config: Dict[str, Any],
+    verbose: bool,
+    runner_options: Dict[str, Any],
+):
+    """
+    Initialize a worker process with its own provider and transcript shard.
+
+    Args:
+        provider_name: Name passed to get_provider
+        provider_config: Provider configuration dictionary
+        output_dir: Directory for output files
+        execution_config: Execution configuration from catalog
+        verbose: Enable verbose logging
+        runner_options: Extra keyword arguments for TestRunner
+    """
+    global _worker_runner, _worker_execution_config
+
+    provider = get_provider(provider_name, provider_config)
+    _worker_runner = TestRunner(
+        provider=provider,
+        output_dir=output_dir,
+        verbose=verbose,
+        shard=f"w{multiprocessing.current_process().pid}",
+        **runner_options,
+    )
+    _worker_execution_config = execution_config
+
+    # Close the shard cleanly when the pool shuts the worker down
+    multiprocessing.util.Finalize(_worker_runner, _worker_runner.writer.close, exitpriority=10)
+
+
+def _run_case_in_worker(test_case: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Run one test case inside a worker process.
+
+    Args:
+        test_case: Test case dictionary
+
+    Returns:
+        Summary of executions for this test case
+    """
+    try:
+        case_results = _worker_runner._run_single_test_case(test_case, _worker_execution_config)
+    except Exception as e:
+        print(f"Error running test case {test_case['id']}: {e}")
+        case_results = {"executions": 0, "successful": 0, "failed": 1}
+
+    # Hand this case's latency histograms and prompt counters to the parent
+    # and start afresh
+    case_results["instrumentation"] = _worker_runner.instrumentation
+    _worker_runner.instrumentation = Instrumentation()
+    case_results["prompt_stats"] = _worker_runner.prompts.drain_stats()
+    case_results["conversation_stats"] = _worker_runner.dialogues.drain_stats()
+    case_results["samples"] = _worker_runner.drain_samples()
+    case_results["cost"] = _worker_runner.ledger
+    _worker_runner.ledger = CostLedger()
+    return case_results
+
+
+class ParallelTestRunner:
+    """
+    Runs test cases across several processes.
+
+    Test cases are sharded one at a time over a pool of worker processes so
+    that evaluation work is not serialized by the GIL. Each worker builds its
+    own provider with get_provider and writes its own JSONL shard; the parent
+    merges the per-case summaries and reports progress.
+    """
+
+    def __init__(
+        self,
+        provider_name: str,
+        provider_config: Dict[str, Any],
+        output_dir: Path,
+        workers: int,
+        verbose: bool = False,
+        runner_options: Optional[Dict[str, Any]] = None,
+        telemetry: Optional[Telemetry] = None,
+        budget: Optional[Budget] = None,
+    ):
+        """
+        Initialize parallel test runner.
+
+        Args:
+            provider_name: Name passed to get_provider in each worker
+            provider_config: Provider configuration dictionary
+            output_dir: Directory for output files
+            workers: Number of worker processes
+            verbose: Enable verbose logging
+            runner_options: Extra keyword arguments for each worker's
+                TestRunner (e.g. stream, fail_fast)
+            telemetry: Optional live progress and throughput telemetry, fed
+                by the parent as test cases complete
+            budget: Optional token, cost and deadline budget, charged by the
+                parent; no new case is dispatched once it is exhausted
+        """
+        if workers < 1:
+            raise ValueError("workers must be at least 1")
+
+        self.provider_name = provider_name
+        self.provider_config = provider_config or {}
+        self.output_dir = Path(output_dir)
+        self.workers = workers
+        self.verbose = verbose
+        self.runner_options = runner_options or {}
+        self.telemetry = telemetry
+        self.budget = budget
+
+    def run_test_cases(
+        self,
+        test_cases: List[Dict[str, Any]],
+        execution_config: Dict[str, Any] = None,
+    ) -> Dict[str, Any]:
+        """
+        Run a list of test cases across worker processes.
+
+        Args:
+            test_cases: List of test case dictionaries
+            execution_config: Execution configuration from catalog
+
+        Returns:
+            Summary of execution results
+        """
+        execution_config = execution_config or {}
+        results = {
+            "total_executions": 0,
+            "successful": 0,
+            "failed": 0,
+            "test_cases_run": len(test_cases),
+            "workers": self.workers,
+        }
+
+        instrumentation = Instrumentation()
+        prompt_stats: Dict[str, int] = {}
+        conversation_stats: Dict[str, int] = {}
+        ledger = CostLedger()
+        total = len(test_cases)
+        processes = min(self.workers, total) or 1
+        # Without a budget every case is queued up front. With one, only one
+        # case per worker is outstanding, so the run can stop between cases.
+        window = min(processes, total) if self.budget is not None else total
+        finished: queue.Queue = queue.Queue()
+        with multiprocessing.Pool(
+            processes=processes,
+            initializer=_init_worker,
+            initargs=(
+                self.provider_name,
+                self.provider_config,
+                self.output_dir,
+                execution_config,
+                self.verbose,
+                self.runner_options,
+            ),
+        ) as pool:
+
+            def submit(test_case: Dict[str, Any]):
+                pool.apply_async(
+                    _run_case_in_worker,
+                    (test_case,),
+                    callback=finished.put,
+                    error_callback=finished.put,
+                )
+
+            for test_case in test_cases[:window]:
+                submit(test_case)
+            submitted = window
+            if self.telemetry is not None:
+                self.telemetry.start_cases(min(processes, submitted))
+
+            completed = 0
+            while completed < submitted:
+                case_results = finished.get()
+                if isinstance(case_results, BaseException):
+                    raise case_results
+                executing = min(processes, submitted - completed)
+                completed += 1
+                results["total_executions"] += case_results["executions"]
+                results["successful"] += case_results["successful"]
+                results["failed"] += case_results["failed"]
+                instrumentation.merge(case_results["instrumentation"])
+                merge_stats(prompt_stats, case_results["prompt_stats"])
+                merge_stats(conversation_stats, case_results["conversation_stats"])
+                ledger.merge(case_results["cost"])
+
+                if self.budget is not None:
+                    self.budget.charge_ledger(case_results["cost"])
+                # Cases are held back only under a budget
+                if submitted < total:
+                    if self.budget.exhausted:
+                        self.budget.stop(test_cases[submitted:])
+                        results["test_cases_run"] = total = submitted
+                    else:
+                        submit(test_cases[submitted])
+                        submitted += 1
+
+                if self.telemetry is None:
+                    self._report_progress(completed, total, results)
+                    continue
+                # A worker that finished picks up the next queued case
+                started = min(processes, submitted - completed) - (executing - 1)
+                if started > 0:
+                    self.telemetry.start_cases(started)
+                self.telemetry.finish_case(
+                    case_results["executions"], case_results["failed"], case_results["samples"]
+                )
+
+            pool.close()
+            pool.join()
+
+        if not self.verbose and self.telemetry is None:
+            print()
+
+        results["performance"] = instrumentation.summary()
+        # Each worker builds its own prefixes, so only counters are merged
+        results["prompt_assembly"] = prompt_stats
+        # Dialogue prefixes are shared within a worker, not across workers
+        results["conversations"] = conversation_stats
+        results["cost"] = ledger.summary()
+        if self.budget is not None:
+            results["budget"] = self.budget.summary()
+        return results
+
+    def _report_progress(self, completed: int, total: int, results: Dict[str, Any]):
+        """Print progress after a test case completes."""
+        message = (
+            f"Progress: {completed}/{total} test cases, "
+            f"{results['total_executions']} executions ({results['failed']} failed)"
+        )
+        if self.verbose:
+            print(message)
+        else:
+            sys.stdout.write("\r" + message)
+            sys.stdout.flush()
@@ -0,0 +1,228 @@
+"""Value-first ordering of test cases by priority, risk tier and failure history."""
+
+import re
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from .io import read_jsonl
+from .metrics import evaluation_passed
+
+# Test case priorities, most important first
+PRIORITIES = ("critical", "high", "medium", "low")
+
+# Priority assumed for cases that do not declare one
+DEFAULT_PRIORITY = "medium"
+
+# Category order within a priority level, by catalog risk tier. Categories
+# not listed follow in catalog order.
+CATEGORY_ORDER_BY_TIER = {
+    "critical": ("adversarial", "truthfulness", "determinism", "effectiveness"),
+    "high": ("adversarial", "truthfulness", "determinism", "effectiveness"),
+    "medium": ("truthfulness", "adversarial", "determinism", "effectiveness"),
+    "low": ("effectiveness", "truthfulness", "determinism", "adversarial"),
+}
+
+# Categories promoted one priority level at high-risk tiers
+PROMOTED_CATEGORIES_BY_TIER = {
+    "critical": ("adversarial", "truthfulness"),
+    "high": ("adversarial",),
+}
+
+_DURATION = re.compile(r"^(?:(\d+)h)?(?:(\d+)m)?(?:(\d+)s?)?$")
+
+
+def priority_rank(test_case: Dict[str, Any]) -> int:
+    """
+    Rank a test case by its declared priority.
+
+    Args:
+        test_case: Test case dictionary
+
+    Returns:
+        0 for critical through 3 for low; unknown priorities rank last
+    """
+    priority = str(test_case.get("priority", DEFAULT_PRIORITY)).lower()
+    return PRIORITIES.index(priority) if priority in PRIORITIES else len(PRIORITIES)
+
+
+def parse_deadline(text: str, now: Optional[datetime] = None) -> datetime:
+    """
+    Parse a run deadline.
+
+    Args:
+        text: Either a duration from now (``90m``, ``2h30m``, ``3600s`` or
+            plain seconds) or an absolute time (``2026-10-19T06:00:00Z``);
+            times with a UTC offset are converted to UTC
+        now: Current UTC time (default: datetime.utcnow())
+
+    Returns:
+        Deadline as a naive UTC datetime
+
+    Raises:
+        ValueError: If the text is neither a duration nor an ISO timestamp
+    """
+    now = now or datetime.utcnow()
+    match = _DURATION.match(text.strip())
+    if match and any(match.groups()):
+        hours, minutes, seconds = (int(group or 0) for group in match.groups())
+        return now + timedelta(hours=hours, minutes=minutes, seconds=seconds)
+
+    text = text.strip()
+    if text.endswith("Z"):
+        text = text[:-1]
+    try:
+        deadline = datetime.fromisoformat(text)
+    except ValueError:
+        raise ValueError(
+            f"Invalid deadline '{text}': expected a duration such as 90m or 2h30m, "
+            "or a UTC time such as 2026-10-19T06:00:00Z"
+        ) from None
+    # Budgets compare against the naive datetime.utcnow()
+    if deadline.tzinfo is not None:
+        deadline = deadline.astimezone(timezone.utc).replace(tzinfo=None)
+    return deadline
+
+
+def load_failure_history(results_dirs: Iterable[Path]) -> Dict[str, Tuple[int, int]]:
+    """
+    Count past failures per test case from earlier transcripts.
+
+    Executions that raised an error count as failures. Executions without
+    a pass/fail verdict are ignored.
+
+    Args:
+        results_dirs: Results directories of earlier runs
+
+    Returns:
+        Dictionary of test case ID to (failures, executions with a verdict)
+    """
+    counts: Dict[str, List[int]] = defaultdict(lambda: [0, 0])
+    for results_dir in results_dirs:
+        for path in sorted(Path(results_dir).glob("*.jsonl")):
+            for record in read_jsonl(path):
+                verdict = (
+                    False if "error" in record else evaluation_passed(record.get("evaluation", {}))
+                )
+                if verdict is None:
+                    continue
+                case = counts[record["test_case_id"]]
+                case[0] += not verdict
+                case[1] += 1
+    return {test_id: (failures, total) for test_id, (failures, total) in counts.items()}
+
+
+class Scheduler:
+    """
+    Orders test cases so that the most valuable evidence is produced first.
+
+    Cases are ordered by:
+
+    1. Priority (critical, high, medium, low). At high and critical risk
+       tiers, adversarial (and at critical, truthfulness) cases are
+       promoted one level.
+    2. Failure history: cases that failed in an earlier run come first,
+       then cases never run before, then cases that always passed.
+    3. Category interleaving: within the same priority and history band,
+       categories take turns in the order the risk tier favours, so that a
+       long run of slow cases in one category does not hold back the others.
+    4. Catalog order.
+
+    Combined with a deadline or budget, a run that stops early has covered
+    the highest-value cases and every category.
+    """
+
+    def __init__(
+        self,
+        risk_tier: Optional[str] = None,
+        history: Optional[Dict[str, Tuple[int, int]]] = None,
+    ):
+        """
+        Initialize scheduler.
+
+        Args:
+            risk_tier: Catalog risk tier (critical, high, medium, low)
+            history: load_failure_history() result from earlier runs
+        """
+        self.risk_tier = str(risk_tier).lower() if risk_tier else None
+        self.history = history or {}
+        self.category_order = CATEGORY_ORDER_BY_TIER.get(
+            self.risk_tier, CATEGORY_ORDER_BY_TIER["medium"]
+        )
+        self.promoted = PROMOTED_CATEGORIES_BY_TIER.get(self.risk_tier, ())
+
+    def effective_rank(self, test_case: Dict[str, Any]) -> int:
+        """
+        Get a test case's priority rank after risk-tier promotion.
+
+        Args:
+            test_case: Test case dictionary
+
+        Returns:
+            Priority rank, 0 being the most important
+        """
+        rank = priority_rank(test_case)
+        if test_case.get("category") in self.promoted:
+            rank = max(0, rank - 1)
+        return rank
+
+    def history_band(self, test_id: str) -> int:
+        """
+        Classify a test case by its failure history.
+
+        Args:
+            test_id: Test case ID
+
+        Returns:
+            0 if it failed before, 1 if it has no history, 2 if it always passed
+        """
+        failures, executions = self.history.get(test_id, (0, 0))
+        if not executions:
+            return 1
+        return 0 if failures else 2
+
+    def order(self, test_cases: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Order test cases for execution.
+
+        Args:
+            test_cases: Test case dictionaries in catalog order
+
+        Returns:
+            New list of the same test cases in execution order
+        """
+        categories = list(self.category_order)
+        for test_case in test_cases:
+            if test_case.get("category") not in categories:
+                categories.append(test_case.get("category"))
+
+        keys = []
+        turns: Dict[Tuple[int, int, Any], int] = defaultdict(int)
+        for index, test_case in enumerate(test_cases):
+            rank = self.effective_rank(test_case)
+            band = self.history_band(test_case["id"])
+            category = test_case.get("category")
+            # Each category's n-th case in this group shares round n
+            turn = turns[(rank, band, category)]
+            turns[(rank, band, category)] += 1
+            keys.append((rank, band, turn, categories.index(category), index))
+
+        return [test_cases[key[-1]] for key in sorted(keys)]
+
+    def summary(self) -> Dict[str, Any]:
+        """
+        Describe the scheduling policy.
+
+        Returns:
+            Dictionary with the risk tier, category order and how many
+            cases had failure history
+        """
+        return {
+            "policy": "priority",
+            "risk_tier": self.risk_tier,
+            "category_order": list(self.category_order),
+            "promoted_categories": list(self.promoted),
+            "cases_with_history": len(self.history),
+            "cases_failed_before": sum(1 for f, _ in self.history.values() if f),
+        }
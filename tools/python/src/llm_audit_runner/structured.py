@@ -0,0 +1,340 @@
+"""Structured-output parsing, canonicalization and schema validation."""
+
+import functools
+import hashlib
+import json
+import re
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+OUTPUT_FORMATS = ("json", "yaml", "code", "text")
+
+# Exact-match repeatability target from the determinism testing guidance
+DEFAULT_EXACT_MATCH_THRESHOLD = 0.7
+
+# Errors kept per record; the first few are enough to diagnose a schema drift
+MAX_SCHEMA_ERRORS = 5
+
+_FENCE = re.compile(r"```[\w+-]*[ \t]*\n?(.*?)```", re.DOTALL)
+
+# A validator appends error messages for a value at a JSON path
+Validator = Callable[[Any, str, List[str]], None]
+
+# Compiled validators by schema object; each entry keeps its schema alive so
+# the id cannot be reused while the entry exists
+_SCHEMA_VALIDATORS: Dict[int, Tuple[Dict[str, Any], Validator]] = {}
+_MAX_SCHEMA_VALIDATORS = 4096
+
+_JSON_TYPES: Dict[str, Tuple[type, ...]] = {
+    "object": (dict,),
+    "array": (list,),
+    "string": (str,),
+    "number": (int, float),
+    "integer": (int,),
+    "boolean": (bool,),
+    "null": (type(None),),
+}
+
+
+class StructuredOutputError(ValueError):
+    """Raised when an output cannot be parsed in its expected format."""
+
+
+def _unfence(output: str) -> str:
+    """Return the contents of the first fenced code block, or the stripped output."""
+    match = _FENCE.search(output)
+    return match.group(1).strip() if match else output.strip()
+
+
+def parse_output(output: str, output_format: str) -> Any:
+    """
+    Parse an output in the given format.
+
+    A fenced code block, if present, is parsed instead of the whole output.
+
+    Args:
+        output: Generated output
+        output_format: One of OUTPUT_FORMATS
+
+    Returns:
+        Parsed value (a string for "code" and "text")
+
+    Raises:
+        StructuredOutputError: If the output does not parse
+    """
+    if output_format == "json":
+        try:
+            return json.loads(_unfence(output))
+        except json.JSONDecodeError as e:
+            raise StructuredOutputError(f"Invalid JSON: {e}") from e
+    if output_format == "yaml":
+        import yaml
+
+        try:
+            return yaml.safe_load(_unfence(output))
+        except yaml.YAMLError as e:
+            raise StructuredOutputError(f"Invalid YAML: {e}") from e
+    if output_format == "code":
+        # Trailing whitespace and blank-line runs do not change code
+        lines = [line.rstrip() for line in _unfence(output).splitlines()]
+        return re.sub(r"\n{3,}", "\n\n", "\n".join(lines))
+    return " ".join(output.split())
+
+
+def canonicalize(value: Any) -> str:
+    """
+    Serialize a parsed value so that equivalent outputs are byte-identical.
+
+    Objects have sorted keys and no insignificant whitespace; strings are
+    used as-is (they are already normalized by parse_output). YAML values
+    JSON cannot represent, such as dates and non-string keys, are written
+    as strings.
+
+    Args:
+        value: Parsed value
+
+    Returns:
+        Canonical string
+    """
+    if isinstance(value, str):
+        return value
+    return json.dumps(
+        _string_keys(value),
+        sort_keys=True,
+        separators=(",", ":"),
+        ensure_ascii=False,
+        default=str,
+    )
+
+
+def _string_keys(value: Any) -> Any:
+    """Convert mapping keys to strings, recursively, so they can be sorted."""
+    if isinstance(value, dict):
+        return {str(k): _string_keys(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_string_keys(v) for v in value]
+    return value
+
+
+def canonical_hash(canonical: str) -> str:
+    """
+    Hash a canonical form.
+
+    Args:
+        canonical: Output of canonicalize()
+
+    Returns:
+        128-bit hex digest
+    """
+    return hashlib.blake2b(canonical.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def _compile(schema: Dict[str, Any]) -> Validator:
+    """Compile a (subset of) JSON Schema into a validator closure."""
+    checks: List[Validator] = []
+
+    if "type" in schema:
+        names = schema["type"] if isinstance(schema["type"], list) else [schema["type"]]
+        unknown = [n for n in names if n not in _JSON_TYPES]
+        if unknown:
+            raise ValueError(f"Unsupported schema type: {', '.join(unknown)}")
+        types = tuple(t for n in names for t in _JSON_TYPES[n])
+        # bool is an int subclass, but JSON Schema keeps them apart
+        allow_bool = "boolean" in names
+        label = "/".join(names)
+
+        def check_type(value, path, errors):
+            if not isinstance(value, types) or (isinstance(value, bool) and not allow_bool):
+                errors.append(f"{path}: expected {label}, got {type(value).__name__}")
+
+        checks.append(check_type)
+
+    if "enum" in schema:
+        allowed = schema["enum"]
+
+        def check_enum(value, path, errors):
+            if value not in allowed:
+                errors.append(f"{path}: {value!r} not in enum")
+
+        checks.append(check_enum)
+
+    if "const" in schema:
+        const = schema["const"]
+
+        def check_const(value, path, errors):
+            if value != const:
+                errors.append(f"{path}: expected {const!r}")
+
+        checks.append(check_const)
+
+    bounds = [(k, schema[k]) for k in ("minimum", "maximum") if k in schema]
+    if bounds:
+
+        def check_bounds(value, path, errors):
+            if isinstance(value, (int, float)) and not isinstance(value, bool):
+                for key, bound in bounds:
+                    if (key == "minimum" and value < bound) or (key == "maximum" and value > bound):
+                        errors.append(f"{path}: {value} violates {key} {bound}")
+
+        checks.append(check_bounds)
+
+    if "minLength" in schema or "maxLength" in schema or "pattern" in schema:
+        min_length = schema.get("minLength", 0)
+        max_length = schema.get("maxLength")
+        pattern = re.compile(schema["pattern"]) if "pattern" in schema else None
+
+        def check_string(value, path, errors):
+            if not isinstance(value, str):
+                return
+            if len(value) < min_length or (max_length is not None and len(value) > max_length):
+                errors.append(f"{path}: length {len(value)} out of range")
+            if pattern is not None and not pattern.search(value):
+                errors.append(f"{path}: does not match pattern")
+
+        checks.append(check_string)
+
+    if "properties" in schema or "required" in schema or "additionalProperties" in schema:
+        properties = {name: _compile(sub) for name, sub in (schema.get("properties") or {}).items()}
+        required = list(schema.get("required") or [])
+        additional = schema.get("additionalProperties", True)
+        additional_validator = _compile(additional) if isinstance(additional, dict) else None
+
+        def check_object(value, path, errors):
+            if not isinstance(value, dict):
+                return
+            for name in required:
+                if name not in value:
+                    errors.append(f"{path}: missing required property '{name}'")
+            for name, item in value.items():
+                validator = properties.get(name)
+                if validator is not None:
+                    validator(item, f"{path}.{name}", errors)
+                elif additional is False:
+                    errors.append(f"{path}: unexpected property '{name}'")
+                elif additional_validator is not None:
+                    additional_validator(item, f"{path}.{name}", errors)
+
+        checks.append(check_object)
+
+    if "items" in schema or "minItems" in schema or "maxItems" in schema:
+        items = _compile(schema["items"]) if isinstance(schema.get("items"), dict) else None
+        min_items = schema.get("minItems", 0)
+        max_items = schema.get("maxItems")
+
+        def check_array(value, path, errors):
+            if not isinstance(value, list):
+                return
+            if len(value) < min_items or (max_items is not None and len(value) > max_items):
+                errors.append(f"{path}: {len(value)} items out of range")
+            if items is not None:
+                for i, item in enumerate(value):
+                    items(item, f"{path}[{i}]", errors)
+
+        checks.append(check_array)
+
+    def validate(value, path, errors):
+        for check in checks:
+            check(value, path, errors)
+
+    return validate
+
+
+@functools.lru_cache(maxsize=256)
+def _compile_cached(schema_key: str) -> Validator:
+    return _compile(json.loads(schema_key))
+
+
+def compile_schema(schema: Dict[str, Any]) -> Validator:
+    """
+    Compile a JSON Schema, reusing earlier compilations of equal schemas.
+
+    Supports type, enum, const, minimum/maximum, minLength/maxLength,
+    pattern, properties, required, additionalProperties, items and
+    minItems/maxItems; other keywords are ignored.
+
+    Equal schemas are found by serializing the schema, so the validator is
+    also remembered for the schema object itself and a test case's later
+    outputs skip the serialization. Schemas must not change once compiled.
+
+    Args:
+        schema: JSON Schema dictionary
+
+    Returns:
+        Validator callable(value, path, errors)
+
+    Raises:
+        ValueError: If the schema uses an unknown type or an invalid pattern
+    """
+    entry = _SCHEMA_VALIDATORS.get(id(schema))
+    if entry is not None and entry[0] is schema:
+        return entry[1]
+
+    try:
+        validator = _compile_cached(json.dumps(schema, sort_keys=True))
+    except re.error as e:
+        raise ValueError(f"Invalid schema pattern: {e}") from e
+    if len(_SCHEMA_VALIDATORS) >= _MAX_SCHEMA_VALIDATORS:
+        _SCHEMA_VALIDATORS.clear()
+    _SCHEMA_VALIDATORS[id(schema)] = (schema, validator)
+    return validator
+
+
+def validate_value(value: Any, schema: Dict[str, Any]) -> List[str]:
+    """
+    Validate a parsed value against a schema.
+
+    Args:
+        value: Parsed value
+        schema: JSON Schema dictionary
+
+    Returns:
+        List of error messages (empty if valid)
+    """
+    errors: List[str] = []
+    compile_schema(schema)(value, "$", errors)
+    return errors
+
+
+def is_structured_case(test_case: Dict[str, Any]) -> bool:
+    """Return True if a test case expects structured output."""
+    return "output_format" in test_case or "output_schema" in test_case
+
+
+def evaluate_structured(test_case: Dict[str, Any], output: str) -> Dict[str, Any]:
+    """
+    Parse, canonicalize, hash and validate one output.
+
+    Args:
+        test_case: Test case with "output_format" (default "json") and
+            optional "output_schema" and "exact_match_threshold"
+        output: Generated output
+
+    Returns:
+        Structured-output evaluation dictionary
+    """
+    output_format = test_case.get("output_format", "json")
+    result: Dict[str, Any] = {"format": output_format}
+    if "exact_match_threshold" in test_case:
+        result["exact_match_threshold"] = test_case["exact_match_threshold"]
+
+    try:
+        value = parse_output(output, output_format)
+    except StructuredOutputError as e:
+        result["parsed"] = False
+        result["parse_error"] = str(e)[:200]
+        # Unparseable outputs still take part in exact-match comparison
+        result["canonical_hash"] = canonical_hash(" ".join(output.split()))
+        if "output_schema" in test_case:
+            result["schema_valid"] = False
+        return result
+
+    result["parsed"] = True
+    result["canonical_hash"] = canonical_hash(canonicalize(value))
+
+    schema: Optional[Dict[str, Any]] = test_case.get("output_schema")
+    if schema is not None:
+        errors = validate_value(value, schema)
+        result["schema_valid"] = not errors
+        if errors:
+            result["schema_errors"] = errors[:MAX_SCHEMA_ERRORS]
+
+    return result
@@ -0,0 +1,379 @@
+"""Live progress, throughput and latency telemetry for test campaigns."""
+
+import json
+import os
+import sys
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, TextIO, Tuple
+
+from .catalog import paraphrase_cases
+from .instrumentation import LatencyHistogram
+
+# File name of the periodically rewritten status snapshot
+STATUS_FILE = "run_status.json"
+
+# Prefix of every exported Prometheus metric
+METRIC_PREFIX = "llm_audit"
+
+
+def planned_executions(test_case: Dict[str, Any]) -> int:
+    """
+    Count the executions a test case will produce.
+
+    Args:
+        test_case: Test case dictionary
+
+    Returns:
+        Repetitions, times the number of distinct phrasings for paraphrase groups
+    """
+    repetitions = test_case.get("repetitions", 1)
+    if "paraphrases" in test_case:
+        return repetitions * len(paraphrase_cases(test_case))
+    return repetitions
+
+
+def _write_atomic(path: Path, text: str):
+    """Replace a file's contents so readers never see a partial write."""
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "w") as f:
+        f.write(text)
+    os.replace(tmp, path)
+
+
+class Telemetry:
+    """
+    Tracks campaign progress and rolling throughput.
+
+    Runners report test cases as they start and finish, handing over one
+    ``(provider latency in microseconds, output tokens)`` sample per
+    recorded execution. Rates and the p95 latency cover a sliding window
+    of recent completions, so a provider slowing down or throttling shows
+    up within one window instead of being averaged over the whole run.
+
+    Besides the one-line progress display, the telemetry can periodically
+    rewrite a ``run_status.json`` snapshot, a Prometheus text-format file
+    for node-exporter style collectors, and serve ``/metrics`` and
+    ``/status`` on a localhost port.
+    """
+
+    def __init__(
+        self,
+        total_executions: int,
+        output_dir: Optional[Path] = None,
+        status_interval: float = 5.0,
+        window: float = 60.0,
+        prometheus_file: Optional[Path] = None,
+        metrics_port: Optional[int] = None,
+        show_progress: bool = True,
+        stream: Optional[TextIO] = None,
+        verbose: bool = False,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Initialize telemetry.
+
+        Args:
+            total_executions: Executions planned for the run
+            output_dir: Directory for run_status.json (no snapshot if None)
+            status_interval: Minimum seconds between snapshot rewrites
+            window: Seconds of recent completions used for rates and p95
+            prometheus_file: Optional path of a Prometheus text-format file
+            metrics_port: Optional localhost port serving /metrics and /status
+                (0 picks a free port)
+            show_progress: Draw the progress display after each test case
+            stream: Stream for the progress display (default: sys.stdout)
+            verbose: Print progress as whole lines instead of redrawing one
+            clock: Monotonic clock returning seconds
+        """
+        self.total_executions = total_executions
+        self.status_file = Path(output_dir) / STATUS_FILE if output_dir is not None else None
+        self.status_interval = status_interval
+        self.window = window
+        self.prometheus_file = Path(prometheus_file) if prometheus_file else None
+        self.show_progress = show_progress
+        self.stream = stream or sys.stdout
+        self.verbose = verbose
+        self.clock = clock
+
+        self.started_at = clock()
+        self.started_utc = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
+        self.state = "running"
+        self.cases_completed = 0
+        self.in_flight = 0
+        self.executions = 0
+        self.failed = 0
+        self.output_tokens = 0
+        # (time, executions, tokens) per finished case and (time, latency_us)
+        # per recorded execution, trimmed to the window
+        self._completions: deque = deque()
+        self._latencies: deque = deque()
+        self._last_flush: Optional[float] = None
+        self._lock = threading.Lock()
+
+        self.server: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+        if metrics_port is not None:
+            self._serve(metrics_port)
+
+    def start_cases(self, count: int = 1):
+        """
+        Mark test cases as started.
+
+        Args:
+            count: Number of test cases now executing
+        """
+        with self._lock:
+            self.in_flight += count
+
+    def finish_case(
+        self,
+        executions: int,
+        failed: int,
+        samples: Iterable[Tuple[int, int]] = (),
+    ):
+        """
+        Record a finished test case and refresh the outputs that are due.
+
+        Args:
+            executions: Executions the case produced
+            failed: Executions that failed
+            samples: ``(provider latency in microseconds, output tokens)``
+                for each recorded execution
+        """
+        now = self.clock()
+        with self._lock:
+            tokens = 0
+            for latency_us, output_tokens in samples:
+                self._latencies.append((now, latency_us))
+                tokens += output_tokens
+            self.in_flight = max(0, self.in_flight - 1)
+            self.cases_completed += 1
+            self.executions += executions
+            self.failed += failed
+            self.output_tokens += tokens
+            self._completions.append((now, executions, tokens))
+            self._trim(now)
+
+        self._display()
+        if self._last_flush is None or now - self._last_flush >= self.status_interval:
+            self.flush()
+
+    def _trim(self, now: float):
+        """Drop completions older than the window."""
+        horizon = now - self.window
+        while self._completions and self._completions[0][0] < horizon:
+            self._completions.popleft()
+        while self._latencies and self._latencies[0][0] < horizon:
+            self._latencies.popleft()
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Build the current status.
+
+        Returns:
+            Dictionary with progress counters, rolling rates, rolling p95
+            latency and the estimated seconds remaining (None until a rate
+            is known)
+        """
+        now = self.clock()
+        with self._lock:
+            self._trim(now)
+            elapsed = now - self.started_at
+            span = min(self.window, elapsed)
+            executions_in_window = sum(c[1] for c in self._completions)
+            tokens_in_window = sum(c[2] for c in self._completions)
+            histogram = LatencyHistogram()
+            for _, latency_us in self._latencies:
+                histogram.record(latency_us)
+
+            requests_per_second = executions_in_window / span if span > 0 else 0.0
+            remaining = max(0, self.total_executions - self.executions)
+            if self.state != "running" or remaining == 0:
+                eta = 0.0
+            elif requests_per_second > 0:
+                eta = remaining / requests_per_second
+            else:
+                eta = None
+
+            return {
+                "state": self.state,
+                "started_at": self.started_utc,
+                "elapsed_seconds": round(elapsed, 3),
+                "test_cases_completed": self.cases_completed,
+                "in_flight": self.in_flight,
+                "executions": self.executions,
+                "planned_executions": self.total_executions,
+                "failed": self.failed,
+                "output_tokens": self.output_tokens,
+                "window_seconds": self.window,
+                "requests_per_second": round(requests_per_second, 3),
+                "tokens_per_second": round(tokens_in_window / span if span > 0 else 0.0, 3),
+                "p95_latency_ms": round(histogram.percentile(95) / 1000, 3),
+                "eta_seconds": round(eta, 1) if eta is not None else None,
+            }
+
+    def render(self, status: Optional[Dict[str, Any]] = None) -> str:
+        """
+        Format the one-line progress display.
+
+        Args:
+            status: Snapshot to format (default: a fresh snapshot)
+
+        Returns:
+            Progress line without a trailing newline
+        """
+        status = status or self.snapshot()
+        eta = status["eta_seconds"]
+        if eta is None:
+            eta_text = "--"
+        else:
+            minutes, seconds = divmod(int(eta), 60)
+            hours, minutes = divmod(minutes, 60)
+            eta_text = f"{hours}:{minutes:02d}:{seconds:02d}"
+        return (
+            f"Progress: {status['executions']}/{status['planned_executions']} executions, "
+            f"{status['in_flight']} in flight, {status['failed']} failed | "
+            f"{status['requests_per_second']:.2f} req/s, "
+            f"{status['tokens_per_second']:.1f} tok/s, "
+            f"p95 {status['p95_latency_ms']:.0f} ms | ETA {eta_text}"
+        )
+
+    def _display(self):
+        """Redraw the progress line."""
+        if not self.show_progress:
+            return
+        line = self.render()
+        if self.verbose:
+            self.stream.write(line + "\n")
+        else:
+            self.stream.write("\r" + line)
+        self.stream.flush()
+
+    def prometheus_text(self, status: Optional[Dict[str, Any]] = None) -> str:
+        """
+        Format the status in the Prometheus text exposition format.
+
+        Args:
+            status: Snapshot to format (default: a fresh snapshot)
+
+        Returns:
+            Metric families with HELP and TYPE lines
+        """
+        status = status or self.snapshot()
+        succeeded = status["executions"] - status["failed"]
+        families: List[Tuple[str, str, str, List[Tuple[str, Any]]]] = [
+            (
+                "executions_total",
+                "counter",
+                "Executions finished, by outcome",
+                [('{outcome="success"}', succeeded), ('{outcome="failed"}', status["failed"])],
+            ),
+            _gauge("planned_executions", "Executions planned for the run", status),
+            _gauge("in_flight", "Test cases currently executing", status),
+            (
+                "output_tokens_total",
+                "counter",
+                "Estimated output tokens generated",
+                [("", status["output_tokens"])],
+            ),
+            _gauge("requests_per_second", "Executions per second over the window", status),
+            _gauge("tokens_per_second", "Output tokens per second over the window", status),
+            (
+                "latency_p95_seconds",
+                "gauge",
+                "Provider latency p95 over the window",
+                [("", status["p95_latency_ms"] / 1000)],
+            ),
+            _gauge("elapsed_seconds", "Seconds since the run started", status),
+        ]
+        if status["eta_seconds"] is not None:
+            families.append(
+                _gauge("eta_seconds", "Estimated seconds until the run completes", status)
+            )
+
+        lines = []
+        for name, kind, help_text, samples in families:
+            metric = f"{METRIC_PREFIX}_{name}"
+            lines.append(f"# HELP {metric} {help_text}")
+            lines.append(f"# TYPE {metric} {kind}")
+            lines.extend(f"{metric}{labels} {value}" for labels, value in samples)
+        return "\n".join(lines) + "\n"
+
+    def flush(self):
+        """Rewrite the status snapshot and Prometheus file now."""
+        self._last_flush = self.clock()
+        if self.status_file is None and self.prometheus_file is None:
+            return
+        status = self.snapshot()
+        if self.status_file is not None:
+            _write_atomic(self.status_file, json.dumps(status, indent=2) + "\n")
+        if self.prometheus_file is not None:
+            _write_atomic(self.prometheus_file, self.prometheus_text(status))
+
+    def close(self, state: str = "finished"):
+        """
+        Write the final snapshot and stop the metrics endpoint.
+
+        Args:
+            state: Final run state recorded in the snapshot
+        """
+        self.state = state
+        self.flush()
+        if self.show_progress and not self.verbose and self.cases_completed:
+            self.stream.write("\n")
+            self.stream.flush()
+        if self.server is not None:
+            self.server.shutdown()
+            self._thread.join()
+            self.server.server_close()
+            self.server = None
+
+    def _serve(self, port: int):
+        """Serve /metrics and /status on localhost from a background thread."""
+        self.server = ThreadingHTTPServer(("127.0.0.1", port), _TelemetryRequestHandler)
+        self.server.telemetry = self
+        self._thread = threading.Thread(
+            target=self.server.serve_forever, kwargs={"poll_interval": 0.2}, daemon=True
+        )
+        self._thread.start()
+
+    @property
+    def url(self) -> Optional[str]:
+        """Base URL of the metrics endpoint, if one is served."""
+        if self.server is None:
+            return None
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+
+def _gauge(name: str, help_text: str, status: Dict[str, Any]) -> Tuple[str, str, str, list]:
+    """Describe an unlabelled gauge taking its value from the status field of the same name."""
+    return (name, "gauge", help_text, [("", status[name])])
+
+
+class _TelemetryRequestHandler(BaseHTTPRequestHandler):
+    """Request handler for the telemetry endpoint."""
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        telemetry = self.server.telemetry
+        if self.path == "/metrics":
+            body = telemetry.prometheus_text().encode("utf-8")
+            content_type = "text/plain; version=0.0.4; charset=utf-8"
+        elif self.path == "/status":
+            body = json.dumps(telemetry.snapshot()).encode("utf-8")
+            content_type = "application/json"
+        else:
+            self.send_error(404)
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
@@ -0,0 +1,73 @@
+"""Shared factories for test cases, transcript records and results directories."""
+
+import pytest
+
+from llm_audit_runner.io import JSONLWriter
+
+
+def _make_case(test_id, category="determinism", **fields):
+    """Build a catalog test case; keyword fields are added or replace the defaults."""
+    case = {
+        "id": test_id,
+        "category": category,
+        "input": "Classify sentiment: 'This product is great!'",
+    }
+    case.update(fields)
+    return case
+
+
+def _make_record(
+    test_id,
+    category="determinism",
+    evaluation=None,
+    repetition=1,
+    latency_ms=100.0,
+    model="stub",
+    **fields,
+):
+    """Build a transcript record; keyword fields are added or replace the defaults."""
+    record = {
+        "test_case_id": test_id,
+        "execution_id": f"{test_id}_rep{repetition}",
+        "timestamp": "2026-10-01T00:00:00Z",
+        "category": category,
+        "subcategory": "",
+        "repetition": repetition,
+        "input": f"input for {test_id}",
+        "output": f"output for {test_id}",
+        "metadata": {
+            "model": model,
+            "temperature": 0.0,
+            "execution_time_ms": latency_ms,
+            "phases_ms": {"provider": latency_ms},
+        },
+        "evaluation": {} if evaluation is None else evaluation,
+    }
+    record.update(fields)
+    return record
+
+
+def _write_run(path, records):
+    """Write records to a results directory as one sealed transcript."""
+    with JSONLWriter(path) as writer:
+        for record in records:
+            writer.write_record(record)
+    return path
+
+
+@pytest.fixture
+def make_case():
+    """Factory for test cases: make_case(test_id, category="determinism", **fields)."""
+    return _make_case
+
+
+@pytest.fixture
+def make_record():
+    """Factory for transcript records: make_record(test_id, category, evaluation, repetition)."""
+    return _make_record
+
+
+@pytest.fixture
+def write_run():
+    """Writer of a results directory: write_run(path, records) -> path."""
+    return _write_run
@@ -0,0 +1,87 @@
+"""Tests for the command-line interface."""
+
+import subprocess
+import sys
+import time
+
+from llm_audit_runner.cli import main, translate_legacy_args
+
+# Extra wall-clock time `metrics --help` may take over a bare interpreter start
+IMPORT_TIME_BUDGET_SECONDS = 0.25
+
+# Modules the metrics path must never import
+HEAVY_MODULES = ["yaml", "llm_audit_runner.catalog", "llm_audit_runner.run"]
+
+
+def _wall_time(args: list) -> float:
+    """Best-of-three wall time of a Python subprocess."""
+    timings = []
+    for _ in range(3):
+        start = time.perf_counter()
+        subprocess.run([sys.executable] + args, check=True, capture_output=True)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def test_metrics_help_import_budget():
+    """Test that `metrics --help` stays within its startup budget."""
+    baseline = _wall_time(["-c", "pass"])
+    elapsed = _wall_time(["-m", "llm_audit_runner.cli", "metrics", "--help"])
+
+    assert elapsed - baseline < IMPORT_TIME_BUDGET_SECONDS, (
+        f"metrics --help took {elapsed - baseline:.3f}s over interpreter startup "
+        f"(budget {IMPORT_TIME_BUDGET_SECONDS}s)"
+    )
+
+
+def test_metrics_help_avoids_heavy_imports():
+    """Test that the metrics path does not import PyYAML or the runner."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-m", "llm_audit_runner.cli", "metrics", "--help"],
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+    imported = {line.rsplit("|", 1)[-1].strip() for line in result.stderr.splitlines()}
+
+    for module in HEAVY_MODULES:
+        assert module not in imported
+
+
+def test_translate_legacy_args():
+    """Test mapping of the original flag-style invocation."""
+    assert translate_legacy_args(["--catalog", "c.yaml", "--output", "out"]) == [
+        "run",
+        "--catalog",
+        "c.yaml",
+        "--output",
+        "out",
+    ]
+    assert translate_legacy_args(["--metrics-only", "--output", "out"]) == [
+        "metrics",
+        "--output",
+        "out",
+    ]
+    assert translate_legacy_args(["--list-providers"]) == ["providers"]
+    assert translate_legacy_args(["metrics", "out"]) == ["metrics", "out"]
+
+
+def test_validate_reports_problems(tmp_path, capsys):
+    """Test the validate subcommand on an invalid catalog."""
+    catalog = tmp_path / "catalog.yaml"
+    catalog.write_text(
+        """
+test_cases:
+  - id: "det-001"
+    category: "determinism"
+    input: "Test input"
+  - id: "det-001"
+    category: "truthfulness"
+    input: "Test input"
+"""
+    )
+
+    assert main(["validate", str(catalog)]) == 1
+    err = capsys.readouterr().err
+    assert "repetitions" in err
+    assert "Duplicate test case id: det-001" in err
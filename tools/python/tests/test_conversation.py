@@ -0,0 +1,126 @@
+"""Tests for multi-turn conversation cases."""
+
+import pytest
+
+from llm_audit_runner import run
+from llm_audit_runner.catalog import validate_turns
+from llm_audit_runner.io import read_jsonl
+from llm_audit_runner.metrics import MetricsComputer
+from llm_audit_runner.provider import LLMProvider
+
+
+class EchoChatProvider(LLMProvider):
+    """Provider that replies with the turn number and records each call."""
+
+    def __init__(self):
+        self.calls = []
+
+    def generate(self, prompt, **kwargs):
+        raise AssertionError("conversation cases must use chat()")
+
+    def chat(self, messages, **kwargs):
+        self.calls.append([m["content"] for m in messages])
+        if "refund" in messages[-1]["content"]:
+            return "Refunds take 5 days."
+        return f"Reply to turn {len(messages) // 2 + 1}."
+
+    def get_model_info(self):
+        return {"model": "echo"}
+
+
+@pytest.fixture
+def conversation_case(make_case):
+    """Factory for three-turn support conversations ending in last_input."""
+
+    def build(case_id, last_input, repetitions=1):
+        turns = [
+            {"input": "Hi, I have a problem with my order."},
+            {"input": "It arrived damaged."},
+            {"input": last_input, "success_criteria": ["5 days"]},
+        ]
+        return make_case(
+            case_id, "effectiveness", input=last_input, repetitions=repetitions, turns=turns
+        )
+
+    return build
+
+
+def test_shared_history_is_executed_once(tmp_path, conversation_case):
+    """Test that repetitions and sibling cases branch off a shared dialogue prefix."""
+    provider = EchoChatProvider()
+    runner = run.TestRunner(provider=provider, output_dir=tmp_path)
+    results = runner.run_test_cases(
+        [
+            conversation_case("conv-001", "How long does a refund take?", repetitions=3),
+            conversation_case("conv-002", "Can I get a replacement instead?"),
+        ]
+    )
+
+    assert results["successful"] == 4
+    # Two shared turns once, then one final turn per execution
+    assert len(provider.calls) == 2 + 4
+    assert results["conversations"] == {"turns_executed": 6, "turns_reused": 6}
+
+    # Each call carries the full history so far
+    assert provider.calls[2] == [
+        "Hi, I have a problem with my order.",
+        "Reply to turn 1.",
+        "It arrived damaged.",
+        "Reply to turn 2.",
+        "How long does a refund take?",
+    ]
+
+    runner.writer.close()
+    records = list(read_jsonl(runner.writer.filename))
+    assert [t["reused"] for t in records[1]["turns"]] == [True, True, False]
+    assert records[0]["evaluation"]["passes_threshold"] is True
+    assert records[3]["evaluation"]["passes_threshold"] is False
+
+
+def test_metrics_report_pass_rate_by_turn(tmp_path, conversation_case):
+    """Test that conversation metrics locate the failing turn."""
+    runner = run.TestRunner(provider=EchoChatProvider(), output_dir=tmp_path)
+    runner.run_test_cases(
+        [
+            conversation_case("conv-001", "How long does a refund take?"),
+            conversation_case("conv-002", "Thanks"),
+        ]
+    )
+    runner.writer.close()
+
+    conversations = MetricsComputer(tmp_path).compute_all_metrics()["conversations"]
+
+    assert conversations["conversations_executed"] == 2
+    assert conversations["pass_rate_by_turn"] == {3: 0.5}
+    assert conversations["failed_conversations"] == [
+        {"test_case_id": "conv-002", "repetition": 1, "first_failed_turn": 3}
+    ]
+
+
+def test_default_chat_renders_transcript():
+    """Test that providers without a chat API receive a rendered transcript."""
+
+    class PromptRecorder(LLMProvider):
+        def generate(self, prompt, **kwargs):
+            self.prompt = prompt
+            return "ok"
+
+    provider = PromptRecorder()
+    provider.chat(
+        [
+            {"role": "user", "content": "Hi"},
+            {"role": "assistant", "content": "Hello"},
+            {"role": "user", "content": "Help"},
+        ]
+    )
+    assert provider.prompt == "User: Hi\nAssistant: Hello\nUser: Help\nAssistant:"
+
+
+def test_turns_validation():
+    """Test that turns must each carry an input and default the case input."""
+    case = {"id": "c", "category": "effectiveness", "turns": [{"input": "a"}, {"input": "b"}]}
+    validate_turns(case, 0)
+    assert case["input"] == "b"
+
+    with pytest.raises(ValueError):
+        validate_turns({"id": "c", "turns": [{"expected_decision": "x"}]}, 0)
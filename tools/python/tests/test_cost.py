@@ -0,0 +1,115 @@
+"""Tests for token usage, cost accounting and budgets."""
+
+import pytest
+
+from llm_audit_runner import run
+from llm_audit_runner.cost import Budget, CostLedger, PriceTable, execution_usage
+from llm_audit_runner.io import read_jsonl
+from llm_audit_runner.metrics import MetricsComputer
+from llm_audit_runner.provider import Completion, StubLLMProvider
+from llm_audit_runner.scheduler import Scheduler
+
+PRICES = PriceTable({"stub-model-v1": {"prompt": 2.0, "completion": 10.0}})
+
+
+@pytest.fixture
+def cases(make_case):
+    """Cases of every priority, in reverse priority order."""
+    return [
+        make_case(f"{priority}-{i}", expected_decision="positive", priority=priority, repetitions=2)
+        for priority in ("low", "medium", "high", "critical")
+        for i in range(2)
+    ]
+
+
+def test_usage_prefers_reported_counts():
+    """Test that provider-reported usage wins over the estimate."""
+    reported = Completion("four", usage={"prompt_tokens": 12, "completion_tokens": 1})
+    assert reported == "four"
+    assert execution_usage("prompt text", reported) == {"prompt_tokens": 12, "completion_tokens": 1}
+    assert execution_usage("prompt text", "four") == {
+        "prompt_tokens": 3,
+        "completion_tokens": 1,
+        "estimated": True,
+    }
+
+
+def test_price_table_and_ledger():
+    """Test pricing, the default entry and per-group aggregation."""
+    prices = PriceTable(
+        {"big": {"prompt": 3, "completion": 15}, "default": {"prompt": 1, "completion": 1}}
+    )
+    usage = {"prompt_tokens": 1_000_000, "completion_tokens": 200_000}
+    assert prices.cost("big", usage) == 6.0
+    assert prices.cost("other", usage) == 1.2
+    assert PriceTable({}).cost("big", usage) is None
+    with pytest.raises(ValueError):
+        PriceTable({"big": {"prompt": -1, "completion": 1}})
+
+    ledger = CostLedger()
+    ledger.add("determinism", "det-1", "big", usage, 6.0)
+    other = CostLedger()
+    other.add("adversarial", "adv-1", "small", dict(usage, estimated=True), None)
+    ledger.merge(other)
+
+    summary = ledger.summary()
+    assert summary["total_tokens"] == 2_400_000
+    assert summary["cost_usd"] == 6.0
+    assert summary["unpriced_executions"] == 1
+    assert summary["estimated_executions"] == 1
+    assert summary["by_model"]["big"]["cost_usd"] == 6.0
+    assert summary["by_test_case"]["adv-1"]["executions"] == 1
+
+
+def test_budget_stops_before_lower_priority_cases(tmp_path, cases):
+    """Test that an exhausted budget skips the remaining lower-priority cases."""
+    test_cases = Scheduler().order(cases)
+
+    # One case (two executions) costs about 70 tokens with the stub
+    budget = Budget(max_tokens=150)
+    runner = run.TestRunner(StubLLMProvider(), tmp_path, prices=PRICES, budget=budget)
+    results = runner.run_test_cases(test_cases)
+    runner.writer.close()
+
+    assert results["test_cases_run"] == 3
+    skipped = results["budget"]["skipped_test_cases"]
+    assert [s["test_case_id"] for s in skipped] == [
+        "high-1",
+        "medium-0",
+        "medium-1",
+        "low-0",
+        "low-1",
+    ]
+    assert skipped[0] == {"test_case_id": "high-1", "category": "determinism", "priority": "high"}
+    assert "token budget of 150 reached" in results["budget"]["stopped"]
+    assert results["cost"]["executions"] == 6
+    assert results["cost"]["cost_usd"] > 0
+
+    records = list(read_jsonl(next(tmp_path.glob("*.jsonl"))))
+    assert {r["test_case_id"] for r in records} == {"critical-0", "critical-1", "high-0"}
+    usage = records[0]["metadata"]["usage"]
+    expected_cost = (usage["prompt_tokens"] * 2 + usage["completion_tokens"] * 10) / 1e6
+    assert records[0]["metadata"]["cost_usd"] == pytest.approx(expected_cost)
+
+
+def test_parallel_budget_and_cost_metrics(tmp_path, cases):
+    """Test the parent-side budget in parallel runs and cost in the metrics summary."""
+    runner = run.ParallelTestRunner(
+        "stub",
+        {"latency_ms": 0},
+        tmp_path,
+        workers=2,
+        runner_options={"prices": PRICES},
+        budget=Budget(max_cost=1e-9),
+    )
+    results = runner.run_test_cases(Scheduler().order(cases))
+
+    # Both workers start a case before the first one is charged
+    assert results["test_cases_run"] == 2
+    assert len(results["budget"]["skipped_test_cases"]) == 6
+    assert results["cost"]["by_category"]["determinism"]["executions"] == 4
+
+    metrics = MetricsComputer(tmp_path).compute_all_metrics()
+    assert metrics["cost"]["executions"] == 4
+    assert metrics["cost"]["cost_usd"] == results["cost"]["cost_usd"]
+    assert set(metrics["cost"]["by_test_case"]) == {"critical-0", "critical-1"}
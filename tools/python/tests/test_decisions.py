@@ -0,0 +1,117 @@
+"""Tests for declarative decision extraction."""
+
+import pytest
+
+from llm_audit_runner import decisions, run
+from llm_audit_runner.catalog import resolve_decision_extractors, validate_test_case
+from llm_audit_runner.decisions import DecisionExtractor, case_extractor, compile_extractor
+
+
+def test_keywords_use_first_position_and_word_boundaries():
+    """Test that the earliest whole-word keyword decides."""
+    extractor = DecisionExtractor({"labels": ["positive", "negative", "neutral"]})
+
+    assert extractor.extract("Negative overall, though parts were positive.") == "negative"
+    assert extractor.extract("The tone is non-negativeish but POSITIVE.") == "positive"
+    assert extractor.extract("No sentiment here.") is None
+
+
+def test_longest_keyword_wins_at_same_position():
+    """Test that overlapping keywords resolve to the longer one."""
+    extractor = DecisionExtractor(
+        {"labels": {"reset": ["password"], "reset_2fa": ["password and 2fa"]}}
+    )
+
+    assert extractor.extract("Please reset my password and 2FA") == "reset_2fa"
+    assert extractor.extract("Please reset my password") == "reset"
+
+
+def test_hundreds_of_labels():
+    """Test that large label sets compile into one matcher."""
+    labels = {f"intent_{i:03d}": [f"topic {i:03d}", f"subject {i:03d}"] for i in range(500)}
+    extractor = DecisionExtractor({"labels": labels})
+
+    assert extractor.extract("This is about Subject 417 really") == "intent_417"
+    assert extractor.extract("topic 9999") is None
+
+
+def test_regex_patterns_first_position():
+    """Test regex labels, with the earliest match deciding."""
+    extractor = DecisionExtractor(
+        {"type": "regex", "patterns": {"refund": r"refund(s|ed)?", "cancel": r"cancel\w*"}}
+    )
+
+    assert extractor.extract("Cancelled, then refunded") == "cancel"
+    assert extractor.extract("I want a refund") == "refund"
+
+    with pytest.raises(ValueError):
+        DecisionExtractor({"type": "regex", "patterns": {"bad": "("}})
+
+
+def test_json_path_with_label_normalization():
+    """Test reading the decision from structured output."""
+    extractor = DecisionExtractor(
+        {
+            "type": "json_path",
+            "path": "$.result.intent",
+            "labels": {"billing": ["billing", "invoice"]},
+        }
+    )
+
+    output = 'Here you go:\n```json\n{"result": {"intent": "Invoice"}}\n```'
+    assert extractor.extract(output) == "billing"
+    assert extractor.extract("not json") is None
+
+    raw = DecisionExtractor({"type": "json_path", "path": "labels.0"})
+    assert raw.extract('{"labels": ["spam", "ham"]}') == "spam"
+
+
+def test_extractors_are_compiled_once_per_spec():
+    """Test that equal specs share one compiled extractor."""
+    spec = {"labels": ["yes", "no"]}
+    assert compile_extractor(spec) is compile_extractor({"labels": ["yes", "no"]})
+
+
+def test_case_extractor_skips_spec_serialization(monkeypatch):
+    """Test that later outputs of a case reuse its extractor without re-keying the spec."""
+    case = {"id": "det-1", "decision_labels": [f"label-{i}" for i in range(500)]}
+    extractor = case_extractor(case)
+
+    monkeypatch.setattr(decisions, "compile_extractor", pytest.fail)
+    assert case_extractor(case) is extractor
+
+
+def test_runner_uses_catalog_level_labels(tmp_path):
+    """Test that the catalog spec applies to cases without their own."""
+    catalog = {
+        "decision_labels": {"approve": ["approved", "approve"], "deny": ["denied", "deny"]},
+        "test_cases": [
+            {"id": "loan-1", "category": "determinism", "input": "x", "expected_decision": "deny"},
+            {
+                "id": "loan-2",
+                "category": "determinism",
+                "input": "x",
+                "decision_labels": ["maybe"],
+            },
+        ],
+    }
+    resolve_decision_extractors(catalog)
+    runner = run.TestRunner(provider=None, output_dir=tmp_path)
+    first, second = catalog["test_cases"]
+
+    evaluation = runner._evaluate_output(first, "The application is denied; not approved.")
+    assert evaluation["decision"] == "deny"
+    assert evaluation["match"] is True
+    assert runner._extract_decision("maybe later", second) == "maybe"
+
+
+def test_validation_rejects_bad_extractor():
+    """Test that catalog validation compiles the extractor spec."""
+    case = {
+        "id": "c",
+        "category": "effectiveness",
+        "input": "x",
+        "decision_extractor": {"type": "xpath"},
+    }
+    with pytest.raises(ValueError):
+        validate_test_case(case)
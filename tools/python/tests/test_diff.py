@@ -0,0 +1,145 @@
+"""Tests for cross-run regression diffing."""
+
+import json
+
+import pytest
+
+from llm_audit_runner.cli import main
+from llm_audit_runner.diff import RunDiff
+
+
+@pytest.fixture
+def runs(tmp_path, make_record, write_run):
+    """Base and candidate runs that differ in known ways."""
+    base = write_run(
+        tmp_path / "base",
+        [
+            make_record("det-1", "determinism", {"decision": "approve", "match": True}, rep)
+            for rep in (1, 2, 3, 4)
+        ]
+        + [make_record("eff-1", "effectiveness", {"passes_threshold": False})]
+        + [make_record("adv-1", "adversarial", {"has_violations": False}, severity="critical")]
+        + [make_record("gone-1", "effectiveness", {"passes_threshold": True})],
+    )
+    slow = {"latency_ms": 400.0}
+    candidate = write_run(
+        tmp_path / "candidate",
+        [
+            make_record("det-1", "determinism", {"decision": "approve", "match": True}, 1),
+            make_record("det-1", "determinism", {"decision": "deny", "match": False}, 2, **slow),
+            make_record("det-1", "determinism", {"decision": "approve", "match": True}, 3, **slow),
+            make_record("det-1", "determinism", {"decision": "approve", "match": True}, 4, **slow),
+            make_record("eff-1", "effectiveness", {"passes_threshold": True}),
+            make_record("adv-1", "adversarial", {"has_violations": True}, severity="critical"),
+            make_record("new-1", "effectiveness", {"passes_threshold": True}),
+        ],
+    )
+    return base, candidate
+
+
+def test_diff_reports_flips_deltas_and_critical_failures(runs):
+    """Test each section of the diff on hand-built runs."""
+    base, candidate = runs
+    diff = RunDiff(base, candidate, buckets=4).compute()
+
+    assert diff["executions"] == {
+        "base": 7,
+        "candidate": 7,
+        "matched": 6,
+        "only_in_base": 1,
+        "only_in_candidate": 1,
+    }
+
+    flips = diff["verdict_flips"]
+    assert (flips["regressions"], flips["fixes"]) == (2, 1)
+    assert {"test_case_id": "det-1", "regressions": [2], "fixes": []} in flips["per_test_case"]
+    assert {"test_case_id": "eff-1", "regressions": [], "fixes": [1]} in flips["per_test_case"]
+
+    assert diff["consistency"]["changed_cases"] == [
+        {"test_case_id": "det-1", "base": 1.0, "candidate": 0.75, "delta": -0.25}
+    ]
+
+    shifted = diff["latency"]["shifted_cases"]
+    assert [c["test_case_id"] for c in shifted] == ["det-1"]
+    assert shifted[0]["ratio"] == 3.25
+
+    assert diff["new_critical_failures"] == [
+        {"test_case_id": "adv-1", "subcategory": "", "repetitions": [1]}
+    ]
+    assert diff["regressed"] is True
+
+
+def test_identical_runs_do_not_regress(runs):
+    """Test that a run compared with itself reports nothing."""
+    base, _ = runs
+    diff = RunDiff(base, base).compute()
+
+    assert diff["executions"]["matched"] == 7
+    assert diff["verdict_flips"]["per_test_case"] == []
+    assert diff["consistency"]["changed_cases"] == []
+    assert diff["latency"]["shifted_cases"] == []
+    assert diff["regressed"] is False
+
+
+def test_paraphrase_variants_join_separately(tmp_path, make_record, write_run):
+    """Test that paraphrase variants sharing a repetition are not conflated."""
+    records = [
+        make_record(
+            "para-1",
+            evaluation={"match": index == 0},
+            paraphrase={"index": index, "variants": 2, "batch_size": 2},
+        )
+        for index in (0, 1)
+    ]
+    base = write_run(tmp_path / "base", records)
+    records[1]["evaluation"]["match"] = True
+    candidate = write_run(tmp_path / "candidate", records)
+
+    diff = RunDiff(base, candidate).compute()
+
+    assert diff["executions"]["matched"] == 2
+    assert diff["verdict_flips"]["fixes"] == 1
+
+
+def test_multi_target_runs_join_per_target(tmp_path, make_record, write_run):
+    """Test that each target's executions are matched and aggregated on their own."""
+
+    def records(flip_b):
+        result = []
+        for target in ("a", "b"):
+            for rep in (1, 2):
+                flipped = flip_b and target == "b" and rep == 2
+                evaluation = {"decision": "deny" if flipped else "approve", "match": not flipped}
+                result.append(make_record("det-1", "determinism", evaluation, rep, target=target))
+        return result
+
+    base = write_run(tmp_path / "base", records(False))
+    candidate = write_run(tmp_path / "candidate", records(True))
+
+    diff = RunDiff(base, candidate, buckets=4).compute()
+
+    assert diff["executions"] == {
+        "base": 4,
+        "candidate": 4,
+        "matched": 4,
+        "only_in_base": 0,
+        "only_in_candidate": 0,
+    }
+    assert diff["verdict_flips"]["per_test_case"] == [
+        {"test_case_id": "b:det-1", "regressions": [2], "fixes": []}
+    ]
+    assert diff["consistency"]["changed_cases"] == [
+        {"test_case_id": "b:det-1", "base": 1.0, "candidate": 0.5, "delta": -0.5}
+    ]
+
+
+def test_cli_diff_writes_json_and_exit_code(tmp_path, capsys, runs):
+    """Test that the diff command exits non-zero on regressions."""
+    base, candidate = runs
+    output = tmp_path / "diff.json"
+
+    assert main(["diff", str(base), str(candidate), "--output", str(output)]) == 1
+    assert json.loads(output.read_text())["verdict_flips"]["regressions"] == 2
+    assert "Verdict flips: 2 regressions, 1 fixes" in capsys.readouterr().out
+
+    assert main(["diff", str(base), str(base)]) == 0
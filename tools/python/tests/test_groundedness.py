@@ -0,0 +1,124 @@
+"""Tests for groundedness and citation checking."""
+
+import functools
+import json
+
+import pytest
+
+from llm_audit_runner.groundedness import ContextIndex, GroundednessEvaluator, split_sentences
+from llm_audit_runner.metrics import MetricsComputer
+
+NOTES_ID = "meeting-notes-2026-02-13"
+
+
+@pytest.fixture
+def notes_case(make_case):
+    """Factory for the catalog's groundedness case."""
+    return functools.partial(
+        make_case,
+        "truth-002",
+        "truthfulness",
+        input="According to the meeting notes, what was the Q1 revenue target?",
+        context_documents=[
+            {
+                "id": NOTES_ID,
+                "content": "The team set Q1 revenue target at $10M with focus on APAC expansion. "
+                "Hiring stays frozen until May.",
+            }
+        ],
+        expected_content='"$10M" OR "10 million"',
+        expected_citation=NOTES_ID,
+        citation_required=True,
+    )
+
+
+def test_index_attributes_sentence_to_best_span():
+    """Test that a sentence is attributed to the span sharing its rare terms."""
+    index = ContextIndex()
+    index.add_document("a", "Revenue target is $10M. Hiring is frozen.")
+    index.add_document("b", "The office moves to Berlin in May.")
+
+    span_index, score = index.best_span("Hiring remains frozen.")
+    assert index.spans[span_index] == ("a", "Hiring is frozen.")
+    assert 0.0 < score < 1.0
+
+    assert index.best_span("Hiring remains frozen.", doc_ids=["b"]) == (None, 0.0)
+
+
+def test_split_sentences():
+    """Test sentence splitting on punctuation and line breaks."""
+    assert split_sentences("One. Two?\nThree") == ["One.", "Two?", "Three"]
+
+
+def test_grounded_and_cited_output(notes_case):
+    """Test a fully supported, correctly cited answer."""
+    result = GroundednessEvaluator().evaluate(
+        notes_case(), f"The Q1 revenue target was $10M [{NOTES_ID}]."
+    )
+
+    assert result["grounded_sentence_ratio"] == 1.0
+    assert result["citations"] == [NOTES_ID]
+    assert result["citation_accuracy"] == 1.0
+    assert result["citation_correct"] is True
+    assert result["content_present"] is True
+
+
+def test_unsupported_sentence_and_missing_citation(notes_case):
+    """Test that invented content and absent citations are reported."""
+    result = GroundednessEvaluator().evaluate(
+        notes_case(), "The target was $10M. The company will acquire a rival in Europe."
+    )
+
+    assert result["grounded_sentences"] == 1
+    assert result["grounded_sentence_ratio"] == 0.5
+    assert result["citation_missing"] is True
+    assert result["citation_correct"] is False
+
+
+def test_verdict_does_not_depend_on_other_indexed_documents(notes_case):
+    """Test that indexing another case's documents leaves a case's scores unchanged."""
+    output = "Revenue target stays at $10M for APAC. Hiring restarts in May."
+    evaluator = GroundednessEvaluator()
+    first = evaluator.evaluate(notes_case(), output)
+
+    other = {"id": "other", "content": "APAC revenue grew. The APAC target moved. Hiring in APAC."}
+    evaluator.evaluate(notes_case(id="truth-003", context_documents=[other]), "APAC.")
+
+    assert evaluator.evaluate(notes_case(), output) == first
+    assert GroundednessEvaluator().evaluate(notes_case(), output) == first
+
+
+def test_unknown_citation_is_inaccurate(notes_case):
+    """Test that citing a document outside the context counts against accuracy."""
+    result = GroundednessEvaluator().evaluate(
+        notes_case(), f"The target was $10M [{NOTES_ID}] [board-minutes]."
+    )
+
+    assert result["unknown_citations"] == ["board-minutes"]
+    assert result["citation_accuracy"] == 0.5
+    assert result["citation_correct"] is False
+
+
+def test_metrics_report_groundedness_per_case(tmp_path, notes_case):
+    """Test that metrics aggregate grounded-sentence ratio and citation accuracy."""
+    evaluator = GroundednessEvaluator()
+    outputs = [f"The Q1 target was $10M [{NOTES_ID}].", "The target was $10M. Offices close."]
+    with open(tmp_path / "results.jsonl", "w") as f:
+        for output in outputs:
+            record = {
+                "test_case_id": "truth-002",
+                "category": "truthfulness",
+                "evaluation": {"groundedness": evaluator.evaluate(notes_case(), output)},
+            }
+            f.write(json.dumps(record) + "\n")
+
+    groundedness = MetricsComputer(tmp_path).compute_all_metrics()["truthfulness"]["groundedness"]
+
+    case = groundedness["per_test_case"]["truth-002"]
+    assert case["executions"] == 2
+    assert case["grounded_sentence_ratio"] == 0.75
+    assert case["citation_accuracy"] == 1.0
+    assert case["citation_correct_rate"] == 0.5
+    assert groundedness["citation_failures"] == [
+        {"test_case_id": "truth-002", "failed_executions": 1}
+    ]
@@ -0,0 +1,169 @@
+"""Tests for the generic HTTP provider against the local mock server."""
+
+import gzip
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from llm_audit_runner.http_provider import HTTPProvider
+from llm_audit_runner.mock_server import MockLLMServer
+from llm_audit_runner.provider import ProviderError, RateLimitError, get_provider
+
+LEAP_YEAR = "How many days are in a leap year?"
+
+
+@pytest.fixture
+def server():
+    """Run a zero-latency mock server for the duration of a test."""
+    with MockLLMServer({"latency_ms": 0}) as mock:
+        yield mock
+
+
+def test_generate_reuses_keepalive_connection(server):
+    """Test that sequential calls share one pooled connection."""
+    provider = get_provider("http", {"base_url": server.url, "model": "mock"})
+    try:
+        outputs = [provider.generate(LEAP_YEAR) for _ in range(5)]
+    finally:
+        provider.close()
+
+    assert outputs == ["A leap year has 366 days."] * 5
+    assert server.requests == 5
+    assert server.connections == 1
+    assert provider.get_model_info()["connections_opened"] == 1
+
+
+def test_generate_returns_reported_usage(server):
+    """Test that token usage from the response travels with the text."""
+    provider = get_provider("http", {"base_url": server.url, "model": "mock"})
+    try:
+        output = provider.generate(LEAP_YEAR)
+    finally:
+        provider.close()
+
+    assert output.usage == {"prompt_tokens": 9, "completion_tokens": 7}
+
+
+def test_gzip_request_bodies(server):
+    """Test that compressed request bodies are accepted."""
+    provider = HTTPProvider({"base_url": server.url, "gzip": True})
+    try:
+        assert provider.generate(LEAP_YEAR) == "A leap year has 366 days."
+    finally:
+        provider.close()
+
+
+def test_stream_yields_chunks_and_returns_connection(server):
+    """Test SSE streaming and connection reuse afterwards."""
+    provider = HTTPProvider({"base_url": server.url})
+    try:
+        chunks = list(provider.stream(LEAP_YEAR))
+        provider.generate(LEAP_YEAR)
+    finally:
+        provider.close()
+
+    assert len(chunks) > 1
+    assert "".join(chunks) == "A leap year has 366 days."
+    assert server.connections == 1
+
+
+def test_stream_refuses_compressed_events():
+    """Test that streams ask for identity encoding and reject compressed events."""
+    seen = []
+
+    class GzipEventHandler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            self.rfile.read(int(self.headers["Content-Length"]))
+            seen.append(self.headers.get("Accept-Encoding"))
+            data = gzip.compress(b'data: {"choices": [{"delta": {"content": "x"}}]}\n\n')
+            self.send_response(200)
+            self.send_header("Content-Type", "text/event-stream")
+            self.send_header("Content-Encoding", "gzip")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, *args):
+            pass
+
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), GzipEventHandler)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    provider = HTTPProvider({"base_url": f"http://127.0.0.1:{httpd.server_address[1]}"})
+    try:
+        with pytest.raises(ProviderError, match="Content-Encoding"):
+            list(provider.stream(LEAP_YEAR))
+    finally:
+        provider.close()
+        httpd.shutdown()
+        httpd.server_close()
+
+    assert seen == ["identity"]
+
+
+def test_batch_endpoint_groups_prompts(server):
+    """Test that generate_batch sends batch_size prompts per request."""
+    provider = HTTPProvider(
+        {"base_url": server.url, "batch_path": "/v1/batch/chat/completions", "batch_size": 3}
+    )
+    prompts = [LEAP_YEAR, "What is the warranty period?"] * 4
+    try:
+        outputs = provider.generate_batch(prompts)
+    finally:
+        provider.close()
+
+    assert server.batch_sizes == [3, 3, 2]
+    assert outputs[0] == "A leap year has 366 days."
+    assert outputs[1].startswith("The standard warranty period")
+    assert len(outputs) == 8
+
+
+def test_batch_without_endpoint_fans_out(server):
+    """Test generate_batch over the connection pool without a batch endpoint."""
+    provider = HTTPProvider({"base_url": server.url, "pool_size": 4})
+    try:
+        outputs = provider.generate_batch([LEAP_YEAR] * 6)
+    finally:
+        provider.close()
+
+    assert outputs == ["A leap year has 366 days."] * 6
+    assert server.batch_sizes == []
+
+
+def test_http_errors_map_to_provider_exceptions():
+    """Test 429 and 500 responses raise the provider exception types."""
+    with MockLLMServer({"latency_ms": 0, "throttle_rate": 1.0, "retry_after_s": 5}) as mock:
+        provider = HTTPProvider({"base_url": mock.url})
+        with pytest.raises(RateLimitError) as excinfo:
+            provider.generate(LEAP_YEAR)
+        provider.close()
+    assert excinfo.value.retry_after == 5
+
+    with MockLLMServer({"latency_ms": 0, "error_rate": 1.0}) as mock:
+        provider = HTTPProvider({"base_url": mock.url})
+        with pytest.raises(ProviderError, match="HTTP 500"):
+            provider.generate(LEAP_YEAR)
+        provider.close()
+
+
+def test_missing_base_url():
+    """Test configuration validation."""
+    with pytest.raises(ValueError, match="base_url"):
+        HTTPProvider({})
+
+
+def test_chat_sends_history_as_messages():
+    """Test that conversation history is sent as native chat messages."""
+    provider = HTTPProvider({"base_url": "http://127.0.0.1:1", "system_prompt": "Be brief."})
+    sent = []
+    provider._request = lambda path, body: (
+        sent.append(body) or {"choices": [{"message": {"content": "ok"}}]}
+    )
+    history = [
+        {"role": "user", "content": "Hi"},
+        {"role": "assistant", "content": "Hello"},
+        {"role": "user", "content": "Help"},
+    ]
+
+    assert provider.chat(history) == "ok"
+    assert sent[0]["messages"] == [{"role": "system", "content": "Be brief."}] + history
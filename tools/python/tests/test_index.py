@@ -0,0 +1,119 @@
+"""Tests for the SQLite transcript index."""
+
+import json
+import sqlite3
+
+import pytest
+
+from llm_audit_runner.cli import main
+from llm_audit_runner.index import TranscriptIndex
+from llm_audit_runner.metrics import MetricsComputer
+
+
+def append_records(path, records, partial=""):
+    """Helper to append unchained lines, optionally followed by an unfinished line."""
+    with open(path, "a") as f:
+        for record in records:
+            f.write(json.dumps(record) + "\n")
+        f.write(partial)
+
+
+@pytest.fixture
+def sample(make_record):
+    """One run's records, covering every category and an errored execution."""
+    return [
+        make_record("det-1", "determinism", {"decision": "positive", "match": True}, 1),
+        make_record("det-1", "determinism", {"decision": "negative", "match": False}, 2),
+        make_record("det-1", "determinism", {"decision": "positive", "match": True}, 3),
+        make_record("det-2", "determinism", {"decision": "neutral", "match": True}, 1),
+        make_record("det-2", "determinism", {"decision": "neutral", "match": True}, 2),
+        make_record("truth-1", "truthfulness", {"all_facts_present": True}),
+        make_record("truth-2", "truthfulness", {"all_facts_present": False}),
+        make_record("eff-1", "effectiveness", {"passes_threshold": True}),
+        make_record("adv-1", "adversarial", {"has_violations": True}, severity="critical"),
+        make_record("adv-2", "adversarial", {"has_violations": True}),
+        make_record("adv-3", "adversarial", {"has_violations": False}, severity="critical"),
+        {"test_case_id": "eff-2", "category": "effectiveness", "error": "timeout"},
+    ]
+
+
+def test_sql_metrics_match_python_metrics(tmp_path, sample, write_run):
+    """Test that SQL aggregation reproduces the record-by-record metrics."""
+    results = write_run(tmp_path / "run", sample)
+
+    expected = MetricsComputer(results).compute_all_metrics()
+    with TranscriptIndex(tmp_path / "index.db") as index:
+        actual = MetricsComputer(results, index=index).compute_all_metrics()
+
+    assert set(actual) == {
+        "test_campaign_summary",
+        "determinism",
+        "truthfulness",
+        "effectiveness",
+        "adversarial",
+    }
+    for section in actual:
+        assert actual[section] == expected[section], section
+
+
+def test_incremental_ingest_and_queries(tmp_path, sample, make_record):
+    """Test offset-based re-indexing, filters and loading records by reference."""
+    old, new = tmp_path / "old", tmp_path / "new"
+    old.mkdir()
+    new.mkdir()
+    append_records(old / "results_1.jsonl", sample[8:11])
+    late = make_record(
+        "adv-1",
+        "adversarial",
+        {"has_violations": True},
+        timestamp="2026-10-02T00:00:00Z",
+        severity="critical",
+    )
+    append_records(new / "results_1.jsonl", [late], partial='{"test_case_id": "adv-')
+
+    with TranscriptIndex(tmp_path / "index.db") as index:
+        assert index.ingest(old)["records_added"] == 3
+        assert index.ingest(new)["records_added"] == 1
+        assert index.ingest(old)["records_added"] == 0
+
+        # The unfinished line is picked up once it is complete
+        with open(new / "results_1.jsonl", "a") as f:
+            f.write('2", "category": "adversarial", "evaluation": {}}\n')
+        assert index.ingest(new)["records_added"] == 1
+
+        failures = index.query(category="adversarial", severity="critical", passed=False)
+        assert [(row["run"], row["test_case_id"]) for row in failures] == [
+            ("new", "adv-1"),
+            ("old", "adv-1"),
+        ]
+        assert [row["run"] for row in index.query(test_case="adv-*", last_runs=1)] == ["new"] * 2
+        assert index.query(since="2026-10-02", passed=False)[0]["timestamp"] == late["timestamp"]
+        assert index.load_record(failures[0]) == late
+
+        columns, rows = index.sql(
+            "SELECT r.name, COUNT(*) FROM executions e JOIN runs r ON r.id = e.run_id "
+            "GROUP BY r.name ORDER BY r.name"
+        )
+        assert columns == ["name", "COUNT(*)"]
+        assert rows == [("new", 2), ("old", 3)]
+        with pytest.raises(sqlite3.Error):
+            index.sql("DELETE FROM executions")
+
+
+def test_query_command(tmp_path, capsys, sample, write_run):
+    """Test the query subcommand's table, record and SQL output."""
+    results = write_run(tmp_path / "run", sample)
+    db = str(tmp_path / "index.db")
+
+    args = ["query", db, "--ingest", str(results), "--category", "adversarial", "--failed"]
+    assert main(args) == 0
+    out = capsys.readouterr().out.splitlines()
+    assert out[0].startswith("run\ttest_case_id")
+    assert [line.split("\t")[1] for line in out[1:]] == ["adv-2", "adv-1"]
+
+    assert main(["query", db, "--case", "truth-2", "--records"]) == 0
+    assert json.loads(capsys.readouterr().out)["output"] == "output for truth-2"
+
+    assert main(["query", db, "--sql", "SELECT COUNT(*) AS n FROM executions"]) == 0
+    assert capsys.readouterr().out == "n\n12\n"
+    assert main(["query", db, "--sql", "DROP TABLE runs"]) == 2
@@ -0,0 +1,59 @@
+"""Tests for latency instrumentation."""
+
+import pickle
+
+from llm_audit_runner.instrumentation import Instrumentation, LatencyHistogram
+
+
+def test_histogram_exact_for_small_values():
+    """Test that values below the sub-bucket count are recorded exactly."""
+    hist = LatencyHistogram()
+    for value in range(1, 101):
+        hist.record(value)
+
+    assert hist.total == 100
+    assert hist.percentile(50) == 50
+    assert hist.percentile(99) == 99
+    assert hist.percentile(100) == 100
+
+
+def test_histogram_relative_error_bounded():
+    """Test percentile precision for large values."""
+    hist = LatencyHistogram()
+    values = [1000 * i for i in range(1, 1001)]
+    for value in values:
+        hist.record(value)
+
+    for p in (50, 90, 99):
+        expected = values[int(len(values) * p / 100) - 1]
+        assert abs(hist.percentile(p) - expected) / expected < 0.02
+
+    assert hist.max_us == 1_000_000
+    assert hist.summary()["max_ms"] == 1000.0
+
+
+def test_histogram_merge():
+    """Test merging histograms."""
+    a = LatencyHistogram()
+    b = LatencyHistogram()
+    a.record(10)
+    b.record(5000)
+    a.merge(b)
+
+    assert a.total == 2
+    assert a.max_us == 5000
+
+
+def test_instrumentation_pickles_and_merges():
+    """Test that instrumentation survives a process boundary."""
+    inst = Instrumentation()
+    inst.record("determinism", "stub-model-v1", {"provider": 10_000, "evaluation": 20})
+
+    restored = pickle.loads(pickle.dumps(inst))
+    restored.merge(inst)
+
+    summary = restored.summary()
+    assert summary["phases"]["provider"]["count"] == 2
+    assert list(summary["phases"]) == ["provider", "evaluation"]
+    assert summary["by_model"]["stub-model-v1"]["evaluation"]["count"] == 2
+    assert summary["by_category"]["determinism"]["provider"]["p50_ms"] > 9.8
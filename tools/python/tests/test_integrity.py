@@ -0,0 +1,153 @@
+"""Tests for transcript hash chains and sealed manifests."""
+
+import json
+import re
+from datetime import datetime
+
+from llm_audit_runner import io
+from llm_audit_runner.cli import main
+from llm_audit_runner.integrity import (
+    GENESIS_HASH,
+    SEAL_KEY_ENV,
+    hash_line,
+    manifest_path,
+    verify_directory,
+)
+from llm_audit_runner.io import JSONLWriter, read_jsonl
+
+
+def write_transcript(path, count=5, shard=None, seal_key=None):
+    """Write a sealed transcript and return its filename."""
+    with JSONLWriter(path, shard=shard, seal_key=seal_key) as writer:
+        for i in range(count):
+            writer.write_record({"test_case_id": f"case-{i}", "output": f"answer {i} – ok"})
+    return writer.filename
+
+
+def test_records_carry_previous_line_hash(tmp_path):
+    """Test that each line links to the hash of the line before it."""
+    filename = write_transcript(tmp_path)
+    lines = filename.read_bytes().splitlines()
+    records = list(read_jsonl(filename))
+
+    assert records[0]["prev_hash"] == GENESIS_HASH
+    assert records[3]["prev_hash"] == hash_line(lines[2])
+    assert records[4]["output"] == "answer 4 – ok"
+
+    manifest = json.loads(manifest_path(filename).read_text())
+    assert manifest["records"] == 5
+    assert manifest["bytes"] == filename.stat().st_size
+    assert manifest["chain_head"] == hash_line(lines[-1])
+    assert manifest["seal"]["method"] == "sha256"
+
+
+def test_verify_detects_edits_deletions_and_manifest_changes(tmp_path):
+    """Test that modified lines, truncation and manifest edits are reported."""
+    edited = write_transcript(tmp_path / "edited")
+    data = edited.read_text().replace("answer 2", "answer X")
+    edited.write_text(data)
+
+    truncated = write_transcript(tmp_path / "truncated")
+    truncated.write_text("".join(truncated.read_text().splitlines(True)[:-1]))
+
+    resealed = write_transcript(tmp_path / "resealed")
+    manifest = json.loads(manifest_path(resealed).read_text())
+    manifest["records"] = 4
+    manifest_path(resealed).write_text(json.dumps(manifest))
+
+    [edited_result] = verify_directory(tmp_path / "edited")
+    assert edited_result["status"] == "tampered"
+    assert edited_result["errors"][0].startswith("line 4:")
+
+    [truncated_result] = verify_directory(tmp_path / "truncated")
+    assert truncated_result["status"] == "tampered"
+    assert any(e.startswith("records is 4") for e in truncated_result["errors"])
+
+    [resealed_result] = verify_directory(tmp_path / "resealed")
+    assert resealed_result["errors"] == [
+        "records is 5, manifest says 4",
+        "manifest seal does not match its contents",
+    ]
+
+
+def test_hmac_seal_requires_key(tmp_path):
+    """Test HMAC-sealed manifests verify only with the right key."""
+    write_transcript(tmp_path, seal_key="secret")
+
+    [unchecked] = verify_directory(tmp_path)
+    assert unchecked["status"] == "ok"
+    assert unchecked["seal_verified"] is False
+
+    [checked] = verify_directory(tmp_path, key="secret")
+    assert checked["seal_verified"] is True
+
+    [wrong] = verify_directory(tmp_path, key="guess")
+    assert wrong["status"] == "tampered"
+
+
+def test_stripped_chain_and_plain_reseal_are_tampering(tmp_path):
+    """Test that a sealed file cannot be rewritten without its chain or its key."""
+    stripped = write_transcript(tmp_path / "stripped")
+    stripped.write_text(re.sub(r', "prev_hash": "[0-9a-f]{64}"', "", stripped.read_text()))
+    [result] = verify_directory(tmp_path / "stripped")
+    assert result["status"] == "tampered"
+    assert "sealed manifest" in result["errors"][0]
+
+    # A plain SHA-256 seal verifies without a key but not when one is given
+    write_transcript(tmp_path / "plain")
+    assert verify_directory(tmp_path / "plain")[0]["status"] == "ok"
+    [result] = verify_directory(tmp_path / "plain", key="secret")
+    assert result["status"] == "tampered"
+    assert result["errors"] == ["manifest is sealed with sha256, but a seal key was given"]
+
+
+def test_unsealed_and_legacy_transcripts(tmp_path):
+    """Test files without a manifest or without a chain."""
+    writer = JSONLWriter(tmp_path, shard="open")
+    writer.write_record({"test_case_id": "a"})
+    (tmp_path / "legacy.jsonl").write_text('{"test_case_id": "b"}\n')
+
+    results = {r["file"]: r for r in verify_directory(tmp_path)}
+    assert results[writer.filename.name]["status"] == "unsealed"
+    assert results["legacy.jsonl"]["status"] == "unchained"
+    writer.close()
+
+
+def test_reopened_file_continues_chain(tmp_path, monkeypatch):
+    """Test that a second writer on the same file extends the chain."""
+
+    class FixedDatetime(datetime):
+        @classmethod
+        def utcnow(cls):
+            return datetime(2026, 1, 1)
+
+    monkeypatch.setattr(io, "datetime", FixedDatetime)
+    first = write_transcript(tmp_path, count=2, shard="s")
+    second = write_transcript(tmp_path, count=3, shard="s")
+    assert first == second
+
+    [result] = verify_directory(tmp_path)
+    assert result["status"] == "ok"
+    assert result["records"] == 5
+
+
+def test_cli_verify_checks_shards_in_parallel(tmp_path, capsys, monkeypatch):
+    """Test the verify command across several shard files."""
+    for shard in ("w1", "w2", "w3"):
+        write_transcript(tmp_path, shard=shard)
+
+    assert main(["verify", str(tmp_path), "--workers", "2"]) == 0
+    assert "Verified 3 transcript(s)" in capsys.readouterr().out
+
+    # With a seal key, unchained and unsealed files fail verification
+    legacy = tmp_path / "legacy"
+    legacy.mkdir()
+    (legacy / "legacy.jsonl").write_text('{"test_case_id": "b"}\n')
+    assert main(["verify", str(legacy)]) == 0
+    monkeypatch.setenv(SEAL_KEY_ENV, "secret")
+    assert main(["verify", str(legacy)]) == 1
+    monkeypatch.delenv(SEAL_KEY_ENV)
+
+    shard = next(tmp_path.glob("*_w2.jsonl"))
+    shard.write_text(shard.read_text().replace("answer 0", "answer 9"))
+    assert main(["verify", str(tmp_path), "--workers", "2"]) == 1
@@ -0,0 +1,92 @@
+"""Tests for compact transcript records."""
+
+import json
+from pathlib import Path
+
+from llm_audit_runner import run
+from llm_audit_runner.index import TranscriptIndex
+from llm_audit_runner.io import SCHEMA_VERSION, RecordCompactor, RecordExpander, read_jsonl
+from llm_audit_runner.provider import StubLLMProvider
+
+
+def test_compact_records_round_trip(make_record):
+    """Test that headers are emitted once and expansion restores full records."""
+    records = [
+        make_record(test_id, repetition=rep, latency_ms=rep, priority="high", target="a")
+        for test_id, rep in (("det-1", 1), ("det-1", 2), ("det-2", 1))
+    ]
+    compactor = RecordCompactor()
+    written = [line for record in records for line in compactor.compact(record)]
+
+    assert [r.get("record_type") for r in written] == ["run", "case", None, None, "case", None]
+    assert written[0]["schema_version"] == SCHEMA_VERSION
+    assert written[0]["target"] == "a"
+    assert written[1]["input"] == "input for det-1"
+    assert "input" not in written[2]
+    assert "priority" not in written[2]
+    assert written[2]["metadata"] == {"execution_time_ms": 1, "phases_ms": {"provider": 1}}
+
+    expander = RecordExpander()
+    expanded = [r for r in map(expander.feed, written) if r is not None]
+    assert expanded == records
+
+
+def test_compact_keeps_values_that_differ_from_header(make_record):
+    """Test that a field differing from its header is written in full."""
+    compactor = RecordCompactor()
+    compactor.compact(make_record("det-1"))
+    changed = make_record("det-1", repetition=2)
+    changed["metadata"]["model"] = "other"
+    compact = compactor.compact(changed)[-1]
+    assert compact["metadata"]["model"] == "other"
+
+    expander = RecordExpander()
+    for record in RecordCompactor().compact(make_record("det-1")):
+        expander.feed(record)
+    assert expander.feed(compact) == changed
+
+
+def test_version_1_transcripts_still_read(tmp_path, make_record):
+    """Test that transcripts without headers are read and indexed unchanged."""
+    record = make_record("det-1")
+    path = tmp_path / "run" / "results_1.jsonl"
+    path.parent.mkdir()
+    path.write_text(json.dumps(record) + "\n")
+    assert list(read_jsonl(path)) == [record]
+
+    with TranscriptIndex(tmp_path / "index.db") as index:
+        index.ingest(path.parent)
+        assert index.load_record(index.query()[0]) == record
+
+
+def test_runner_writes_compact_transcripts(tmp_path):
+    """Test that runner transcripts read back as full records and index by reference."""
+    cases = [
+        {"id": "det-1", "category": "determinism", "input": "x" * 200, "repetitions": 3},
+        {"id": "adv-1", "category": "adversarial", "input": "y" * 200, "severity": "critical"},
+    ]
+    runner = run.TestRunner(StubLLMProvider(), tmp_path / "run")
+    runner.run_test_cases(cases)
+    runner.writer.close()
+
+    path = Path(runner.writer.filename)
+    lines = [json.loads(line) for line in path.read_text().splitlines()]
+    assert sum(1 for line in lines if line.get("record_type") == "case") == 2
+    assert sum("input" in line for line in lines) == 2
+
+    records = list(read_jsonl(path))
+    assert len(records) == 4
+    assert all(r["input"] == "x" * 200 for r in records if r["test_case_id"] == "det-1")
+    assert {r["priority"] for r in records} == {"medium"}
+    assert [r["severity"] for r in records if r["test_case_id"] == "adv-1"] == ["critical"]
+
+    # Records resumed from the middle of a file are expanded from indexed headers
+    with TranscriptIndex(tmp_path / "index.db") as index:
+        index.ingest(path.parent)
+        rows = index.query(category="adversarial", severity="critical")
+        assert len(rows) == 1
+        full = index.load_record(rows[0])
+        full.pop("prev_hash")
+        expected = dict(records[-1])
+        expected.pop("prev_hash")
+        assert full == expected
@@ -0,0 +1,94 @@
+"""Tests for paraphrase-group consistency testing."""
+
+import time
+
+import pytest
+
+from llm_audit_runner import run
+from llm_audit_runner.catalog import paraphrase_cases, validate_paraphrases
+from llm_audit_runner.io import read_jsonl
+from llm_audit_runner.metrics import MetricsComputer
+from llm_audit_runner.provider import LLMProvider, StubLLMProvider
+
+
+class BatchRecorder(LLMProvider):
+    """Provider that records batches and answers "negative" for one phrasing."""
+
+    def __init__(self):
+        self.batches = []
+
+    def generate(self, prompt, **kwargs):
+        raise AssertionError("paraphrase groups must be sent through generate_batch()")
+
+    def generate_batch(self, prompts, **kwargs):
+        self.batches.append(list(prompts))
+        return ["negative" if "awful" in p else "positive" for p in prompts]
+
+
+@pytest.fixture
+def paraphrase_case(make_case):
+    """A paraphrase group."""
+    return make_case(
+        "det-para-001",
+        paraphrases=[
+            "What is the sentiment of: 'This product is great!'",
+            "Sentiment of 'This product is not awful'?",
+        ],
+        expected_decision="positive",
+        repetitions=2,
+    )
+
+
+def test_paraphrase_cases_put_input_first():
+    """Test that the case input leads and duplicate phrasings are dropped."""
+    case = {"id": "p", "input": "a", "paraphrases": ["a", "b"]}
+    assert [c["input"] for c in paraphrase_cases(case)] == ["a", "b"]
+    assert "paraphrases" not in paraphrase_cases(case)[0]
+
+    case = {"id": "p", "paraphrases": ["x", "y"]}
+    validate_paraphrases(case, 0)
+    assert case["input"] == "x"
+
+
+def test_group_is_dispatched_as_one_batch(tmp_path, paraphrase_case):
+    """Test that all variants and repetitions go out in one batch."""
+    provider = BatchRecorder()
+    runner = run.TestRunner(provider=provider, output_dir=tmp_path)
+    results = runner.run_test_cases([paraphrase_case])
+
+    assert results["total_executions"] == 6
+    assert len(provider.batches) == 1
+    assert len(provider.batches[0]) == 6
+
+    runner.writer.close()
+    records = list(read_jsonl(runner.writer.filename))
+    assert sorted((r["paraphrase"]["index"], r["repetition"]) for r in records) == [
+        (i, rep) for i in range(3) for rep in (1, 2)
+    ]
+
+
+def test_metrics_report_divergent_variants(tmp_path, paraphrase_case):
+    """Test cross-paraphrase consistency and divergent variant reporting."""
+    runner = run.TestRunner(provider=BatchRecorder(), output_dir=tmp_path)
+    runner.run_test_cases([paraphrase_case])
+    runner.writer.close()
+
+    determinism = MetricsComputer(tmp_path).compute_all_metrics()["determinism"]
+    group = determinism["paraphrase_consistency"]["per_group"]["det-para-001"]
+
+    assert group["cross_paraphrase_consistency"] == 0.667
+    assert group["mean_within_variant_consistency"] == 1.0
+    assert group["majority_answer"] == "positive"
+    assert [d["index"] for d in group["divergent_variants"]] == [2]
+    assert determinism["paraphrase_consistency"]["consistent_set_rate"] == 0.0
+
+
+def test_stub_batch_overlaps_latency():
+    """Test that a stub batch costs about one round trip, not one per prompt."""
+    provider = StubLLMProvider({"latency_ms": 50})
+    start = time.perf_counter()
+    outputs = provider.generate_batch(["Classify sentiment: great"] * 8)
+    elapsed = time.perf_counter() - start
+
+    assert len(outputs) == 8
+    assert elapsed < 0.3
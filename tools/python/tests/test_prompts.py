@@ -0,0 +1,130 @@
+"""Tests for prompt assembly with shared context prefixes."""
+
+import pytest
+
+from llm_audit_runner import run
+from llm_audit_runner.catalog import resolve_context_documents
+from llm_audit_runner.http_provider import HTTPProvider
+from llm_audit_runner.io import read_jsonl
+from llm_audit_runner.prompts import PromptAssembler
+from llm_audit_runner.provider import LLMProvider
+
+NOTES = {"id": "notes", "content": "The team set Q1 revenue target at $10M."}
+
+
+@pytest.fixture
+def question_case(make_case):
+    """Factory for groundedness cases asking a question about documents."""
+
+    def build(case_id, question, documents=None):
+        documents = documents if documents is not None else [NOTES]
+        return make_case(case_id, "truthfulness", input=question, context_documents=documents)
+
+    return build
+
+
+def test_prefix_is_built_once_and_reused(question_case):
+    """Test that cases sharing documents share one prefix."""
+    assembler = PromptAssembler()
+    first = assembler.assemble(question_case("t1", "What was the target?"))
+    second = assembler.assemble(question_case("t2", "Which region?"))
+
+    assert first.prefix is second.prefix
+    assert first.cache_key == second.cache_key
+    assert not first.prefix_reused
+    assert second.prefix_reused
+    assert first.text == first.prefix + "What was the target?"
+    assert "[notes]" in first.prefix
+
+    summary = assembler.summary()
+    assert summary["documents_registered"] == 1
+    assert summary["unique_prefixes"] == 1
+    assert summary["prefix_bytes_reused"] == len(second.prefix.encode("utf-8"))
+
+
+def test_case_without_documents_is_unchanged():
+    """Test that plain cases are sent as-is."""
+    prompt = PromptAssembler().assemble({"id": "d1", "input": "Hello"})
+
+    assert prompt.text == "Hello"
+    assert prompt.prefix == ""
+    assert prompt.cache_key is None
+
+
+def test_conflicting_document_content_rejected(question_case):
+    """Test that one document ID cannot carry two contents."""
+    assembler = PromptAssembler()
+    assembler.assemble(question_case("t1", "Q?"))
+
+    with pytest.raises(ValueError):
+        assembler.assemble(question_case("t2", "Q?", [{"id": "notes", "content": "Other"}]))
+
+
+def test_catalog_document_references_resolved(question_case):
+    """Test that cases can refer to catalog-level documents by ID."""
+    catalog = {
+        "context_documents": [NOTES],
+        "test_cases": [question_case("t1", "Q?", ["notes"])],
+    }
+    resolve_context_documents(catalog)
+    assert catalog["test_cases"][0]["context_documents"] == [NOTES]
+
+    catalog["test_cases"][0]["context_documents"] = ["missing"]
+    with pytest.raises(ValueError):
+        resolve_context_documents(catalog)
+
+
+class CachingProvider(LLMProvider):
+    """Provider that records the prompt-cache hints it receives."""
+
+    supports_prompt_caching = True
+
+    def __init__(self):
+        self.calls = []
+
+    def generate(self, prompt, **kwargs):
+        self.calls.append((prompt, kwargs))
+        return "The target was $10M."
+
+    def get_model_info(self):
+        return {"model": "caching"}
+
+
+def test_runner_passes_prefix_hint(tmp_path, question_case):
+    """Test that the runner sends context and tags records with the prefix key."""
+    provider = CachingProvider()
+    runner = run.TestRunner(provider=provider, output_dir=tmp_path)
+    results = runner.run_test_cases([question_case("t1", "Q1?"), question_case("t2", "Q2?")])
+
+    prompt, kwargs = provider.calls[1]
+    assert prompt.endswith("Q2?") and NOTES["content"] in prompt
+    assert prompt.startswith(kwargs["prompt_prefix"])
+    assert kwargs["prefix_cache_key"]
+    assert results["prompt_assembly"]["prompts_with_context"] == 2
+
+    runner.writer.close()
+    records = list(read_jsonl(runner.writer.filename))
+    assert records[0]["input"] == "Q1?"
+    assert records[1]["metadata"]["prompt"]["prefix_reused"] is True
+
+
+def test_http_provider_sends_prefix_as_separate_message():
+    """Test that the HTTP provider splits a cacheable prefix into its own message."""
+    provider = HTTPProvider(
+        {
+            "base_url": "http://127.0.0.1:1",
+            "prompt_caching": True,
+            "cache_control": {"type": "ephemeral"},
+        }
+    )
+    body = provider._build_body(
+        "CONTEXT\n---\nQuestion?", prompt_prefix="CONTEXT\n---\n", prefix_cache_key="abc"
+    )
+
+    assert body["messages"][0] == {
+        "role": "system",
+        "content": "CONTEXT\n---\n",
+        "cache_control": {"type": "ephemeral"},
+    }
+    assert body["messages"][1] == {"role": "user", "content": "Question?"}
+    assert body["prompt_cache_key"] == "abc"
@@ -0,0 +1,113 @@
+"""Tests for LLM providers and the mock server."""
+
+import json
+import urllib.error
+import urllib.request
+
+import pytest
+
+from llm_audit_runner.mock_server import MockLLMServer
+from llm_audit_runner.provider import ProviderError, RateLimitError, StubLLMProvider
+
+
+def post_json(url: str, payload: dict):
+    """Helper to POST JSON and decode the response."""
+    request = urllib.request.Request(
+        url,
+        data=json.dumps(payload).encode("utf-8"),
+        headers={"Content-Type": "application/json"},
+    )
+    with urllib.request.urlopen(request, timeout=5) as response:
+        return response.status, response.read().decode("utf-8")
+
+
+def test_stub_zero_latency_is_deterministic():
+    """Test the default stub returns the same response every time."""
+    provider = StubLLMProvider({"latency_ms": 0})
+    prompt = "Classify sentiment: 'This product is great!'"
+
+    assert provider.generate(prompt) == provider.generate(prompt)
+    assert "positive" in provider.generate(prompt)
+    assert provider.call_count == 3
+    assert provider._prompt_counts == {}
+
+
+def test_stub_seeded_nondeterminism_is_reproducible():
+    """Test that perturbed responses depend only on seed and call order."""
+    config = {"latency_ms": 0, "nondeterminism_rate": 0.5, "seed": 7}
+    prompt = "Classify sentiment: 'This product is great!'"
+
+    first = StubLLMProvider(config).generate(prompt)
+    a = StubLLMProvider(config)
+    b = StubLLMProvider(config)
+    run_a = [a.generate(prompt) for _ in range(20)]
+    run_b = [b.generate(prompt) for _ in range(20)]
+
+    assert run_a == run_b
+    assert run_a[0] == first
+    assert len(set(run_a)) > 1
+
+
+def test_stub_error_and_throttle_injection():
+    """Test that injected failures raise the provider exception types."""
+    throttled = StubLLMProvider({"latency_ms": 0, "throttle_rate": 1.0, "retry_after_s": 2})
+    with pytest.raises(RateLimitError) as excinfo:
+        throttled.generate("Hello")
+    assert excinfo.value.retry_after == 2
+
+    failing = StubLLMProvider({"latency_ms": 0, "error_rate": 1.0})
+    with pytest.raises(ProviderError):
+        failing.generate("Hello")
+
+
+def test_stub_rejects_unknown_latency_distribution():
+    """Test configuration validation."""
+    with pytest.raises(ValueError, match="latency_distribution"):
+        StubLLMProvider({"latency_distribution": "uniform"})
+
+
+def test_mock_server_chat_completion():
+    """Test the mock server's chat-completions response shape."""
+    with MockLLMServer({"latency_ms": 0}) as server:
+        status, body = post_json(
+            f"{server.url}/v1/chat/completions",
+            {
+                "model": "m",
+                "messages": [{"role": "user", "content": "How many days in a leap year?"}],
+            },
+        )
+
+    payload = json.loads(body)
+    assert status == 200
+    assert payload["choices"][0]["message"]["content"] == "A leap year has 366 days."
+    assert payload["usage"]["total_tokens"] > 0
+
+
+def test_mock_server_throttling_returns_429():
+    """Test that throttle injection surfaces as HTTP 429 with Retry-After."""
+    with MockLLMServer({"latency_ms": 0, "throttle_rate": 1.0, "retry_after_s": 3}) as server:
+        with pytest.raises(urllib.error.HTTPError) as excinfo:
+            post_json(
+                f"{server.url}/v1/chat/completions",
+                {"messages": [{"role": "user", "content": "Hi"}]},
+            )
+
+    assert excinfo.value.code == 429
+    assert excinfo.value.headers["Retry-After"] == "3"
+
+
+def test_mock_server_streams_events():
+    """Test server-sent event streaming."""
+    with MockLLMServer({"latency_ms": 0}) as server:
+        status, body = post_json(
+            f"{server.url}/v1/chat/completions",
+            {
+                "stream": True,
+                "messages": [{"role": "user", "content": "How many days in a leap year?"}],
+            },
+        )
+
+    events = [line[len("data: ") :] for line in body.splitlines() if line.startswith("data: ")]
+    assert events[-1] == "[DONE]"
+    text = "".join(json.loads(e)["choices"][0]["delta"]["content"] for e in events[:-1])
+    assert text == "A leap year has 366 days."
@@ -0,0 +1,100 @@
+"""Tests for slotted execution records."""
+
+import json
+import pickle
+
+import pytest
+
+from llm_audit_runner import run
+from llm_audit_runner.io import read_records
+from llm_audit_runner.metrics import MetricsComputer
+from llm_audit_runner.provider import StubLLMProvider
+from llm_audit_runner.records import EvaluationResult, ExecutionMetadata, ExecutionRecord
+
+RECORD = {
+    "test_case_id": "det-1",
+    "timestamp": "2026-10-18T00:00:00Z",
+    "category": "determinism",
+    "repetition": 2,
+    "output": "positive",
+    "metadata": {"model": "stub", "execution_time_ms": 3, "custom": [1, 2]},
+    "evaluation": {"decision": "positive", "match": True, "score": 0.5},
+    "paraphrase": {"index": 1},
+    "prev_hash": "0" * 64,
+}
+
+
+def test_round_trip_and_dict_access():
+    """Test JSON round trips, nested conversion and dictionary-style access."""
+    record = ExecutionRecord.from_json(json.dumps(RECORD))
+    assert isinstance(record.metadata, ExecutionMetadata)
+    assert isinstance(record.evaluation, EvaluationResult)
+    assert record.to_dict() == RECORD
+    assert json.loads(record.to_json()) == RECORD
+    assert record == RECORD
+    assert pickle.loads(pickle.dumps(record)) == RECORD
+
+    assert record["category"] == "determinism"
+    assert record["metadata"]["custom"] == [1, 2]
+    assert record.evaluation.extra == {"score": 0.5}
+    assert record.get("severity", "medium") == "medium"
+    assert "severity" not in record
+    assert "paraphrase" in record
+    assert len(record) == len(RECORD)
+    with pytest.raises(KeyError):
+        record["severity"]
+
+    record["severity"] = "critical"
+    record["metadata"] = {"model": "other"}
+    del record["paraphrase"]
+    assert record.severity == "critical"
+    assert record.metadata.model == "other"
+    assert list(record) == [
+        "test_case_id",
+        "timestamp",
+        "category",
+        "repetition",
+        "output",
+        "metadata",
+        "evaluation",
+        "severity",
+        "prev_hash",
+    ]
+
+
+def test_labels_are_interned():
+    """Test that labels decoded from separate lines share one string."""
+    line = json.dumps(RECORD)
+    first, second = ExecutionRecord.from_json(line), ExecutionRecord.from_json(line)
+    assert first.category is second.category
+    assert first.evaluation.decision is second.evaluation.decision
+    assert first.metadata.model is second.metadata.model
+    assert first.output is not second.output
+
+
+def test_runner_and_metrics_use_records(tmp_path):
+    """Test that runner transcripts load into MetricsComputer as ExecutionRecords."""
+    cases = [
+        {
+            "id": "det-1",
+            "category": "determinism",
+            "input": "Classify: great",
+            "expected_decision": "positive",
+            "repetitions": 2,
+        },
+        {"id": "adv-1", "category": "adversarial", "input": "x", "severity": "critical"},
+    ]
+    runner = run.TestRunner(StubLLMProvider(), tmp_path)
+    runner.run_test_cases(cases)
+    runner.writer.close()
+
+    records = list(read_records(runner.writer.filename))
+    assert [r.test_case_id for r in records] == ["det-1", "det-1", "adv-1"]
+    assert all(isinstance(r, ExecutionRecord) for r in records)
+    assert records[-1].severity == "critical"
+
+    computer = MetricsComputer(tmp_path)
+    metrics = computer.compute_all_metrics()
+    assert all(isinstance(t, ExecutionRecord) for t in computer.transcripts)
+    assert metrics["test_campaign_summary"]["total_executions"] == 3
+    json.dumps(metrics)
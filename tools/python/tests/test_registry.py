@@ -0,0 +1,82 @@
+"""Tests for the provider registry."""
+
+import subprocess
+import sys
+
+import pytest
+
+from llm_audit_runner import registry
+from llm_audit_runner.provider import StubLLMProvider
+
+
+def test_builtin_providers_resolve():
+    """Test resolving built-in providers by name."""
+    assert isinstance(registry.get_provider("stub", {"latency_ms": 0}), StubLLMProvider)
+    assert "http" in registry.available_providers()
+
+
+def test_provider_module_imported_only_when_selected():
+    """Test that resolving the stub never imports the HTTP provider module."""
+    code = (
+        "import sys\n"
+        "from llm_audit_runner.registry import available_providers, get_provider\n"
+        "available_providers()\n"
+        "get_provider('stub')\n"
+        "assert 'llm_audit_runner.http_provider' not in sys.modules\n"
+    )
+    subprocess.run([sys.executable, "-c", code], check=True)
+
+
+def test_register_provider_and_module_target():
+    """Test runtime registration and module:ClassName targets."""
+    registry.register_provider("fake-stub", "llm_audit_runner.provider:StubLLMProvider")
+    try:
+        assert isinstance(registry.get_provider("fake-stub"), StubLLMProvider)
+        assert "fake-stub" in registry.available_providers()
+    finally:
+        registry._registered.pop("fake-stub")
+
+    provider = registry.get_provider("llm_audit_runner.provider:StubLLMProvider")
+    assert isinstance(provider, StubLLMProvider)
+
+
+def test_custom_provider_reads_class_from_config():
+    """Test the custom provider name."""
+    provider = registry.get_provider(
+        "custom", {"provider_class": "llm_audit_runner.provider:StubLLMProvider"}
+    )
+    assert isinstance(provider, StubLLMProvider)
+
+    with pytest.raises(ValueError, match="provider_class"):
+        registry.get_provider("custom", {})
+
+
+def test_unknown_and_invalid_providers():
+    """Test errors for unknown names and non-provider targets."""
+    with pytest.raises(ValueError, match="Unknown provider"):
+        registry.get_provider("does-not-exist")
+
+    with pytest.raises(TypeError, match="LLMProvider"):
+        registry.get_provider("llm_audit_runner.io:read_jsonl")
+
+
+def test_parse_targets():
+    """Test named targets and matching their provider configs."""
+    assert registry.parse_targets(["stub"], ["stub.json"]) == {"stub": ("stub", "stub.json")}
+    assert registry.parse_targets(["pkg.mod:Cls"], []) == {"pkg.mod:Cls": ("pkg.mod:Cls", None)}
+
+    targets = registry.parse_targets(
+        ["gpt=http", "local=http", "baseline=stub"], ["local=local.json", "gpt.json"]
+    )
+    assert targets == {
+        "gpt": ("http", "gpt.json"),
+        "local": ("http", "local.json"),
+        "baseline": ("stub", None),
+    }
+
+    with pytest.raises(ValueError, match="Duplicate target"):
+        registry.parse_targets(["http", "http"], [])
+    with pytest.raises(ValueError, match="Invalid target name"):
+        registry.parse_targets(["stub", "pkg.mod:Cls"], [])
+    with pytest.raises(ValueError, match="does not match any target"):
+        registry.parse_targets(["stub"], ["a.json", "b.json"])
@@ -0,0 +1,128 @@
+"""Tests for value-first test case scheduling."""
+
+import json
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+from llm_audit_runner import run
+from llm_audit_runner.cli import main
+from llm_audit_runner.cost import Budget
+from llm_audit_runner.provider import StubLLMProvider
+from llm_audit_runner.scheduler import Scheduler, load_failure_history, parse_deadline
+
+SAMPLE_CATALOG = (
+    Path(__file__).resolve().parents[3] / "example-suite" / "cases" / "sample-cases.yaml"
+)
+
+
+def ids(test_cases):
+    """Helper to list test case IDs."""
+    return [tc["id"] for tc in test_cases]
+
+
+def test_parse_deadline():
+    """Test durations from now and absolute UTC times."""
+    now = datetime(2026, 10, 18, 12, 0, 0)
+    assert parse_deadline("90m", now) == now + timedelta(minutes=90)
+    assert parse_deadline("2h30m", now) == now + timedelta(hours=2, minutes=30)
+    assert parse_deadline("45", now) == now + timedelta(seconds=45)
+    assert parse_deadline("2026-10-19T06:00:00Z", now) == datetime(2026, 10, 19, 6, 0, 0)
+    with pytest.raises(ValueError, match="Invalid deadline"):
+        parse_deadline("tomorrow", now)
+
+
+def test_deadline_with_utc_offset():
+    """Test that offset times become naive UTC that budgets can compare."""
+    deadline = parse_deadline("2026-10-19T06:00:00+02:00")
+    assert deadline == datetime(2026, 10, 19, 4, 0, 0)
+    assert deadline.tzinfo is None
+
+    budget = Budget(deadline=parse_deadline("2000-01-01T00:00:00-05:00"))
+    assert budget.exhausted.startswith("deadline 2000-01-01T05:00:00Z")
+
+
+def test_priority_promotion_and_category_interleaving(make_case):
+    """Test risk-tier promotion and round-robin across categories."""
+    cases = [
+        make_case("det-1", "determinism"),
+        make_case("det-2", "determinism"),
+        make_case("det-3", "determinism"),
+        make_case("truth-1", "truthfulness"),
+        make_case("adv-1", "adversarial"),
+        make_case("eff-1", "effectiveness", priority="high"),
+    ]
+
+    # Medium tier: truthfulness leads each round, no promotion
+    assert ids(Scheduler("Medium").order(cases)) == [
+        "eff-1",
+        "truth-1",
+        "adv-1",
+        "det-1",
+        "det-2",
+        "det-3",
+    ]
+
+    # High tier: adversarial is promoted to high and leads its round
+    assert ids(Scheduler("high").order(cases)) == [
+        "adv-1",
+        "eff-1",
+        "truth-1",
+        "det-1",
+        "det-2",
+        "det-3",
+    ]
+
+    # Catalog order is kept without a tier when nothing else differs
+    same = [make_case(f"det-{i}", "determinism") for i in range(3)]
+    assert ids(Scheduler().order(same)) == ["det-0", "det-1", "det-2"]
+
+
+def test_failure_history_runs_failed_cases_first(tmp_path, make_case):
+    """Test that earlier failures run first and always-passing cases run last."""
+    records = [
+        {"test_case_id": "passed", "evaluation": {"match": True}},
+        {"test_case_id": "failed", "evaluation": {"match": True}},
+        {"test_case_id": "failed", "evaluation": {"match": False}},
+        {"test_case_id": "errored", "error": "timeout"},
+        {"test_case_id": "unscored", "evaluation": {}},
+    ]
+    (tmp_path / "determinism.jsonl").write_text(
+        "".join(json.dumps(record) + "\n" for record in records)
+    )
+    history = load_failure_history([tmp_path])
+    assert history == {"passed": (0, 1), "failed": (1, 2), "errored": (1, 1)}
+
+    cases = [make_case(test_id, "determinism") for test_id in ("passed", "new", "failed")]
+    scheduler = Scheduler(history=history)
+    assert ids(scheduler.order(cases)) == ["failed", "new", "passed"]
+    assert scheduler.summary()["cases_failed_before"] == 2
+
+
+def test_past_deadline_skips_remaining_cases(tmp_path, make_case):
+    """Test that a reached deadline stops the run and records what was skipped."""
+    cases = [make_case(f"det-{i}", "determinism") for i in range(3)]
+    budget = Budget(deadline=datetime.utcnow() - timedelta(seconds=1))
+    runner = run.TestRunner(StubLLMProvider(), tmp_path, budget=budget)
+    results = runner.run_test_cases(cases)
+    runner.writer.close()
+
+    assert results["test_cases_run"] == 0
+    assert results["budget"]["stopped"].startswith("deadline")
+    assert [s["test_case_id"] for s in results["budget"]["skipped_test_cases"]] == ids(cases)
+
+
+def test_run_command_records_schedule(tmp_path, capsys):
+    """Test that the run command orders cases and writes the schedule to the metrics."""
+    output = tmp_path / "out"
+    args = ["run", "--catalog", str(SAMPLE_CATALOG), "--output", str(output), "--provider", "stub"]
+    assert main(args + ["--status-interval", "60"]) == 0
+    schedule = json.loads((output / "metrics_summary.json").read_text())["schedule"]
+    assert schedule["policy"] == "priority"
+    assert schedule["risk_tier"] == "medium"
+    assert schedule["stopped"] is None
+    assert schedule["test_cases_run"] == 12
+
+    assert main(args + ["--deadline", "soon"]) == 2
+    assert "Invalid deadline" in capsys.readouterr().err
@@ -0,0 +1,133 @@
+"""Tests for structured-output validation and exact-match repeatability."""
+
+import functools
+import json
+
+import pytest
+
+from llm_audit_runner import structured
+from llm_audit_runner.catalog import validate_test_case
+from llm_audit_runner.metrics import MetricsComputer
+from llm_audit_runner.structured import (
+    canonicalize,
+    compile_schema,
+    evaluate_structured,
+    parse_output,
+    validate_value,
+)
+
+SCHEMA = {
+    "type": "object",
+    "required": ["intent", "confidence"],
+    "additionalProperties": False,
+    "properties": {
+        "intent": {"type": "string", "enum": ["refund", "cancel"]},
+        "confidence": {"type": "number", "minimum": 0, "maximum": 1},
+        "tags": {"type": "array", "items": {"type": "string"}, "maxItems": 2},
+    },
+}
+
+
+@pytest.fixture
+def json_case(make_case):
+    """Factory for JSON-output cases."""
+    return functools.partial(make_case, "struct-001", output_format="json")
+
+
+def test_equivalent_json_outputs_share_a_hash(json_case):
+    """Test that key order, whitespace and fences do not affect the canonical form."""
+    first = evaluate_structured(json_case(), '{"b": 1, "a": [1, 2]}')
+    second = evaluate_structured(json_case(), 'Sure:\n```json\n{ "a": [1,2],\n "b": 1 }\n```')
+
+    assert first["parsed"] and second["parsed"]
+    assert first["canonical_hash"] == second["canonical_hash"]
+
+
+def test_code_and_yaml_canonicalization():
+    """Test that code ignores trailing whitespace and YAML compares as data."""
+    assert parse_output("```python\nx = 1   \n\n\n\ny = 2\n```", "code") == "x = 1\n\ny = 2"
+    assert canonicalize(parse_output("b: 1\na: 2", "yaml")) == canonicalize({"a": 2, "b": 1})
+
+
+def test_yaml_dates_and_non_string_keys_canonicalize(json_case):
+    """Test YAML values JSON cannot represent are hashed instead of failing."""
+    output = "date: 2024-01-01\n1: one\n2024-02-01: due\nname: x"
+    result = evaluate_structured(json_case(output_format="yaml"), output)
+
+    assert result["parsed"] is True
+    assert (
+        result["canonical_hash"]
+        == evaluate_structured(
+            json_case(output_format="yaml"), "name: x\n2024-02-01: due\n1: one\ndate: 2024-01-01"
+        )["canonical_hash"]
+    )
+    assert canonicalize(parse_output(output, "yaml")) == (
+        '{"1":"one","2024-02-01":"due","date":"2024-01-01","name":"x"}'
+    )
+
+
+def test_schema_validation_reports_errors():
+    """Test the compiled validator against valid and invalid values."""
+    assert validate_value({"intent": "refund", "confidence": 0.9, "tags": ["a"]}, SCHEMA) == []
+
+    errors = validate_value({"intent": "upgrade", "confidence": True, "extra": 1}, SCHEMA)
+    assert "$.intent: 'upgrade' not in enum" in errors
+    assert "$.confidence: expected number, got bool" in errors
+    assert "$: unexpected property 'extra'" in errors
+
+    assert compile_schema(SCHEMA) is compile_schema(json.loads(json.dumps(SCHEMA)))
+
+
+def test_schema_compiled_once_per_object(monkeypatch):
+    """Test that validating against the same schema object skips re-keying it."""
+    validator = compile_schema(SCHEMA)
+    monkeypatch.setattr(structured, "_compile_cached", pytest.fail)
+
+    assert compile_schema(SCHEMA) is validator
+    assert validate_value({"intent": "refund", "confidence": 1}, SCHEMA) == []
+
+
+def test_unparseable_output_fails_schema(json_case):
+    """Test that unparseable output is reported and counts as invalid."""
+    result = evaluate_structured(json_case(output_schema=SCHEMA), "I think it's a refund.")
+
+    assert result["parsed"] is False
+    assert result["schema_valid"] is False
+    assert "parse_error" in result
+
+
+def test_invalid_format_and_schema_rejected(json_case):
+    """Test catalog validation of output_format and output_schema."""
+    with pytest.raises(ValueError):
+        validate_test_case(json_case(output_format="xml"))
+    with pytest.raises(ValueError):
+        validate_test_case(json_case(repetitions=2, output_schema={"type": "decimal"}))
+
+
+def test_metrics_report_exact_match_rate(tmp_path, json_case):
+    """Test exact-match and schema-valid rates per case."""
+    case = json_case(output_schema=SCHEMA, exact_match_threshold=0.9)
+    outputs = [
+        '{"intent": "refund", "confidence": 0.9}',
+        '{"confidence": 0.9, "intent": "refund"}',
+        '{"intent": "refund", "confidence": 0.9}',
+        '{"intent": "cancel", "confidence": 2}',
+    ]
+    with open(tmp_path / "results.jsonl", "w") as f:
+        for output in outputs:
+            record = {
+                "test_case_id": case["id"],
+                "category": "determinism",
+                "evaluation": {"structured": evaluate_structured(case, output)},
+            }
+            f.write(json.dumps(record) + "\n")
+
+    structured = MetricsComputer(tmp_path).compute_all_metrics()["structured_output"]
+    per_case = structured["per_test_case"]["struct-001"]
+
+    assert per_case["exact_match_rate"] == 0.75
+    assert per_case["distinct_outputs"] == 2
+    assert per_case["schema_valid_rate"] == 0.75
+    assert structured["cases_below_exact_match_threshold"] == [
+        {"test_case_id": "struct-001", "exact_match_rate": 0.75}
+    ]
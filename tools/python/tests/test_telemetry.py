@@ -0,0 +1,115 @@
+"""Tests for live progress and throughput telemetry."""
+
+import io
+import json
+import urllib.request
+
+from llm_audit_runner import run
+from llm_audit_runner.provider import StubLLMProvider
+from llm_audit_runner.telemetry import STATUS_FILE, Telemetry, planned_executions
+
+
+class FakeClock:
+    """Manually advanced monotonic clock."""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_planned_executions_counts_paraphrase_variants():
+    """Test that paraphrase groups multiply repetitions by distinct phrasings."""
+    assert planned_executions({"input": "a"}) == 1
+    assert planned_executions({"input": "a", "repetitions": 3}) == 3
+    case = {"input": "a", "paraphrases": ["a", "b", "c"], "repetitions": 2}
+    assert planned_executions(case) == 6
+
+
+def test_rolling_rates_p95_and_eta(tmp_path):
+    """Test that rates and p95 cover only the window and drive the ETA."""
+    clock = FakeClock()
+    stream = io.StringIO()
+    telemetry = Telemetry(
+        100, output_dir=tmp_path, window=10.0, stream=stream, clock=clock, status_interval=60
+    )
+
+    # A slow start that falls out of the window
+    telemetry.start_cases()
+    clock.now += 5
+    telemetry.finish_case(2, 0, [(5_000_000, 40), (5_000_000, 40)])
+
+    clock.now += 20
+    for _ in range(10):
+        telemetry.start_cases()
+        clock.now += 1
+        telemetry.finish_case(4, 1, [(100_000, 25)] * 3)
+
+    status = telemetry.snapshot()
+    assert status["executions"] == 42
+    assert status["failed"] == 10
+    assert status["in_flight"] == 0
+    assert status["output_tokens"] == 80 + 750
+    assert status["requests_per_second"] == 4.0
+    assert status["tokens_per_second"] == 75.0
+    assert 98 < status["p95_latency_ms"] < 102
+    assert status["eta_seconds"] == 14.5
+    assert "\r" in stream.getvalue()
+    assert "42/100 executions, 0 in flight, 10 failed | 4.00 req/s" in telemetry.render()
+
+    # Only the first finished case triggered a snapshot so far
+    assert json.loads((tmp_path / STATUS_FILE).read_text())["executions"] == 2
+
+    telemetry.close("finished")
+    final = json.loads((tmp_path / STATUS_FILE).read_text())
+    assert final["state"] == "finished"
+    assert final["eta_seconds"] == 0.0
+
+
+def test_prometheus_file_and_endpoint(tmp_path):
+    """Test the text-format file and the localhost /metrics and /status endpoint."""
+    prometheus_file = tmp_path / "audit.prom"
+    telemetry = Telemetry(4, prometheus_file=prometheus_file, metrics_port=0, show_progress=False)
+    try:
+        telemetry.start_cases(2)
+        telemetry.finish_case(2, 1, [(250_000, 10)])
+
+        text = prometheus_file.read_text()
+        assert "# TYPE llm_audit_executions_total counter" in text
+        assert 'llm_audit_executions_total{outcome="failed"} 1' in text
+        assert "llm_audit_in_flight 1" in text
+
+        with urllib.request.urlopen(telemetry.url + "/metrics") as response:
+            assert b"llm_audit_planned_executions 4" in response.read()
+        with urllib.request.urlopen(telemetry.url + "/status") as response:
+            assert json.loads(response.read())["executions"] == 2
+    finally:
+        telemetry.close()
+    assert telemetry.url is None
+
+
+def test_runners_feed_telemetry(tmp_path, make_case):
+    """Test that single- and multi-process runners report every execution."""
+    cases = [
+        make_case(f"det-{i:03d}", expected_decision="positive", repetitions=2) for i in range(3)
+    ]
+
+    single = Telemetry(6, output_dir=tmp_path / "single", show_progress=False)
+    (tmp_path / "single").mkdir()
+    runner = run.TestRunner(StubLLMProvider(), tmp_path / "single", telemetry=single)
+    runner.run_test_cases(cases)
+    runner.writer.close()
+
+    parallel = Telemetry(6, output_dir=tmp_path / "parallel", show_progress=False)
+    (tmp_path / "parallel").mkdir()
+    runner = run.ParallelTestRunner(
+        "stub", {}, tmp_path / "parallel", workers=2, telemetry=parallel
+    )
+    runner.run_test_cases(cases)
+
+    for telemetry in (single, parallel):
+        status = telemetry.snapshot()
+        assert (status["executions"], status["in_flight"], status["failed"]) == (6, 0, 0)
+        assert status["output_tokens"] > 0
+        assert status["test_cases_completed"] == 3
@@ -0,0 +1,103 @@
+"""Tests for vectorized metrics and bootstrap confidence intervals."""
+
+import json
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from llm_audit_runner.cli import main  # noqa: E402
+from llm_audit_runner.instrumentation import LatencyHistogram  # noqa: E402
+from llm_audit_runner.metrics import MetricsComputer  # noqa: E402
+from llm_audit_runner.vectorized import (  # noqa: E402
+    VectorizedMetricsComputer,
+    bootstrap_ci,
+    bucket_indexes,
+)
+
+
+@pytest.fixture
+def results(tmp_path, make_record, write_run):
+    """A two-target run covering every category."""
+    records = []
+    for target, flip in (("a", False), ("b", True)):
+
+        def record(test_id, category, evaluation, latency_ms=12.5, target=target, **extra):
+            return make_record(
+                test_id,
+                category,
+                evaluation,
+                latency_ms=latency_ms,
+                model=target,
+                target=target,
+                **extra,
+            )
+
+        for rep in range(4):
+            decision = "negative" if flip and rep == 3 else "positive"
+            records.append(record("det-1", "determinism", {"decision": decision}, 5 + rep))
+            records.append(record("det-2", "determinism", {"decision": "neutral"}, 900 * rep))
+        records.append(record("det-3", "determinism", {"decision": "x"}))
+        records.append(record("para-1", "determinism", {"decision": "x"}, paraphrase={"index": 0}))
+        for i, present in enumerate((True, flip, True)):
+            records.append(record(f"truth-{i}", "truthfulness", {"all_facts_present": present}))
+        records.append(record("eff-1", "effectiveness", {"passes_threshold": flip}))
+        evaluation = {"has_violations": flip}
+        records.append(record("adv-1", "adversarial", evaluation, 250_000, severity="critical"))
+        records.append(record("adv-2", "adversarial", {"has_violations": True}))
+        records.append({"test_case_id": "eff-2", "category": "effectiveness", "error": "timeout"})
+    return write_run(tmp_path / "run", records)
+
+
+def test_vectorized_metrics_match_record_metrics(results):
+    """Test that every section equals the record-by-record result."""
+
+    expected = MetricsComputer(results).compute_all_metrics()
+    actual = VectorizedMetricsComputer(results).compute_all_metrics()
+
+    intervals = actual.pop("confidence_intervals")
+    assert actual == expected
+    assert set(expected["comparison"]["side_by_side"]) == {"a", "b"}
+    assert set(intervals["metrics"]) == {
+        "mean_decision_consistency",
+        "factual_accuracy",
+        "task_completion_rate",
+        "attack_resistance_rate",
+    }
+    consistency = intervals["metrics"]["mean_decision_consistency"]
+    assert consistency["unit"] == "test_case"
+    assert consistency["n"] == 4
+    assert consistency["low"] <= consistency["estimate"] <= consistency["high"]
+
+
+def test_bucket_indexes_match_histogram():
+    """Test vectorized bucketing against LatencyHistogram."""
+    histogram = LatencyHistogram()
+    values = np.array([0, 1, 127, 128, 129, 255, 256, 1000, 123_456, 10**9, 2**40 + 3])
+    assert bucket_indexes(values).tolist() == [histogram._bucket_index(int(v)) for v in values]
+
+
+def test_bootstrap_ci():
+    """Test binomial and resampled intervals and their reproducibility."""
+    flags = np.array([1] * 90 + [0] * 10)
+    interval = bootstrap_ci(flags, rng=np.random.default_rng(1))
+    assert interval["estimate"] == 0.9
+    assert interval["n"] == 100
+    assert 0.8 < interval["low"] < 0.9 < interval["high"] < 0.97
+    assert bootstrap_ci(flags, rng=np.random.default_rng(1)) == interval
+
+    rates = np.array([1.0, 0.8, 0.9, 0.6, 1.0])
+    interval = bootstrap_ci(rates, resamples=500, level=0.9)
+    assert interval["low"] <= interval["estimate"] == 0.86 <= interval["high"]
+    assert bootstrap_ci(np.array([1.0]))["low"] == 1.0
+    assert bootstrap_ci(np.empty(0)) is None
+
+
+def test_metrics_command_vectorized(results, capsys):
+    """Test the metrics subcommand's vectorized mode."""
+    assert main(["metrics", str(results), "--vectorized", "--bootstrap", "200", "--quiet"]) == 0
+    summary = json.loads((results / "metrics_summary.json").read_text())
+    assert summary["confidence_intervals"]["resamples"] == 200
+
+    assert main(["metrics", str(results), "--vectorized", "--bootstrap", "0"]) == 2
+    assert "--bootstrap" in capsys.readouterr().err